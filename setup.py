@@ -21,11 +21,12 @@ version = read_version()
 install_requires = [
     "aiohttp",
     "Cython >= 0.29.0",
+    "numpy",
     "prompt-toolkit >= 3.0.0",
     "pymonome >= 0.9.0",
     "python-rtmidi",
     "sly",
-    "supriya",
+    "supriya",  # VirtualTempoClock relies on AsyncTempoClock internals
     "urwid >= 2.1.0",
 ]
 
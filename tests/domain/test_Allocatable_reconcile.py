@@ -0,0 +1,58 @@
+import pytest
+from supriya.providers import Provider
+
+from tloen.domain import Allocatable, Application, ApplicationObject
+
+
+async def build_application(track_count):
+    application = Application()
+    context = await application.add_context()
+    for _ in range(track_count):
+        await context.add_track()
+    provider = Provider.nonrealtime()
+    with provider.at():
+        context._set(provider=provider)
+    return application, provider
+
+
+@pytest.fixture
+def reconcile_spies(mocker):
+    spies = [
+        mocker.spy(Allocatable, "_reconcile"),
+        mocker.spy(ApplicationObject, "_reconcile"),
+    ]
+
+    def count():
+        result = sum(spy.call_count for spy in spies)
+        for spy in spies:
+            spy.reset_mock()
+        return result
+
+    return count
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("track_count", [4, 64])
+async def test_unchanged_state_does_not_recurse(track_count, reconcile_spies):
+    application, provider = await build_application(track_count)
+    context = application.primary_context
+    reconcile_spies()
+    with provider.at(1):
+        await application.set_channel_count(2)
+    assert reconcile_spies() == 1
+    with provider.at(2):
+        await context.tracks[-1].set_channel_count(None)
+    assert reconcile_spies() == 1
+
+
+@pytest.mark.asyncio
+async def test_mutation_reconcile_count_is_independent_of_tree_size(reconcile_spies):
+    counts = []
+    for track_count in [4, 64]:
+        application, provider = await build_application(track_count)
+        context = application.primary_context
+        reconcile_spies()
+        with provider.at(1):
+            await context.add_track()
+        counts.append(reconcile_spies())
+    assert counts[0] == counts[1]
@@ -0,0 +1,93 @@
+import pytest
+
+from tloen.domain import Application, ApplicationObject, AudioEffect, RackDevice
+
+
+async def build_nested_racks(track, depth, dc_index_synthdef_factory):
+    chain = track
+    for _ in range(depth):
+        rack = await chain.add_device(RackDevice)
+        chain = await rack.add_chain()
+    return await chain.add_device(AudioEffect, synthdef=dc_index_synthdef_factory)
+
+
+@pytest.mark.asyncio
+async def test_cached(dc_index_synthdef_factory):
+    application = Application()
+    context = await application.add_context()
+    track = await context.add_track()
+    device = await build_nested_racks(track, 8, dc_index_synthdef_factory)
+    parentage = device.parentage
+    assert parentage[-1] is application
+    assert device.parentage is parentage
+    assert device.depth == len(parentage) - 1
+    assert device.context is context
+    assert device.track_object is device.parent.parent
+    assert device.effective_channel_count == 2
+    assert device._cached_ancestors
+    assert device._cached_effective_channel_count == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidated_on_move(dc_index_synthdef_factory):
+    application = Application()
+    context_one = await application.add_context()
+    context_two = await application.add_context()
+    await context_two.set_channel_count(4)
+    track_one = await context_one.add_track()
+    device = await build_nested_racks(track_one, 4, dc_index_synthdef_factory)
+    assert device.context is context_one
+    assert device.effective_channel_count == 2
+    track_two = await context_two.add_track()
+    await track_one.move(track_two, 0)
+    assert device.parentage[-1] is application
+    assert track_two in device.parentage
+    assert device.context is context_two
+    assert device.effective_channel_count == 4
+    await track_one.set_channel_count(1)
+    assert device.effective_channel_count == 1
+    await track_two.remove_tracks(track_one)
+    assert device.context is None
+    assert device.parentage[-1] is track_one
+
+
+@pytest.mark.asyncio
+async def test_invalidated_on_application_channel_count(dc_index_synthdef_factory):
+    application = Application()
+    context = await application.add_context()
+    track = await context.add_track()
+    device = await build_nested_racks(track, 4, dc_index_synthdef_factory)
+    assert device.effective_channel_count == 2
+    await application.set_channel_count(3)
+    assert device.effective_channel_count == 3
+
+
+@pytest.mark.parametrize("depth", [4, 16])
+@pytest.mark.asyncio
+async def test_benchmark(depth, dc_index_synthdef_factory, mocker):
+    application = Application()
+    context = await application.add_context()
+    track = await context.add_track()
+    device = await build_nested_racks(track, depth, dc_index_synthdef_factory)
+    computed = []
+    fget = ApplicationObject.parentage.fget
+
+    def parentage(self):
+        if self._cached_parentage is None:
+            computed.append(self)
+        return fget(self)
+
+    mocker.patch.object(ApplicationObject, "parentage", property(parentage))
+
+    def lookup():
+        return device.context, device.track_object, device.effective_channel_count
+
+    assert lookup() == (context, device.parent.parent, 2)
+    computed.clear()
+    for _ in range(10):
+        lookup()
+    assert computed == []
+    device._invalidate_caches()
+    assert lookup() == (context, device.parent.parent, 2)
+    # only the invalidated node recomputes, however deep it is
+    assert computed == [device]
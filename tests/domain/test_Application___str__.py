@@ -21,6 +21,7 @@ async def test_1():
                     <Tracks [?]>
                         <Track [?] {track.uuid}>
                             <Slots>
+                            <Timeline {track.timeline.uuid}>
                             <SubTracks [?]>
                             <Parameters [?]>
                                 <BusParameter "gain" (0.0) [?] [?] {context.tracks[0].parameters["gain"].uuid}>
@@ -75,6 +76,7 @@ async def test_2():
                     <Tracks [{context.tracks.node_proxy.identifier}]>
                         <Track [{track.node_proxy.identifier}] {track.uuid}>
                             <Slots>
+                            <Timeline {track.timeline.uuid}>
                             <SubTracks [{track.tracks.node_proxy.identifier}]>
                             <Parameters [1009]>
                                 <BusParameter "gain" (0.0) [1010] [0] {context.tracks[0].parameters["gain"].uuid}>
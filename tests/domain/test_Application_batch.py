@@ -0,0 +1,82 @@
+import re
+
+import pytest
+from supriya.providers import Provider
+
+from tloen.domain import (
+    Allocatable,
+    Application,
+    AudioEffect,
+    Chain,
+    RackDevice,
+    Track,
+)
+
+
+async def populate(application, dc_index_synthdef_factory):
+    context = application.primary_context
+    for name in ["a", "b"]:
+        track = await context.add_track(name=name)
+        rack = await track.add_device(RackDevice)
+        chain = await rack.add_chain()
+        await chain.add_device(AudioEffect, synthdef=dc_index_synthdef_factory)
+        await track.add_track()
+    await application.add_scene()
+
+
+async def build_application():
+    application = Application()
+    context = await application.add_context()
+    provider = Provider.nonrealtime()
+    with provider.at():
+        context._set(provider=provider)
+    return application, provider
+
+
+@pytest.mark.asyncio
+async def test_defers_allocation(dc_index_synthdef_factory, mocker):
+    application, provider = await build_application()
+    spy = mocker.spy(Allocatable, "_allocate")
+    with provider.at(1):
+        async with application.batch():
+            await populate(application, dc_index_synthdef_factory)
+            assert not spy.call_count
+            assert not application.find(Track)
+            async with application.batch():
+                await application.primary_context.add_track(name="c")
+            assert not spy.call_count
+    assert spy.call_count
+    assert application._batch is None
+    for node in application.primary_context.depth_first(
+        prototype=(AudioEffect, Chain, RackDevice, Track)
+    ):
+        assert node.provider is provider
+        assert node.node_proxy is not None
+    track = application.primary_context["a"]
+    assert track.slots[0].application is application
+    assert application.registry[track.uuid] is track
+
+
+@pytest.mark.asyncio
+async def test_matches_unbatched(dc_index_synthdef_factory):
+    application_a, provider_a = await build_application()
+    with provider_a.at(1):
+        await populate(application_a, dc_index_synthdef_factory)
+    application_b, provider_b = await build_application()
+    with provider_b.at(1):
+        async with application_b.batch():
+            await populate(application_b, dc_index_synthdef_factory)
+    # Node IDs differ, as allocation happens in graph order, but the trees match
+    assert re.sub(r"\d{4}", "N", provider_b.session.to_strings()) == re.sub(
+        r"\d{4}", "N", provider_a.session.to_strings()
+    )
+
+
+@pytest.mark.asyncio
+async def test_offline():
+    application = await Application.new(context_count=2, track_count=3, scene_count=4)
+    for context in application.contexts:
+        assert len(context.tracks) == 3
+        for track in context.tracks:
+            assert len(track.slots) == 4
+            assert application.registry[track.uuid] is track
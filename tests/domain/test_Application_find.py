@@ -0,0 +1,91 @@
+import pytest
+
+from tloen.domain import (
+    Application,
+    Clip,
+    Context,
+    DeviceObject,
+    Instrument,
+    RackDevice,
+    Slot,
+    Track,
+)
+
+
+@pytest.fixture
+async def application():
+    application = Application()
+    await application.add_scene()
+    context = await application.add_context(name="Context")
+    track_one = await context.add_track(name="One")
+    track_two = await context.add_track(name="Two")
+    await track_two.add_track(name="Three")
+    await track_one.add_device(RackDevice, name="Rack")
+    await track_one.add_device(Instrument, name="Instrument")
+    await track_one.slots[0].add_clip()
+    return application
+
+
+@pytest.mark.asyncio
+async def test_by_class(application):
+    context = application.primary_context
+    assert application.find(Context) == (context,)
+    assert [x.name for x in application.find(Track)] == ["One", "Two", "Three"]
+    assert [x.name for x in application.find(DeviceObject)] == ["Rack", "Instrument"]
+    assert application.find(Instrument) == (context["Instrument"],)
+    assert len(application.find(Slot)) == 3
+    assert application.find(Clip) == (context["One"].slots[0].clip,)
+
+
+@pytest.mark.asyncio
+async def test_by_parent(application):
+    context = application.primary_context
+    assert [x.name for x in application.find(Track, parent=context)] == [
+        "One",
+        "Two",
+    ]
+    assert application.find(Track, parent=context["Two"]) == (context["Three"],)
+    assert application.find(Track, parent=context["One"]) == ()
+    assert [x.name for x in application.find(Track, ancestor=context)] == [
+        "One",
+        "Two",
+        "Three",
+    ]
+    assert application.find(Track, ancestor=context["Two"]) == (context["Three"],)
+    assert application.find(Clip, ancestor=application) == (
+        context["One"].slots[0].clip,
+    )
+    assert application.find(Slot, ancestor=context["Three"]) == tuple(
+        context["Three"].slots
+    )
+
+
+@pytest.mark.asyncio
+async def test_move(application):
+    context = application.primary_context
+    await context["Three"].move(context, 0)
+    assert [x.name for x in application.find(Track, parent=context)] == [
+        "Three",
+        "One",
+        "Two",
+    ]
+    assert application.find(Track, parent=context["Two"]) == ()
+    await context["One"].move(context["Two"], 0)
+    assert application.find(Track, parent=context["Two"]) == (context["One"],)
+    assert application.find(Instrument, ancestor=context["Two"]) == (
+        context["Instrument"],
+    )
+
+
+@pytest.mark.asyncio
+async def test_remove(application):
+    context = application.primary_context
+    track = context["Two"]
+    await context.remove_tracks(track)
+    assert [x.name for x in application.find(Track)] == ["One"]
+    assert application.find(Track, parent=track) == ()
+    await application.remove_contexts(context)
+    assert application.find(Track) == ()
+    assert application.find(DeviceObject) == ()
+    assert application.find(Context) == ()
+    assert application._registry_parents.keys() == application.registry.keys()
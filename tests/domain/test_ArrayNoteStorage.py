@@ -0,0 +1,108 @@
+import random
+
+import pytest
+
+from tloen.domain import Clip, Note
+from tloen.domain.clips import (
+    ArrayNoteStorage,
+    IntervalNoteStorage,
+    LazySequence,
+    NoteArray,
+)
+from tloen.domain.notes import NoteSelector
+
+
+def test_matches_interval_storage():
+    random.seed(0)
+    array_storage, interval_storage = ArrayNoteStorage(), IntervalNoteStorage()
+    for _ in range(200):
+        if random.random() < 0.25 and len(interval_storage):
+            notes = random.sample(list(interval_storage), 2)
+            array_storage.remove(notes)
+            interval_storage.remove(notes)
+        else:
+            notes = []
+            for _ in range(random.randint(1, 6)):
+                start_offset = random.randint(0, 32) / 4
+                notes.append(
+                    Note(
+                        start_offset,
+                        start_offset + random.randint(1, 12) / 4,
+                        pitch=random.randint(60, 63),
+                        velocity=random.randint(1, 127),
+                    )
+                )
+            array_storage.add(notes)
+            interval_storage.add(notes)
+        assert list(array_storage) == list(interval_storage)
+        for note in interval_storage:
+            assert (
+                array_storage.get_note_starting_at(note.pitch, note.start_offset)
+                == interval_storage.get_note_starting_at(note.pitch, note.start_offset)
+                == note
+            )
+    notes, columns = array_storage.get_columns()
+    assert isinstance(notes, NoteArray)
+    assert list(notes) == list(interval_storage)
+    assert columns["pitch"].tolist() == [note.pitch for note in interval_storage]
+
+
+def test_timeline():
+    notes = [
+        Note(0, 1, pitch=60),
+        Note(0, 2, pitch=61),
+        Note(0.5, 3, pitch=62),
+        Note(1, 2, pitch=60),
+        Note(2, 4, pitch=61, velocity=50),
+    ]
+    array_storage, interval_storage = ArrayNoteStorage(), IntervalNoteStorage()
+    array_storage.add(notes)
+    interval_storage.add(notes)
+    array_timeline = array_storage.get_timeline()
+    interval_timeline = interval_storage.get_timeline()
+    # boundaries are materialized only when accessed
+    assert isinstance(array_timeline.start_notes, LazySequence)
+    assert array_timeline.offsets == interval_timeline.offsets
+    for field in [
+        "start_notes",
+        "stop_notes",
+        "overlap_notes",
+        "segment_notes",
+        "note_on_messages",
+        "note_off_messages",
+    ]:
+        assert list(getattr(array_timeline, field)) == list(
+            getattr(interval_timeline, field)
+        )
+
+
+def test_get_note_starting_at():
+    for storage in (ArrayNoteStorage(), IntervalNoteStorage()):
+        storage.add([Note(0, 1, pitch=60), Note(0, 2, pitch=61), Note(1, 2, pitch=60)])
+        assert storage.get_note_starting_at(61, 0) == Note(0, 2, pitch=61)
+        assert storage.get_note_starting_at(60, 1) == Note(1, 2, pitch=60)
+        assert storage.get_note_starting_at(60, 0.5) is None
+        assert storage.get_note_starting_at(62, 0) is None
+
+
+def test_remove_missing():
+    storage = ArrayNoteStorage()
+    storage.add([Note(0, 1)])
+    with pytest.raises(ValueError):
+        storage.remove([Note(0, 1, pitch=1)])
+    assert list(storage) == [Note(0, 1)]
+
+
+@pytest.mark.asyncio
+async def test_clip():
+    clip = Clip(columnar=True, duration=8, notes=[Note(0, 2), Note(0, 5), Note(5, 10)])
+    assert clip.is_columnar
+    assert clip.notes == [Note(0, 5), Note(5, 10)]
+    await clip.add_notes([Note(2, 6, velocity=127)])
+    assert clip.notes == [Note(0, 2), Note(2, 6, velocity=127)]
+    assert clip.at(2).start_notes == [Note(2, 6, velocity=127)]
+    await NoteSelector(clip).with_durations(2).transpose(12)
+    assert clip.notes == [Note(0, 2, pitch=12), Note(2, 6, velocity=127)]
+    serialized, _ = clip._serialize()
+    assert serialized["spec"]["columnar"]
+    assert not Clip()._serialize()[0]["spec"].get("columnar")
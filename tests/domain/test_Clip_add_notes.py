@@ -18,3 +18,40 @@ async def test_1():
         Note(20, 25),
         Note(25, 35),
     ]
+
+
+@pytest.mark.asyncio
+async def test_index():
+    clip = Clip()
+    await clip.add_notes([Note(0, 1, pitch=60), Note(1, 2, pitch=60), Note(0, 4)])
+    await clip.add_notes([Note(0.5, 1.5, pitch=60), Note(2, 3)])
+    assert clip._storage._notes_by_pitch == {
+        0.0: [Note(0, 2), Note(2, 3)],
+        60: [Note(0, 0.5, pitch=60), Note(0.5, 1.5, pitch=60)],
+    }
+    assert clip._storage._start_offsets_by_pitch == {0.0: [0, 2], 60: [0, 0.5]}
+    await clip.remove_notes(clip._storage._notes_by_pitch[60][:])
+    assert (
+        list(clip._storage._notes_by_pitch)
+        == list(clip._storage._start_offsets_by_pitch)
+        == [0.0]
+    )
+    assert (
+        sorted(
+            note for notes in clip._storage._notes_by_pitch.values() for note in notes
+        )
+        == clip.notes
+    )
+
+
+def test_edit_is_local(mocker):
+    clip = Clip(notes=[Note(x, x + 1, pitch=x % 12) for x in range(10000)])
+    mocker.patch.object(
+        type(clip._storage._interval_tree), "__iter__", side_effect=AssertionError
+    )
+    clip._add_notes([Note(5000.5, 5001.5, pitch=8)])
+    assert clip._storage._get_notes_near(8, 4990, 5010) == [
+        Note(4988, 4989, pitch=8),
+        Note(5000, 5000.5, pitch=8),
+        Note(5000.5, 5001.5, pitch=8),
+    ]
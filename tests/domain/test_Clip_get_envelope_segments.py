@@ -0,0 +1,61 @@
+from uuid import uuid4
+
+import pytest
+
+from tloen.domain import Clip, Envelope
+from tloen.domain.clips import EnvelopeSegment
+
+
+def test_envelope():
+    uuid = uuid4()
+    envelope = Envelope(uuid, [(0.5, 1.0), (0.0, 0.0), (0.75, 0.0)])
+    assert envelope.breakpoints == ((0.0, 0.0), (0.5, 1.0), (0.75, 0.0))
+    assert envelope.get_segment_at(-1.0) == (None, 0.0, 0.0, 0.0)
+    assert envelope.get_segment_at(0.25) == (0.0, 0.5, 0.0, 1.0)
+    assert envelope.get_segment_at(0.5) == (0.5, 0.75, 1.0, 0.0)
+    assert envelope.get_segment_at(1.0) == (0.75, None, 0.0, 0.0)
+    assert envelope.value_at(0.25) == 0.5
+    assert envelope.value_at(0.625) == 0.5
+    with pytest.raises(ValueError):
+        Envelope(uuid)
+
+
+def test_looping():
+    uuid = uuid4()
+    clip = Clip(envelopes=[Envelope(uuid, [(0.25, 0.0), (0.5, 1.0), (1.5, 0.0)])])
+    assert clip.get_envelope_segments(0.0) == (
+        (EnvelopeSegment(uuid, 0.0, 0.25, 0.0, 0.0),),
+        0.25,
+    )
+    assert clip.get_envelope_segments(0.75) == (
+        (EnvelopeSegment(uuid, 0.5, 1.0, 1.0, 0.5),),
+        1.0,
+    )
+    assert clip.get_envelope_segments(2.375, start_delta=1.0) == (
+        (EnvelopeSegment(uuid, 2.25, 2.5, 0.0, 1.0),),
+        2.5,
+    )
+
+
+def test_not_looping():
+    uuid = uuid4()
+    clip = Clip(envelopes=[Envelope(uuid, [(0.25, 0.0), (0.5, 1.0)])], is_looping=False)
+    assert clip.get_envelope_segments(2.0) == (
+        (EnvelopeSegment(uuid, 0.5, None, 1.0, 1.0),),
+        None,
+    )
+
+
+@pytest.mark.asyncio
+async def test_set_and_remove():
+    uuid = uuid4()
+    clip = Clip()
+    envelope = await clip.set_envelope(uuid, [(0.0, 1.0)])
+    assert clip.envelopes == (envelope,)
+    data, _ = clip._serialize()
+    assert data["spec"]["envelopes"] == [
+        {"parameter_uuid": str(uuid), "breakpoints": [[0.0, 1.0]]}
+    ]
+    await clip.remove_envelope(uuid)
+    assert clip.envelopes == ()
+    assert clip.get_envelope_segments(0.0) == ((), None)
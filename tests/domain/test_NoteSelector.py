@@ -0,0 +1,73 @@
+import numpy
+import pytest
+
+from tloen.domain import Clip, Note
+from tloen.domain.notes import NoteSelector
+
+
+@pytest.fixture
+def clip():
+    return Clip(
+        duration=2,
+        notes=[
+            Note(0, 0.25, pitch=60),
+            Note(0.25, 0.5, pitch=62),
+            Note(0.5, 1, pitch=64),
+            Note(1, 1.5, pitch=72),
+            Note(1.5, 2, pitch=67, velocity=50),
+        ],
+    )
+
+
+def test_filters(clip):
+    selector = NoteSelector(clip)
+    assert len(selector) == 5
+    assert [x.pitch for x in selector.between_offsets(0.25, 1)] == [62, 64]
+    assert [x.pitch for x in selector.between_offsets(1, 0.25)] == [60, 72, 67]
+    assert [x.pitch for x in selector.between_pitches(62, 67)] == [62, 64, 67]
+    assert [x.pitch for x in selector.with_pitches([60, 72])] == [60, 72]
+    assert [x.pitch for x in selector.with_pitches(64, ">")] == [72, 67]
+    assert [x.pitch for x in selector.with_pitches(numpy.int64(72))] == [72]
+    assert [x.pitch for x in selector.with_durations(numpy.float64(0.25))] == [60, 62]
+    assert [x.pitch for x in selector.with_pitch_classes(0)] == [60, 72]
+    assert [x.pitch for x in selector.with_pitch_classes([0, 2], "!=")] == [64, 67]
+    assert [x.pitch for x in selector.with_durations(0.5)] == [64, 72, 67]
+    assert [x.pitch for x in selector.with_durations(0.25, "<=")] == [60, 62]
+    with pytest.raises(ValueError):
+        selector.with_pitches(60, "~")
+
+
+def test_algebra(clip):
+    selector = NoteSelector(clip)
+    low = selector.with_pitches(64, "<=")
+    short = selector.with_durations(0.25)
+    assert [x.pitch for x in low & short] == [60, 62]
+    assert [x.pitch for x in ~low] == [72, 67]
+    assert [x.pitch for x in low | selector.with_pitches(72)] == [60, 62, 64, 72]
+    assert [x.pitch for x in low ^ short] == [64]
+    assert [x.pitch for x in ~(low & short) & selector.between_offsets(0, 1)] == [64]
+    with pytest.raises(ValueError):
+        low & NoteSelector(Clip())
+
+
+@pytest.mark.asyncio
+async def test_bulk_edits(clip, mocker):
+    notify = mocker.spy(clip, "_notify")
+    selector = NoteSelector(clip)
+    await selector.with_pitches(64, "<=").transpose(1)
+    assert [x.pitch for x in clip.notes] == [61, 63, 65, 72, 67]
+    await selector.between_offsets(1, None).translate(-0.5)
+    assert clip.notes == [
+        Note(0, 0.25, pitch=61),
+        Note(0.25, 0.5, pitch=63),
+        Note(0.5, 1, pitch=65),
+        Note(0.5, 1, pitch=72),
+        Note(1, 1.5, pitch=67, velocity=50),
+    ]
+    await selector.with_pitches(72).translate_offsets(stop_translation=1)
+    assert Note(0.5, 2, pitch=72) in clip.notes
+    await selector.with_pitches(72).replace([Note(0, 1, pitch=48)])
+    assert [x.pitch for x in clip.notes] == [61, 48, 63, 65, 67]
+    await (~selector.with_pitches(48)).delete()
+    assert clip.notes == [Note(0, 1, pitch=48)]
+    assert notify.call_count == 5
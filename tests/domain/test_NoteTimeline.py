@@ -0,0 +1,92 @@
+import random
+
+from tloen.domain import Clip, Note
+from tloen.domain.clips import NoteTimeline
+from tloen.midi import NoteOffMessage, NoteOnMessage
+
+
+def test_from_notes():
+    timeline = NoteTimeline.from_notes(
+        [Note(0, 0.5, pitch=60), Note(0.25, 1, pitch=62), Note(0.5, 1, pitch=64)]
+    )
+    assert timeline.offsets == (0, 0.25, 0.5, 1)
+    assert timeline.start_notes == (
+        (Note(0, 0.5, pitch=60),),
+        (Note(0.25, 1, pitch=62),),
+        (Note(0.5, 1, pitch=64),),
+        (),
+    )
+    assert timeline.stop_notes == (
+        (),
+        (),
+        (Note(0, 0.5, pitch=60),),
+        (Note(0.25, 1, pitch=62), Note(0.5, 1, pitch=64)),
+    )
+    assert timeline.overlap_notes == (
+        (),
+        (Note(0, 0.5, pitch=60),),
+        (Note(0.25, 1, pitch=62),),
+        (),
+    )
+    assert timeline.segment_notes == (
+        (Note(0, 0.5, pitch=60),),
+        (Note(0, 0.5, pitch=60), Note(0.25, 1, pitch=62)),
+        (Note(0.25, 1, pitch=62), Note(0.5, 1, pitch=64)),
+        (),
+    )
+    assert timeline.note_on_messages[1] == (NoteOnMessage(pitch=62, velocity=100),)
+    assert timeline.note_off_messages[3] == (
+        NoteOffMessage(pitch=62, velocity=100),
+        NoteOffMessage(pitch=64, velocity=100),
+    )
+    assert timeline.get_offset_after(-1) == 0
+    assert timeline.get_offset_after(0.3) == 0.5
+    assert timeline.get_offset_after(1) is None
+
+
+def test_rebuilt_on_edit():
+    clip = Clip(notes=[Note(0, 0.5)])
+    timeline = clip._get_timeline()
+    assert clip._get_timeline() is timeline
+    clip.at(0.25)
+    assert clip._timeline is timeline
+    clip._add_notes([Note(0.5, 0.75)])
+    assert clip._timeline is None
+    assert clip._get_timeline().offsets == (0, 0.5, 0.75)
+    clip._remove_notes([Note(0, 0.5)])
+    assert clip._timeline is None
+    assert clip._get_timeline().offsets == (0.5, 0.75)
+
+
+def test_matches_interval_tree():
+    random.seed(0)
+    notes = []
+    for _ in range(64):
+        start_offset = random.randint(0, 15) / 8
+        notes.append(
+            Note(
+                start_offset,
+                start_offset + random.randint(1, 8) / 8,
+                pitch=random.randint(60, 72),
+            )
+        )
+    clip = Clip(notes=notes, duration=2)
+    timeline = clip._get_timeline()
+    for offset in [x / 16 for x in range(-4, 40)]:
+        expected = clip._storage._interval_tree.get_moment_at(offset)
+        start_notes, stop_notes, overlap_notes = timeline.get_notes_at(offset)
+        assert sorted(start_notes) == sorted(expected.start_intervals)
+        assert sorted(stop_notes) == sorted(expected.stop_intervals)
+        assert sorted(overlap_notes) == sorted(expected.overlap_intervals)
+        assert timeline.get_offset_after(
+            offset
+        ) == clip._storage._interval_tree.get_offset_after(offset)
+    note_moment = clip.at(1.0)
+    assert note_moment.note_on_messages == [
+        NoteOnMessage(pitch=note.pitch, velocity=note.velocity)
+        for note in note_moment.start_notes or ()
+    ]
+    assert note_moment.note_off_messages == [
+        NoteOffMessage(pitch=note.pitch, velocity=note.velocity)
+        for note in note_moment.stop_notes or ()
+    ]
@@ -0,0 +1,93 @@
+import math
+
+import numpy
+import pytest
+from supriya.clocks import Moment
+
+from tloen.domain import Application, AudioEffect
+from tloen.midi import (
+    ControllerChangeMessage,
+    MidiMessage,
+    NoteOffMessage,
+    NoteOnMessage,
+)
+
+
+@pytest.fixture
+async def device(dc_index_synthdef_factory):
+    application = Application()
+    context = await application.add_context()
+    track = await context.add_track()
+    return await track.add_device(AudioEffect, synthdef=dc_index_synthdef_factory)
+
+
+@pytest.mark.asyncio
+async def test_list(device):
+    with device.capture() as transcript:
+        await device.perform([NoteOnMessage(pitch=60, velocity=100)])
+    assert list(transcript) == [
+        device.CaptureEntry(
+            moment=None, label="I", message=NoteOnMessage(pitch=60, velocity=100)
+        ),
+        device.CaptureEntry(
+            moment=None, label="O", message=NoteOnMessage(pitch=60, velocity=100)
+        ),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_ring(device):
+    with device.capture(size=4) as transcript:
+        await device.perform(
+            [
+                NoteOnMessage(pitch=60, velocity=100),
+                NoteOnMessage(pitch=61, velocity=90),
+            ],
+            moment=Moment(
+                beats_per_minute=120,
+                measure=1,
+                measure_offset=0.5,
+                offset=0.5,
+                seconds=1.0,
+                time_signature=(4, 4),
+            ),
+        )
+        await device.perform([NoteOffMessage(pitch=60, velocity=0)])
+    assert len(transcript) == 4
+    assert transcript.total == 6
+    assert transcript.dropped == 2
+    assert [(x.label, x.message_type, x.pitch) for x in transcript] == [
+        ("O", NoteOnMessage, 60),
+        ("O", NoteOnMessage, 61),
+        ("I", NoteOffMessage, 60),
+        ("O", NoteOffMessage, 60),
+    ]
+    assert transcript[0].offset == 0.5
+    assert math.isnan(transcript[-1].offset)
+    arrays = transcript.to_numpy()
+    assert arrays["label"].tolist() == [1, 1, 0, 1]
+    assert arrays["message_type"].tolist() == [1, 1, 2, 2]
+    assert arrays["pitch"].tolist() == [60, 61, 60, 60]
+    assert arrays["velocity"].tolist() == [100, 90, 0, 0]
+    assert arrays["offset"][:2].tolist() == [0.5, 0.5]
+    assert numpy.isnan(arrays["offset"][2:]).all()
+
+
+@pytest.mark.asyncio
+async def test_ring_non_note_messages(device):
+    with device.capture(size=8) as transcript:
+        await device.perform([ControllerChangeMessage(controller_number=1)])
+    assert [(x.label, x.message_type) for x in transcript] == [
+        ("I", ControllerChangeMessage),
+        ("O", ControllerChangeMessage),
+    ]
+    assert math.isnan(transcript[0].pitch)
+
+
+@pytest.mark.asyncio
+async def test_ring_unknown_messages(device):
+    with device.capture(size=8) as transcript:
+        await device.perform([MidiMessage(channel_number=1)])
+    assert transcript[0].label == "I"
+    assert transcript[0].message_type is MidiMessage
+    assert transcript.to_numpy()["message_type"].tolist()[0] == 4
@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+from supriya.clocks import AsyncTempoClock
+
+from tloen.domain import Allocatable, Application, Note
+from tloen.domain.clips import ClipLaunched, SceneFired
+
+
+@pytest.fixture
+async def application(mocker, monkeypatch):
+    async def wait_for_event(self, sleep_time):
+        await asyncio.sleep(0)
+        await self._event.wait()
+
+    monkeypatch.setattr(AsyncTempoClock, "_wait_for_event", wait_for_event)
+    mock_time = mocker.patch.object(AsyncTempoClock, "get_current_time")
+    mock_time.return_value = 0.0
+    application = await Application.new(1, 4, 2)
+    for i, track in enumerate(application.contexts[0].tracks):
+        await track.slots[0].add_clip(notes=[Note(0.0, 0.5, pitch=i)])
+        if i % 2:
+            await track.slots[1].add_clip(notes=[Note(0.0, 0.5, pitch=i + 64)])
+    yield application
+    await application.transport.stop()
+
+
+async def set_time(new_time, transport):
+    transport._clock.get_current_time.return_value = new_time
+    transport._clock._event.set()
+    await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_fire(application, mocker):
+    transport = application.transport
+    tracks = application.contexts[0].tracks
+    events = []
+    application.pubsub.subscribe(events.append, ClipLaunched, SceneFired)
+    cue = mocker.spy(transport._clock, "cue")
+    lock = mocker.spy(Allocatable, "lock")
+    captures = [track.capture() for track in tracks]
+    for capture in captures:
+        capture.__enter__()
+    await application.scenes[0].fire()
+    assert cue.call_count == 2  # the launch and the transport tick
+    assert set(transport._clip_launches) == {tracks[0]._clip_launch_event_id}
+    await set_time(0.0, transport)
+    await set_time(0.5, transport)
+    await application.scenes[1].fire()
+    for seconds in range(1, 4):
+        await set_time(seconds, transport)
+    for capture in captures:
+        capture.__exit__(None, None, None)
+    assert not transport._clip_launches
+    # launch at 0.0, note offs at 0.5, launch at 1.0
+    assert [len(call.args[0]) for call in lock.call_args_list].count(4) == 3
+    assert [type(event).__name__ for event in events] == [
+        "SceneFired",
+        *["ClipLaunched"] * 4,
+        "SceneFired",
+        *["ClipLaunched"] * 2,
+    ]
+    assert [track._active_slot_index for track in tracks] == [None, 1, None, 1]
+    for i, capture in enumerate(captures):
+        expected = [(0.0, "NoteOnMessage", i), (0.5, "NoteOffMessage", i)]
+        if i % 2:
+            expected.extend(
+                [(1.0, "NoteOnMessage", i + 64), (1.5, "NoteOffMessage", i + 64)]
+            )
+        assert [
+            (entry.moment.offset, type(entry.message).__name__, entry.message.pitch)
+            for entry in capture
+            if entry.label == "I"
+        ] == expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_refire_track(application):
+    transport = application.transport
+    tracks = application.contexts[0].tracks
+    await application.scenes[0].fire()
+    event_id = tracks[0]._clip_launch_event_id
+    await tracks[0].slots[1].fire()
+    assert tracks[0]._clip_launch_event_id != event_id
+    assert list(transport._clip_launches[event_id]) == list(tracks[1:])
+    await set_time(0.0, transport)
+    assert not transport._clip_launches
+    assert [track._active_slot_index for track in tracks] == [None, 0, 0, 0]
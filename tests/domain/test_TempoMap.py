@@ -0,0 +1,53 @@
+import pytest
+
+from tloen.domain.tempos import TempoMap
+
+
+def test_conversions():
+    tempo_map = TempoMap()
+    tempo_map.set_change(1.0, beats_per_minute=60)
+    tempo_map.set_change(2.0, time_signature=(3, 4))
+    assert len(tempo_map) == 3
+    assert [
+        tempo_map.offset_to_seconds(offset) for offset in [-1.0, 0.5, 1.0, 1.5, 2.75]
+    ] == [-2.0, 1.0, 2.0, 4.0, 9.0]
+    assert [
+        tempo_map.seconds_to_offset(seconds) for seconds in [-2.0, 1.0, 4.0, 9.0]
+    ] == [-1.0, 0.5, 1.5, 2.75]
+    moment = tempo_map.offset_to_moment(2.75)
+    assert moment.beats_per_minute == 60.0
+    assert moment.time_signature == (3, 4)
+    assert (moment.measure, moment.measure_offset) == (4, 0.0)
+    assert moment.seconds == 9.0
+
+
+def test_set_change():
+    tempo_map = TempoMap()
+    tempo_map.set_change(1.0, time_signature=(3, 4))
+    assert tempo_map.get_segment(1.5).beats_per_minute == 120.0
+    # omitted values follow the segment before
+    tempo_map.set_change(0.0, beats_per_minute=240)
+    assert tempo_map.get_segment(1.5).beats_per_minute == 240.0
+    assert tempo_map.offset_to_seconds(1.5) == 1.5
+    tempo_map.set_change(1.0, beats_per_minute=60)
+    assert tempo_map.get_segment(1.5).time_signature == (3, 4)
+    assert tempo_map._serialize() == [
+        {"offset": 1.0, "tempo": 60.0, "time_signature": [3, 4]}
+    ]
+    tempo_map.remove_change(1.0)
+    assert tempo_map.segments == (tempo_map.get_segment(1.5),)
+    assert tempo_map.get_segments_after(0.0) == []
+
+
+def test_invalid():
+    tempo_map = TempoMap()
+    with pytest.raises(ValueError):
+        tempo_map.remove_change(0.0)
+    with pytest.raises(ValueError):
+        tempo_map.remove_change(1.0)
+    with pytest.raises(ValueError):
+        tempo_map.set_change(-1.0, beats_per_minute=60)
+    with pytest.raises(ValueError):
+        tempo_map.set_change(1.0, beats_per_minute=0)
+    with pytest.raises(ValueError):
+        tempo_map.set_change(1.0, time_signature=(0, 4))
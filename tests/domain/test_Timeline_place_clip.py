@@ -0,0 +1,74 @@
+import pytest
+
+from tloen.domain import Application, ClipInstance, Note, Timeline
+
+
+@pytest.mark.asyncio
+async def test_place():
+    timeline = Timeline()
+    clip = await timeline.add_clip(duration=1.0)
+    assert clip.parent is timeline
+    assert timeline.get_clip(clip.uuid) is clip
+    one = await timeline.place_clip(clip, 4.0)
+    two = await timeline.place_clip(clip, 0.0, 2.0)
+    assert one == ClipInstance(4.0, 5.0, clip.uuid)
+    assert two == ClipInstance(0.0, 2.0, clip.uuid)
+    assert timeline.instances == (two, one)
+    assert timeline.stop_offset == 5.0
+    assert timeline.get_instance_at(-1.0) is None
+    assert timeline.get_instance_at(0.0) == two
+    assert timeline.get_instance_at(2.0) is None
+    assert timeline.get_instance_at(4.5) == one
+    assert timeline.get_instances(1.0, 4.5) == [two, one]
+    assert timeline.get_instances(2.0, 4.0) == []
+    assert timeline.get_offset_after(-1.0) == 0.0
+    assert timeline.get_offset_after(1.0) == 2.0
+    assert timeline.get_offset_after(2.0) == 4.0
+    assert timeline.get_offset_after(5.0) is None
+    with pytest.raises(ValueError):
+        await timeline.place_clip(clip, 1.0, 1.0)
+    with pytest.raises(ValueError):
+        await Timeline().place_clip(clip, 0.0)
+
+
+@pytest.mark.asyncio
+async def test_overlap():
+    timeline = Timeline()
+    clip_one = await timeline.add_clip(duration=8.0)
+    clip_two = await timeline.add_clip(duration=1.0)
+    await timeline.place_clip(clip_one, 0.0)
+    # split
+    instance = await timeline.place_clip(clip_two, 2.0)
+    assert timeline.instances == (
+        ClipInstance(0.0, 2.0, clip_one.uuid),
+        instance,
+        ClipInstance(3.0, 8.0, clip_one.uuid, clip_offset=3.0),
+    )
+    # truncate and replace
+    await timeline.place_clip(clip_two, 1.0, 4.0, clip_offset=0.5)
+    assert timeline.instances == (
+        ClipInstance(0.0, 1.0, clip_one.uuid),
+        ClipInstance(1.0, 4.0, clip_two.uuid, clip_offset=0.5),
+        ClipInstance(4.0, 8.0, clip_one.uuid, clip_offset=4.0),
+    )
+    await timeline.remove_instances(timeline.instances[0])
+    with pytest.raises(ValueError):
+        await timeline.remove_instances(ClipInstance(0.0, 1.0, clip_one.uuid))
+    await timeline.remove_clips(clip_one)
+    assert timeline.clips == (clip_two,)
+    assert timeline.instances == (
+        ClipInstance(1.0, 4.0, clip_two.uuid, clip_offset=0.5),
+    )
+
+
+@pytest.mark.asyncio
+async def test_serialize():
+    application = await Application.new(1, 1, 1)
+    track = application.contexts[0].tracks[0]
+    clip = await track.timeline.add_clip(notes=[Note(0.0, 0.25, pitch=60)])
+    await track.timeline.place_clip(clip, 1.0, 3.0, clip_offset=0.25)
+    new_application = await Application.deserialize(application.serialize())
+    new_track = new_application.contexts[0].tracks[0]
+    assert new_track.timeline.uuid == track.timeline.uuid
+    assert new_track.timeline.instances == track.timeline.instances
+    assert new_track.timeline.get_clip(clip.uuid).notes == clip.notes
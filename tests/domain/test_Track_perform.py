@@ -0,0 +1,129 @@
+import pytest
+
+from tloen.domain import Application, AudioEffect, RackDevice, Transfer
+from tloen.midi import NoteOffMessage, NoteOnMessage
+
+
+@pytest.fixture
+async def track(dc_index_synthdef_factory):
+    application = Application()
+    context = await application.add_context()
+    track = await context.add_track(name="Track")
+    await track.add_device(
+        AudioEffect, name="Before", synthdef=dc_index_synthdef_factory
+    )
+    rack = await track.add_device(RackDevice, name="Rack")
+    for name, in_pitch in [("One", 60), ("Two", 61)]:
+        chain = await rack.add_chain(
+            name=name, transfer=Transfer(in_pitch=in_pitch, out_pitch=60)
+        )
+        await chain.add_device(
+            AudioEffect, name=f"{name}/Device", synthdef=dc_index_synthdef_factory
+        )
+    await track.add_device(
+        AudioEffect, name="After", synthdef=dc_index_synthdef_factory
+    )
+    return track
+
+
+@pytest.mark.asyncio
+async def test_routing(track):
+    messages = [
+        NoteOnMessage(pitch=60, velocity=100),
+        NoteOnMessage(pitch=61, velocity=100),
+    ]
+    with track["One/Device"].capture() as one, track["Two/Device"].capture() as two:
+        with track["After"].capture() as after, track.capture() as track_capture:
+            await track.perform(messages)
+    assert [(x.label, x.message.pitch) for x in one] == [("I", 60), ("O", 60)]
+    assert [(x.label, x.message.pitch) for x in two] == [("I", 60), ("O", 60)]
+    # The rack's output deduplicates the note on arriving from both chains
+    assert [(x.label, x.message.pitch) for x in after] == [("I", 60), ("O", 60)]
+    assert [(x.label, x.message.pitch) for x in track_capture] == [
+        ("I", 60),
+        ("I", 61),
+        ("O", 60),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_no_devices():
+    application = Application()
+    context = await application.add_context()
+    track = await context.add_track()
+    with track.capture() as transcript:
+        await track.perform([NoteOnMessage(pitch=60, velocity=100)])
+        await track.perform([NoteOffMessage(pitch=60)])
+    assert [(x.label, type(x.message)) for x in transcript] == [
+        ("I", NoteOnMessage),
+        ("O", NoteOnMessage),
+        ("I", NoteOffMessage),
+        ("O", NoteOffMessage),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_rack_fan_in(dc_index_synthdef_factory):
+    application = Application()
+    context = await application.add_context()
+    track = await context.add_track()
+    rack = await track.add_device(RackDevice)
+    for name in ["One", "Two"]:
+        chain = await rack.add_chain(name=name)
+        await chain.add_device(
+            AudioEffect, name=f"{name}/Device", synthdef=dc_index_synthdef_factory
+        )
+    await track.perform([NoteOnMessage(pitch=60, velocity=100)])
+    with track["One/Device"].capture() as one, track["Two/Device"].capture() as two:
+        with track.capture() as track_capture:
+            await track.perform(
+                [NoteOffMessage(pitch=60), NoteOnMessage(pitch=60, velocity=100)]
+            )
+    # Each chain sees the input once, not the other chain's output
+    for transcript in [one, two]:
+        assert [(x.label, type(x.message)) for x in transcript] == [
+            ("I", NoteOffMessage),
+            ("I", NoteOnMessage),
+            ("O", NoteOffMessage),
+            ("O", NoteOnMessage),
+        ]
+    # The rack's output merges both chains into a single off and on
+    assert [(x.label, type(x.message)) for x in track_capture] == [
+        ("I", NoteOffMessage),
+        ("I", NoteOnMessage),
+        ("O", NoteOffMessage),
+        ("O", NoteOnMessage),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_sibling_tracks():
+    application = Application()
+    context = await application.add_context()
+    one = await context.add_track()
+    two = await context.add_track()
+    with one.capture() as transcript_one, two.capture() as transcript_two:
+        await one.perform([NoteOnMessage(pitch=60, velocity=100)])
+    assert [x.label for x in transcript_one] == ["I", "O"]
+    # Tracks are terminal, so a track's output does not feed the next track
+    assert list(transcript_two) == []
+
+
+@pytest.mark.asyncio
+async def test_rerouted_on_mutation(track, dc_index_synthdef_factory):
+    after = track["After"]
+    assert track["Rack"]._next_performer() == after._perform_input
+    assert after._next_performer() == track._perform_output
+    last = await track.add_device(
+        AudioEffect, name="Last", synthdef=dc_index_synthdef_factory
+    )
+    assert after._next_performer() == last._perform_input
+    assert last._next_performer() == track._perform_output
+    await after.move(track, 0)
+    assert after._next_performer() == track["Before"]._perform_input
+    assert track["Rack"]._next_performer() == last._perform_input
+    await last.delete()
+    assert track["Rack"]._next_performer() == track._perform_output
+    chain = track["One"]
+    assert chain._next_performer() == track["Rack"]._perform_output
+    assert track._next_performer() is None
@@ -0,0 +1,69 @@
+import pytest
+
+from tloen.domain import Application, Note
+
+
+@pytest.fixture
+async def application():
+    application = await Application.new(1, 1, 1)
+    await application.transport.set_virtual(True)
+    await application.contexts[0].tracks[0].slots[0].add_clip(
+        notes=[Note(x / 4, (x + 1) / 4, pitch=x) for x in range(4)]
+    )
+    yield application
+    await application.transport.stop()
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_advance(application):
+    transport = application.transport
+    track = application.contexts[0].tracks[0]
+    with track.capture() as capture:
+        await track.slots[0].fire()
+        await transport.advance(2.0)
+        entries = [
+            (entry.moment.offset, type(entry.message).__name__, entry.message.pitch)
+            for entry in capture
+            if entry.label == "I"
+        ]
+        assert entries == [
+            (0.0, "NoteOnMessage", 0),
+            (0.25, "NoteOffMessage", 0),
+            (0.25, "NoteOnMessage", 1),
+            (0.5, "NoteOffMessage", 1),
+            (0.5, "NoteOnMessage", 2),
+            (0.75, "NoteOffMessage", 2),
+            (0.75, "NoteOnMessage", 3),
+            (1.0, "NoteOffMessage", 3),
+            (1.0, "NoteOnMessage", 0),
+        ]
+        # a minute of music, without waiting a minute
+        await transport.advance(118.0)
+    assert transport.clock.get_current_time() == 120.0
+    note_ons = [
+        entry.moment.offset
+        for entry in capture
+        if entry.label == "I" and type(entry.message).__name__ == "NoteOnMessage"
+    ]
+    assert len(note_ons) == 241
+    assert note_ons[-1] == 60.0
+    assert all(entry.moment.seconds == entry.moment.offset * 2 for entry in capture)
+
+
+@pytest.mark.asyncio
+async def test_set_virtual(application):
+    transport = application.transport
+    await transport.set_virtual(False)
+    assert not transport.is_virtual
+    with pytest.raises(ValueError):
+        await transport.advance(1.0)
+    await transport.set_tempo(90)
+    await transport.set_virtual(True)
+    assert transport.is_virtual
+    assert transport.clock.beats_per_minute == 90
+    await transport.start()
+    with pytest.raises(ValueError):
+        await transport.set_virtual(False)
+    with pytest.raises(ValueError):
+        await transport.advance(-1.0)
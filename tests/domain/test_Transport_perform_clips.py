@@ -0,0 +1,176 @@
+import asyncio
+
+import pytest
+from supriya.clocks import AsyncTempoClock
+
+from tloen.domain import Allocatable, Application, BusParameter, Note
+
+
+@pytest.fixture
+async def application(mocker, monkeypatch):
+    async def wait_for_event(self, sleep_time):
+        await asyncio.sleep(0)
+        await self._event.wait()
+
+    monkeypatch.setattr(AsyncTempoClock, "_wait_for_event", wait_for_event)
+    mock_time = mocker.patch.object(AsyncTempoClock, "get_current_time")
+    mock_time.return_value = 0.0
+    application = await Application.new(1, 8, 2)
+    for i, track in enumerate(application.contexts[0].tracks):
+        await track.slots[0].add_clip(
+            notes=[Note(x / 4, (x + 1) / 4, pitch=i * 8 + x) for x in range(4)]
+        )
+    yield application
+    await application.transport.stop()
+
+
+async def set_time(new_time, transport):
+    transport._clock.get_current_time.return_value = new_time
+    transport._clock._event.set()
+    await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_merged(application, mocker):
+    transport = application.transport
+    tracks = application.contexts[0].tracks
+    callback = mocker.spy(transport, "_clip_perform_callback")
+    lock = mocker.spy(Allocatable, "lock")
+    captures = [track.capture() for track in tracks]
+    for capture in captures:
+        capture.__enter__()
+    await application.scenes[0].fire()
+    for seconds in range(4):
+        await set_time(seconds * 0.5, transport)
+    for capture in captures:
+        capture.__exit__(None, None, None)
+    # the launch performs offset 0.0 itself
+    assert callback.call_count == 3
+    assert [len(call.args[0]) for call in lock.call_args_list].count(8) == 4
+    assert transport._clip_event_offset == 1.0
+    assert len(transport._clip_entries) == 8
+    for i, capture in enumerate(captures):
+        assert [
+            (entry.moment.offset, type(entry.message).__name__, entry.message.pitch)
+            for entry in capture
+            if entry.label == "I"
+        ] == [
+            (0.0, "NoteOnMessage", i * 8),
+            (0.25, "NoteOffMessage", i * 8),
+            (0.25, "NoteOnMessage", i * 8 + 1),
+            (0.5, "NoteOffMessage", i * 8 + 1),
+            (0.5, "NoteOnMessage", i * 8 + 2),
+            (0.75, "NoteOffMessage", i * 8 + 2),
+            (0.75, "NoteOnMessage", i * 8 + 3),
+        ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_edit_and_stop(application):
+    transport = application.transport
+    track = application.contexts[0].tracks[0]
+    await track.slots[0].fire()
+    await set_time(0.0, transport)
+    assert transport._clip_entries[track][0] == 0.25
+    await set_time(0.25, transport)
+    await track.slots[0].clip.add_notes([Note(0.125, 0.25, pitch=100)])
+    assert transport._clip_entries[track][0] == 0.125
+    assert transport._clip_event_offset == 0.125
+    await track.slots[1].fire()
+    await set_time(2.0, transport)
+    assert track not in transport._clip_entries
+    assert transport._clip_event_id is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_envelopes(application, mocker):
+    transport = application.transport
+    track = application.contexts[0].tracks[0]
+    parameter = track.parameters["gain"]
+    ramp = mocker.spy(BusParameter, "ramp")
+    await track.slots[0].clip.set_envelope(
+        parameter.uuid, [(0.0, -12.0), (0.5, 0.0), (1.0, -12.0)]
+    )
+    await track.slots[0].fire()
+    for seconds in range(5):
+        await set_time(seconds * 0.5, transport)
+    assert [
+        (call.args[1:], call.kwargs["initial_time"], call.kwargs["moment"].offset)
+        for call in ramp.call_args_list
+    ] == [
+        ((-12.0, 0.0, 1.0), 0.0, 0.0),
+        ((0.0, -12.0, 1.0), 0.0, 0.5),
+        ((-12.0, 0.0, 1.0), 0.0, 1.0),
+    ]
+    assert parameter.value == 0.0
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_stop_and_restart(application):
+    transport = application.transport
+    track = application.contexts[0].tracks[0]
+    await track.slots[0].fire()
+    await set_time(0.0, transport)
+    assert transport._clip_event_offset == 0.25
+    await transport.stop()
+    assert not transport._clip_entries
+    assert not transport._clip_queue
+    assert transport._clip_event_id is None
+    assert transport._clip_event_offset is None
+    with track.capture() as capture:
+        await track.slots[0].fire()
+        assert transport.is_running
+        await set_time(0.0, transport)
+        await set_time(0.5, transport)
+    assert [
+        (entry.moment.offset, type(entry.message).__name__, entry.message.pitch)
+        for entry in capture
+        if entry.label == "I"
+    ] == [
+        (0.0, "NoteOnMessage", 0),
+        (0.25, "NoteOffMessage", 0),
+        (0.25, "NoteOnMessage", 1),
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_timeline(application):
+    transport = application.transport
+    track = application.contexts[0].tracks[0]
+    clip = await track.timeline.add_clip(
+        duration=0.5,
+        is_looping=False,
+        notes=[Note(0.0, 0.25, pitch=60), Note(0.25, 0.5, pitch=61)],
+    )
+    await track.timeline.place_clip(clip, 0.25, 0.75)
+    await track.timeline.place_clip(clip, 1.0, 1.5, clip_offset=0.25)
+    with track.capture() as capture:
+        await transport.start()
+        for offset in [0.0, 0.25, 0.5, 0.75, 1.0, 1.25, 1.5]:
+            await set_time(offset * 2, transport)
+        assert transport.arrangement_offset == 1.5
+        assert track not in transport._clip_entries
+        await transport.seek(0.5)
+        assert transport._clip_entries[track][0] == 1.5
+        await set_time(1.75 * 2, transport)
+    assert [
+        (entry.moment.offset, type(entry.message).__name__, entry.message.pitch)
+        for entry in capture
+        if entry.label == "I"
+    ] == [
+        (0.25, "NoteOnMessage", 60),
+        (0.5, "NoteOffMessage", 60),
+        (0.5, "NoteOnMessage", 61),
+        (0.75, "NoteOffMessage", 61),
+        (1.0, "NoteOffMessage", 60),
+        (1.0, "NoteOnMessage", 61),
+        (1.25, "NoteOffMessage", 61),
+        (1.5, "NoteOffMessage", 60),
+        (1.5, "NoteOnMessage", 61),
+        (1.75, "NoteOffMessage", 61),
+    ]
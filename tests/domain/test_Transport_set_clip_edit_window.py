@@ -0,0 +1,106 @@
+import asyncio
+import logging
+
+import pytest
+
+from tloen.domain import Application, Note
+from tloen.domain.clips import ClipModified
+
+
+@pytest.fixture
+async def clip():
+    application = Application()
+    context = await application.add_context()
+    track = await context.add_track()
+    await application.add_scene()
+    return await track.slots[0].add_clip(notes=[Note(0, 1, pitch=60)])
+
+
+@pytest.fixture
+def events(clip):
+    events = []
+    clip.application.pubsub.subscribe(events.append, ClipModified)
+    return events
+
+
+@pytest.mark.asyncio
+async def test_synchronous(clip, events):
+    await clip.add_notes([Note(0.5, 1, pitch=60), Note(0, 1, pitch=62)])
+    assert events == [
+        ClipModified(
+            clip.uuid,
+            added_notes=(
+                Note(0, 0.5, pitch=60),
+                Note(0, 1, pitch=62),
+                Note(0.5, 1, pitch=60),
+            ),
+            removed_notes=(Note(0, 1, pitch=60),),
+        )
+    ]
+    await clip.remove_notes([Note(0, 1, pitch=62)])
+    assert events[-1] == ClipModified(clip.uuid, removed_notes=(Note(0, 1, pitch=62),))
+
+
+@pytest.mark.asyncio
+async def test_coalesced(clip, events, mocker):
+    schedule_clip = mocker.spy(clip.transport, "_schedule_clip")
+    clip._is_playing = True
+    await clip.transport.set_clip_edit_window(0.01)
+    for pitch in range(64, 72):
+        await clip.add_notes([Note(0, 0.25, pitch=pitch)])
+    await clip.remove_notes([Note(0, 0.25, pitch=64)])
+    await clip.remove_notes([Note(0, 1, pitch=60)])
+    await clip.add_notes([Note(0, 1, pitch=60)])
+    assert events == []
+    await asyncio.sleep(0.05)
+    assert events == [
+        ClipModified(
+            clip.uuid,
+            added_notes=tuple(Note(0, 0.25, pitch=pitch) for pitch in range(65, 72)),
+        )
+    ]
+    assert schedule_clip.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_invalid(clip):
+    with pytest.raises(ValueError):
+        await clip.transport.set_clip_edit_window(-1)
+
+
+@pytest.mark.asyncio
+async def test_removed(clip, events):
+    await clip.transport.set_clip_edit_window(0.01)
+    await clip.add_notes([Note(0, 0.25, pitch=64)])
+    task = clip._notify_task
+    await clip.parent.remove_clip()
+    assert clip._notify_task is None
+    await asyncio.sleep(0.05)
+    assert task.cancelled()
+    assert events == []
+
+
+@pytest.mark.asyncio
+async def test_transport_stop(clip, events, mocker):
+    await clip.transport.start()
+    schedule_clip = mocker.spy(clip.transport, "_schedule_clip")
+    clip._is_playing = True
+    await clip.transport.set_clip_edit_window(10)
+    await clip.add_notes([Note(0, 0.25, pitch=64)])
+    assert events == []
+    await clip.transport.stop()
+    assert clip._notify_task is None
+    assert events == [ClipModified(clip.uuid, added_notes=(Note(0, 0.25, pitch=64),))]
+    assert not schedule_clip.call_count
+
+
+@pytest.mark.asyncio
+async def test_failure(clip, caplog, mocker):
+    mocker.patch.object(clip.transport, "_schedule_clip", side_effect=RuntimeError)
+    clip._is_playing = True
+    await clip.transport.set_clip_edit_window(0.01)
+    with caplog.at_level(logging.ERROR, logger="tloen.domain"):
+        await clip.add_notes([Note(0, 0.25, pitch=64)])
+        await asyncio.sleep(0.05)
+    assert "Failed to notify edits" in caplog.text
+    assert clip._notify_task is None
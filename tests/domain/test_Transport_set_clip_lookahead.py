@@ -0,0 +1,146 @@
+import asyncio
+
+import pytest
+from supriya.clocks import AsyncTempoClock
+
+from tloen.domain import Application, Note
+from tloen.midi import NoteOffMessage, NoteOnMessage
+
+
+@pytest.fixture
+def mock_clock(mocker, monkeypatch):
+    async def wait_for_event(self, sleep_time):
+        await asyncio.sleep(0)
+        await self._event.wait()
+
+    monkeypatch.setattr(AsyncTempoClock, "_wait_for_event", wait_for_event)
+    mock_time = mocker.patch.object(AsyncTempoClock, "get_current_time")
+    mock_time.return_value = 0.0
+
+
+async def set_time(new_time, transport):
+    transport._clock.get_current_time.return_value = new_time
+    transport._clock._event.set()
+    await asyncio.sleep(0.01)
+
+
+async def perform(lookahead, mocker):
+    AsyncTempoClock.get_current_time.return_value = 0.0
+    application = await Application.new(1, 1, 1)
+    await application.transport.set_clip_lookahead(lookahead)
+    track = application.contexts[0].tracks[0]
+    await track.slots[0].add_clip(
+        notes=[Note(x / 16, (x + 1) / 16, pitch=60 + x) for x in range(16)]
+    )
+    callback = mocker.spy(application.transport, "_clip_perform_callback")
+    with track.capture() as transcript:
+        await track.slots[0].fire()
+        for seconds in range(5):
+            await set_time(seconds * 0.5, application.transport)
+    await application.transport.stop()
+    return (
+        [
+            (entry.moment.offset, entry.moment.seconds, entry.label, entry.message)
+            for entry in transcript
+            if entry.moment.offset < 1.0
+        ],
+        callback.call_count,
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_lookahead(mock_clock, mocker):
+    expected, expected_call_count = await perform(None, mocker)
+    actual, call_count = await perform(1 / 4, mocker)
+    assert actual == expected
+    assert len(expected) == (16 + 15) * 2
+    assert expected_call_count == 17
+    assert call_count == 5
+
+
+@pytest.mark.asyncio
+async def test_invalid():
+    application = Application()
+    with pytest.raises(ValueError):
+        await application.transport.set_clip_lookahead(0)
+    assert application.transport.clip_lookahead is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_edit(mock_clock):
+    application = await Application.new(1, 1, 1)
+    await application.transport.set_clip_lookahead(1 / 4)
+    track = application.contexts[0].tracks[0]
+    clip = await track.slots[0].add_clip(
+        notes=[Note(x / 16, (x + 1) / 16, pitch=60 + x) for x in range(16)]
+    )
+    with track.capture() as transcript:
+        await track.slots[0].fire()
+        await set_time(0.0, application.transport)
+        # the window up to 1/4 is already performed
+        await clip.add_notes([Note(1 / 2, 9 / 16, pitch=90)])
+        for seconds in range(1, 5):
+            await set_time(seconds * 0.5, application.transport)
+    await application.transport.stop()
+    note_ons = [
+        (entry.moment.offset, entry.message.pitch)
+        for entry in transcript
+        if entry.label == "I"
+        and isinstance(entry.message, NoteOnMessage)
+        and entry.moment.offset < 1.0
+    ]
+    assert len(note_ons) == len(set(note_ons)) == 17
+    assert (1 / 2, 90) in note_ons
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_stop(mock_clock):
+    application = await Application.new(1, 1, 1)
+    await application.transport.set_clip_lookahead(1)
+    track = application.contexts[0].tracks[0]
+    await track.slots[0].add_clip(
+        notes=[Note(x / 16, (x + 1) / 16, pitch=60 + x) for x in range(16)]
+    )
+    with track.capture() as transcript:
+        await track.slots[0].fire()
+        await set_time(0.0, application.transport)
+        # stop a quarter into the measure already performed
+        await track.stop(quantization="1/4")
+        await set_time(0.5, application.transport)
+    await application.transport.stop()
+    note_on_offsets = {}
+    for entry in transcript:
+        if entry.label != "I":
+            continue
+        if isinstance(entry.message, NoteOnMessage):
+            assert entry.message.pitch not in note_on_offsets
+            note_on_offsets[entry.message.pitch] = entry.moment.offset
+        elif isinstance(entry.message, NoteOffMessage):
+            note_on_offset = note_on_offsets.pop(entry.message.pitch)
+            assert entry.moment.offset >= note_on_offset
+    assert not note_on_offsets
+    assert not track._input_pitches
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_transport_stop(mock_clock):
+    application = await Application.new(1, 1, 1)
+    await application.transport.set_clip_lookahead(1 / 2)
+    track = application.contexts[0].tracks[0]
+    await track.slots[0].add_clip(notes=[Note(1 / 4, 3 / 4, pitch=61)])
+    with track.capture() as transcript:
+        await track.slots[0].fire()
+        # the note on at 1/4 is performed ahead, its note off is not
+        await set_time(0.0, application.transport)
+        assert 61 in track._input_pitches
+        await application.transport.stop()
+    assert [
+        (entry.moment.offset, type(entry.message), entry.message.pitch)
+        for entry in transcript
+        if entry.label == "I"
+    ] == [(1 / 4, NoteOnMessage, 61), (1 / 4, NoteOffMessage, 61)]
+    assert not track._input_pitches
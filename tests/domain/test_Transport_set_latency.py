@@ -0,0 +1,59 @@
+import pytest
+from supriya.clocks import AsyncTempoClock
+
+from tloen.domain import Allocatable, Application
+
+
+@pytest.fixture
+async def application(mocker):
+    mock_time = mocker.patch.object(AsyncTempoClock, "get_current_time")
+    mock_time.return_value = 0.0
+    application = await Application.new(1, 1, 1)
+    await application.boot()
+    yield application
+    await application.quit()
+
+
+@pytest.mark.asyncio
+async def test_compensated(application, mocker):
+    transport = application.transport
+    track = application.contexts[0].tracks[0]
+    at = mocker.spy(type(track.provider), "at")
+    await transport.set_latency(0.25)
+    assert transport.latency == 0.25
+    async with Allocatable.lock([track], seconds=1.0):
+        # nested locks share the outermost timestamp
+        async with Allocatable.lock([track], seconds=1.0):
+            pass
+    async with Allocatable.lock([track]):
+        pass
+    assert [call.args[1:] for call in at.call_args_list] == [(1.25,), (1.25,), (None,)]
+    assert transport.bundle_statistics.count == 1
+    assert transport.bundle_statistics.late_count == 0
+
+
+@pytest.mark.asyncio
+async def test_late(application):
+    transport = application.transport
+    track = application.contexts[0].tracks[0]
+    await transport.set_latency(0.25)
+    transport._clock.get_current_time.return_value = 2.0
+    async with Allocatable.lock([track], seconds=1.0):
+        pass
+    async with Allocatable.lock([track], seconds=2.0):
+        pass
+    statistics = transport.bundle_statistics
+    assert (statistics.count, statistics.late_count) == (2, 1)
+    assert statistics.max_lateness == 0.75
+    assert statistics.late_ratio == 0.5
+    transport.reset_bundle_statistics()
+    assert transport.bundle_statistics.count == 0
+
+
+@pytest.mark.asyncio
+async def test_offline():
+    application = await Application.new(1, 1, 1)
+    await application.transport.set_latency(0.25)
+    assert application.transport._compensate_latency(1.0) is None
+    with pytest.raises(ValueError):
+        await application.transport.set_latency(-1)
@@ -0,0 +1,88 @@
+import asyncio
+import types
+
+import pytest
+from supriya.clocks import AsyncTempoClock
+
+from tloen.domain import Application
+from tloen.domain.transports import Histogram, TransportMeasured
+
+
+@pytest.fixture
+async def application(mocker, monkeypatch):
+    async def wait_for_event(self, sleep_time):
+        await asyncio.sleep(0)
+        await self._event.wait()
+
+    monkeypatch.setattr(AsyncTempoClock, "_wait_for_event", wait_for_event)
+    mock_time = mocker.patch.object(AsyncTempoClock, "get_current_time")
+    mock_time.return_value = 0.0
+    application = await Application.new(1, 1, 1)
+    yield application
+    await application.transport.stop()
+
+
+async def set_time(new_time, transport):
+    transport._clock.get_current_time.return_value = new_time
+    transport._clock._event.set()
+    await asyncio.sleep(0.01)
+
+
+def test_histogram():
+    histogram = Histogram(bounds=(0.1, 1.0))
+    for value in [-1.0, 0.0, 0.5, 2.5]:
+        histogram.add(value)
+    assert histogram.counts == [2, 1, 1]
+    assert histogram.count == 4
+    assert histogram.maximum == 2.5
+    assert histogram.mean == 0.5
+    assert Histogram().mean is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_metrics(application):
+    transport = application.transport
+    events = []
+    application.pubsub.subscribe(events.append, TransportMeasured)
+    await transport.set_metrics_interval(0.01)
+    assert transport.metrics_interval == 0.01
+
+    async def callback(clock_context):
+        pass
+
+    await transport.schedule(
+        callback, schedule_at=0.125, event_type=transport.EventType.MIDI_PERFORM
+    )
+    await transport.start()
+    await set_time(0.5, transport)
+    metrics = transport.metrics[transport.EventType.MIDI_PERFORM]
+    assert metrics.lateness.count == metrics.duration.count == 1
+    assert metrics.lateness.counts[-1] == 1
+    assert metrics.lateness.maximum == 0.25
+    await asyncio.sleep(0.05)
+    assert events
+    assert transport.EventType.MIDI_PERFORM in events[-1].metrics
+    transport.reset_metrics()
+    assert transport.EventType.MIDI_PERFORM not in transport.metrics
+    with pytest.raises(ValueError):
+        await transport.set_metrics_interval(0)
+
+
+@pytest.mark.asyncio
+async def test_metrics_failing(application):
+    transport = application.transport
+
+    async def callback(clock_context):
+        raise RuntimeError
+
+    procedure = transport._instrument(callback, transport.EventType.SCHEDULE)
+    clock_context = types.SimpleNamespace(
+        current_moment=types.SimpleNamespace(seconds=1.5),
+        desired_moment=types.SimpleNamespace(seconds=1.0),
+    )
+    with pytest.raises(RuntimeError):
+        await procedure(clock_context)
+    metrics = transport.metrics[transport.EventType.SCHEDULE]
+    assert metrics.lateness.count == metrics.duration.count == 1
+    assert metrics.lateness.maximum == 0.5
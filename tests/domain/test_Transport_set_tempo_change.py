@@ -0,0 +1,79 @@
+import pytest
+
+from tloen.domain import Application, Note
+
+
+@pytest.fixture
+async def application():
+    application = await Application.new(1, 1, 1)
+    await application.transport.set_virtual(True)
+    await application.contexts[0].tracks[0].slots[0].add_clip(
+        notes=[Note(x / 4, (x + 1) / 4, pitch=x) for x in range(4)]
+    )
+    yield application
+    await application.transport.stop()
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_automation(application):
+    transport = application.transport
+    track = application.contexts[0].tracks[0]
+    await transport.set_tempo_change(1.0, beats_per_minute=60)
+    with track.capture() as capture:
+        await track.slots[0].fire()
+        await transport.advance(6.0)
+    assert transport.clock.beats_per_minute == 60.0
+    assert [
+        (entry.moment.offset, entry.moment.seconds)
+        for entry in capture
+        if entry.label == "I" and type(entry.message).__name__ == "NoteOnMessage"
+    ] == [
+        (0.0, 0.0),
+        (0.25, 0.5),
+        (0.5, 1.0),
+        (0.75, 1.5),
+        (1.0, 2.0),
+        (1.25, 3.0),
+        (1.5, 4.0),
+        (1.75, 5.0),
+        (2.0, 6.0),
+    ]
+    await transport.stop()
+    # stopping returns the clock to the tempo at the playhead
+    assert transport.arrangement_offset == 2.0
+    assert transport.clock.beats_per_minute == 60.0
+    await transport.seek(0.0)
+    assert transport.clock.beats_per_minute == 120.0
+
+
+@pytest.mark.asyncio
+async def test_offset_to_moment(application):
+    transport = application.transport
+    await transport.set_tempo_change(1.0, time_signature=(3, 4))
+    await transport.start()
+    delta = transport._arrangement_delta
+    moment = transport._offset_to_moment(delta + 2.75)
+    expected = transport._tempo_map.offset_to_moment(2.75)
+    assert moment.offset == delta + 2.75
+    assert moment.time_signature == (3, 4)
+    assert (moment.measure, moment.measure_offset) == (
+        expected.measure,
+        expected.measure_offset,
+    )
+    assert moment.measure_offset == 0.25
+
+
+@pytest.mark.asyncio
+async def test_serialize(application):
+    transport = application.transport
+    await transport.set_tempo(90)
+    await transport.set_tempo_change(4.0, time_signature=(3, 4))
+    assert transport.clock.beats_per_minute == 90.0
+    assert transport._serialize()["spec"] == {
+        "tempo": 90.0,
+        "time_signature": [4, 4],
+        "tempo_changes": [{"offset": 4.0, "time_signature": [3, 4]}],
+    }
+    await transport.remove_tempo_change(4.0)
+    assert "tempo_changes" not in transport._serialize()["spec"]
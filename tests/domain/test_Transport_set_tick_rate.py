@@ -0,0 +1,51 @@
+import asyncio
+import types
+
+import pytest
+from supriya.clocks import Moment
+
+from tloen.domain import Application
+from tloen.domain.transports import TransportTicked
+
+
+def make_clock_context(offset):
+    return types.SimpleNamespace(
+        desired_moment=Moment(
+            beats_per_minute=120.0,
+            measure=1,
+            measure_offset=offset,
+            offset=offset,
+            seconds=offset * 2,
+            time_signature=(4, 4),
+        )
+    )
+
+
+@pytest.mark.asyncio
+async def test_coalesced():
+    application = Application()
+    transport = application.transport
+    await transport.set_tick_rate(100)
+    assert transport.tick_rate == 100.0
+    events = []
+    application.pubsub.subscribe(events.append, TransportTicked)
+    for offset in [0.0, 0.0625, 0.125]:
+        assert transport._tick_callback(make_clock_context(offset)) == 0.0625
+    assert events == []  # never published from the clock callback
+    await asyncio.sleep(0)
+    assert [event.moment.offset for event in events] == [0.125]
+    for offset in [0.1875, 0.25]:
+        transport._tick_callback(make_clock_context(offset))
+    await asyncio.sleep(0)
+    assert len(events) == 1  # rate limited
+    await asyncio.sleep(0.05)
+    assert [event.moment.offset for event in events] == [0.125, 0.25]
+    await asyncio.sleep(0.05)
+    assert transport._tick_task is None
+
+
+@pytest.mark.asyncio
+async def test_invalid():
+    application = Application()
+    with pytest.raises(ValueError):
+        await application.transport.set_tick_rate(0)
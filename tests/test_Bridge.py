@@ -0,0 +1,134 @@
+import asyncio
+import os
+import uuid
+
+import pytest
+
+from tloen.bridges import BridgeClient, BridgeServer, Decoder, Encoder
+from tloen.commands.scenes import FireScene
+from tloen.domain import Note
+from tloen.domain.clips import ClipModified
+from tloen.domain.transports import EventMetrics, Transport, TransportMeasured
+from tloen.pubsub import PubSub
+
+
+def test_codec():
+    encoder, decoder = Encoder(), Decoder()
+    event = ClipModified(
+        uuid.uuid4(), added_notes=(Note(0.0, 0.25, pitch=60), Note(0.5, 1.0))
+    )
+    first, second = encoder.encode(event), encoder.encode(event)
+    assert len(second) < len(first)  # classes are named once
+    assert decoder.decode(first) == decoder.decode(second) == event
+    event = TransportMeasured({Transport.EventType.CLIP_PERFORM: EventMetrics()})
+    event.metrics[Transport.EventType.CLIP_PERFORM].lateness.add(-0.5)
+    assert decoder.decode(encoder.encode(event)) == event
+    assert decoder.decode(encoder.encode([-1, 2 ** 70, "é", b"\x00", None])) == [
+        -1,
+        2 ** 70,
+        "é",
+        b"\x00",
+        None,
+    ]
+    with pytest.raises(TypeError):
+        encoder.encode(object())
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"D\x00\x10subprocess:Popen\x00",
+        b"D\x00\x17tloen.bridges:os.system\x00",
+        b"E\x00\x17tloen.domain.clips:Note\x00N",
+    ],
+)
+def test_codec_invalid_class(data):
+    with pytest.raises(ValueError):
+        Decoder().decode(data)
+
+
+def test_codec_unregistered_class():
+    encoder, decoder = Encoder(), Decoder()
+    with pytest.raises(TypeError):
+        encoder.encode(uuid.SafeUUID.safe)
+    assert decoder.decode(encoder.encode(Note(0.0, 1.0))) == Note(0.0, 1.0)
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_bridge(tmp_path):
+    path = str(tmp_path / "tloen.sock")
+    pubsub, command_queue = PubSub(), asyncio.Queue()
+    server = BridgeServer(path, pubsub, command_queue)
+    await server.start()
+    assert os.stat(path).st_mode & 0o777 == 0o600
+    client = BridgeClient(path)
+    await client.connect()
+    events = []
+    client.pubsub.subscribe(events.append, ClipModified)
+    try:
+        # events cross to the client
+        while not server._connections:
+            await asyncio.sleep(0.01)
+        event = ClipModified(uuid.uuid4())
+        pubsub.publish(event)
+        while not events:
+            await asyncio.sleep(0.01)
+        assert events == [event]
+        # commands cross to the server, and their results back
+        command = FireScene(uuid.uuid4())
+        await client.command_queue.put(command)
+        remote_command = await asyncio.wait_for(command_queue.get(), 1)
+        assert remote_command == command
+        remote_command.future.set_result(True)
+        assert await asyncio.wait_for(command.future, 1) is True
+        # and failures back as errors
+        command = FireScene(uuid.uuid4())
+        await client.command_queue.put(command)
+        remote_command = await asyncio.wait_for(command_queue.get(), 1)
+        remote_command.future.set_exception(KeyError("scene"))
+        with pytest.raises(RuntimeError, match="KeyError"):
+            await asyncio.wait_for(command.future, 1)
+        # results which can't be encoded fail, too
+        command = FireScene(uuid.uuid4())
+        await client.command_queue.put(command)
+        remote_command = await asyncio.wait_for(command_queue.get(), 1)
+        remote_command.future.set_result(object())
+        with pytest.raises(RuntimeError, match="Unencodable"):
+            await asyncio.wait_for(command.future, 1)
+        # as do commands which can't be encoded, without stopping the client
+        command = FireScene(object())
+        await client.command_queue.put(command)
+        with pytest.raises(TypeError):
+            await asyncio.wait_for(command.future, 1)
+        command = FireScene(uuid.uuid4())
+        await client.command_queue.put(command)
+        remote_command = await asyncio.wait_for(command_queue.get(), 1)
+        # and commands pending when the connection ends
+        for connection in tuple(server._connections):
+            await connection.close()
+        with pytest.raises(ConnectionError):
+            await asyncio.wait_for(command.future, 1)
+    finally:
+        await client.close()
+        await server.stop()
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_bridge_lagging_client(tmp_path):
+    path = str(tmp_path / "tloen.sock")
+    pubsub, command_queue = PubSub(), asyncio.Queue()
+    server = BridgeServer(path, pubsub, command_queue, max_buffer_size=1024)
+    await server.start()
+    reader, writer = await asyncio.open_unix_connection(path)
+    try:
+        while not server._connections:
+            await asyncio.sleep(0.01)
+        # a client which never reads is disconnected, not buffered forever
+        while server._connections:
+            pubsub.publish(ClipModified(uuid.uuid4(), added_notes=(Note(0.0, 1.0),)))
+            await asyncio.sleep(0)
+    finally:
+        writer.close()
+        await server.stop()
@@ -0,0 +1,59 @@
+import contextlib
+import dataclasses
+import logging
+import uuid
+
+import pytest
+
+from tloen.bases import Command
+from tloen.commands.applications import AddScene
+from tloen.commands.scenes import FireScene
+from tloen.core import Harness
+from tloen.domain import Allocatable, Application
+
+
+@dataclasses.dataclass
+class Succeed(Command):
+    async def do(self, harness):
+        return True
+
+    async def undo(self, harness):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_batched(mocker):
+    harness = Harness()
+    harness.domain_application = await Application.new(1, 1, 1)
+    harness.registry.set_application(harness.domain_application)
+    lock = mocker.spy(Allocatable, "lock")
+    commands = [AddScene(), AddScene(), FireScene(uuid.uuid4()), AddScene()]
+    await harness.do_commands(commands)
+    assert len(harness.domain_application.scenes) == 4
+    # one shared lock around the whole batch
+    assert lock.call_args_list[0].args[0] == list(harness.domain_application.contexts)
+    assert [command.future.done() for command in commands] == [True] * 4
+    assert commands[0].future.result() is None
+    # a failing command fails alone
+    assert isinstance(commands[2].future.exception(), KeyError)
+    assert commands[3].future.result() is None
+    assert harness.undo_stack == []
+
+
+@pytest.mark.asyncio
+async def test_lock_failure(caplog, mocker):
+    @contextlib.asynccontextmanager
+    async def lock():
+        yield
+        raise RuntimeError("send failed")
+
+    harness = Harness()
+    mocker.patch.object(Allocatable, "lock", return_value=lock())
+    commands = [Succeed(), Succeed()]
+    with caplog.at_level(logging.ERROR, logger="tloen.core"):
+        await harness.do_commands(commands)
+    for command in commands:
+        with pytest.raises(RuntimeError, match="send failed"):
+            command.future.result()
+    assert harness.undo_stack == []
+    assert "send failed" in caplog.text
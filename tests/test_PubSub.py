@@ -0,0 +1,136 @@
+import dataclasses
+
+import pytest
+
+from tloen.bases import Event
+from tloen.pubsub import PubSub
+
+
+@dataclasses.dataclass
+class Ticked(Event):
+    index: int
+
+
+@dataclasses.dataclass
+class Moved(Event):
+    index: int
+
+
+@dataclasses.dataclass
+class Nudged(Moved):
+    pass
+
+
+def test_synchronous():
+    pubsub = PubSub()
+    events = []
+    pubsub.subscribe(events.append, Ticked)
+    pubsub.publish(Ticked(0))
+    pubsub.publish(Moved(0))
+    assert events == [Ticked(0)]
+    assert pubsub.lags == {}
+    pubsub.unsubscribe(events.append, Ticked)
+    assert pubsub.subscriptions == {}
+
+
+def test_hierarchy():
+    pubsub = PubSub()
+    events, moves = [], []
+    pubsub.subscribe(events.append, Event)
+    pubsub.subscribe(moves.append, Moved, Nudged)
+    pubsub.publish(Nudged(0))
+    assert pubsub._dispatch_table[Nudged] == (moves.append, events.append)
+    pubsub.publish(Ticked(0))
+    assert events == [Nudged(0), Ticked(0)]
+    assert moves == [Nudged(0)]  # once, however many classes match
+    pubsub.unsubscribe(events.append, Event)
+    assert pubsub._dispatch_table == {}
+    pubsub.publish(Nudged(1))
+    assert events == [Nudged(0), Ticked(0)]
+    assert moves == [Nudged(0), Nudged(1)]
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest():
+    pubsub = PubSub(queue_size=2)
+    events = []
+    pubsub.subscribe(events.append, Ticked)
+    for i in range(4):
+        pubsub.publish(Ticked(i))
+    assert events == []  # never delivered on the publisher's stack
+    lag = pubsub.lags[events.append]
+    assert (lag.pending, lag.dropped) == (2, 2)
+    await pubsub.flush()
+    assert events == [Ticked(2), Ticked(3)]
+    lag = pubsub.lags[events.append]
+    assert (lag.pending, lag.max_pending, lag.delivered) == (0, 2, 2)
+
+
+@pytest.mark.asyncio
+async def test_coalesce():
+    pubsub = PubSub()
+    events = []
+    pubsub.subscribe(
+        events.append, Moved, Ticked, queue_size=2, overflow=PubSub.Overflow.COALESCE,
+    )
+    for i in range(3):
+        pubsub.publish(Ticked(i))
+    pubsub.publish(Moved(0))
+    pubsub.publish(Moved(1))
+    await pubsub.flush()
+    assert events == [Ticked(2), Moved(1)]
+    lag = pubsub.lags[events.append]
+    assert (lag.coalesced, lag.dropped) == (2, 1)
+
+
+@pytest.mark.asyncio
+async def test_coalesce_unkeyed():
+    pubsub = PubSub()
+    events = []
+    pubsub.subscribe(
+        events.append,
+        Moved,
+        Ticked,
+        queue_size=2,
+        overflow=PubSub.Overflow.COALESCE,
+        key=lambda event: type(event) if isinstance(event, Ticked) else None,
+    )
+    pubsub.publish(Ticked(0))
+    pubsub.publish(Moved(0))
+    # drops the only keyed event
+    pubsub.publish(Moved(1))
+    # delivers the backlog itself
+    pubsub.publish(Moved(2))
+    assert events == [Moved(0), Moved(1)]
+    await pubsub.flush()
+    assert events == [Moved(0), Moved(1), Moved(2)]
+    lag = pubsub.lags[events.append]
+    assert (lag.coalesced, lag.dropped, lag.blocked) == (0, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_block():
+    pubsub = PubSub(queue_size=2, overflow=PubSub.Overflow.BLOCK)
+    events = []
+    pubsub.subscribe(events.append, Ticked)
+    for i in range(3):
+        pubsub.publish(Ticked(i))
+    # the third publish delivered the backlog itself
+    assert events == [Ticked(0), Ticked(1)]
+    await pubsub.flush()
+    assert events == [Ticked(0), Ticked(1), Ticked(2)]
+    assert pubsub.lags[events.append].blocked == 1
+    pubsub.unsubscribe(events.append, Ticked)
+    assert pubsub.lags == {}
+
+
+def test_resubscribe():
+    pubsub = PubSub()
+    events = []
+    pubsub.subscribe(events.append, Ticked, queue_size=2)
+    pubsub.subscribe(events.append, Moved, queue_size=2)
+    with pytest.raises(ValueError):
+        pubsub.subscribe(events.append, Nudged, queue_size=4)
+    with pytest.raises(ValueError):
+        pubsub.subscribe(events.append, Nudged, overflow=PubSub.Overflow.BLOCK)
+    assert pubsub.subscribers[events.append].event_classes == {Moved, Ticked}
@@ -1,11 +1,15 @@
 import asyncio
 import dataclasses
+from typing import ClassVar
 
 
 @dataclasses.dataclass
 class Command:
     future: asyncio.Future = dataclasses.field(init=False, compare=False, hash=False)
 
+    # whether the command may share a lock with the commands queued around it
+    is_batchable: ClassVar[bool] = True
+
     def __post_init__(self):
         try:
             self.future = asyncio.get_running_loop().create_future()
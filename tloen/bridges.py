@@ -0,0 +1,482 @@
+import asyncio
+import dataclasses
+import enum
+import functools
+import itertools
+import logging
+import os
+import struct
+from typing import Any, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+from .bases import Command, Event
+from .pubsub import PubSub
+
+logger = logging.getLogger("tloen.bridges")
+
+
+class Encoder:
+    """
+    Encodes events, commands and their values into a compact binary form.
+
+    Each value is a one-byte tag followed by its payload. Classes are sent by
+    name the first time, and by index afterwards, so one encoder must serve
+    one stream, read by one decoder. Only registered classes are encoded.
+    """
+
+    def __init__(self):
+        self._class_indices: Dict[type, int] = {}
+
+    def _encode(self, value: Any, chunks: List[bytes]):
+        if value is None:
+            chunks.append(b"N")
+        elif value is True:
+            chunks.append(b"T")
+        elif value is False:
+            chunks.append(b"F")
+        elif isinstance(value, enum.Enum):
+            chunks.append(b"E")
+            self._encode_class(type(value), chunks)
+            self._encode(value.value, chunks)
+        elif isinstance(value, int):
+            chunks.append(b"i")
+            # zigzag, so small negative numbers stay small
+            _encode_varint(value * 2 if value >= 0 else -value * 2 - 1, chunks)
+        elif isinstance(value, float):
+            chunks.append(b"d" + struct.pack(">d", value))
+        elif isinstance(value, str):
+            encoded = value.encode()
+            chunks.append(b"s")
+            _encode_varint(len(encoded), chunks)
+            chunks.append(encoded)
+        elif isinstance(value, bytes):
+            chunks.append(b"b")
+            _encode_varint(len(value), chunks)
+            chunks.append(value)
+        elif isinstance(value, UUID):
+            chunks.append(b"U" + value.bytes)
+        elif dataclasses.is_dataclass(value) and not isinstance(value, type):
+            chunks.append(b"D")
+            self._encode_class(type(value), chunks)
+            fields = [field for field in dataclasses.fields(value) if field.init]
+            _encode_varint(len(fields), chunks)
+            for field in fields:
+                self._encode(getattr(value, field.name), chunks)
+        elif isinstance(value, tuple) and hasattr(type(value), "_fields"):
+            chunks.append(b"P")
+            self._encode_class(type(value), chunks)
+            self._encode_items(value, chunks)
+        elif isinstance(value, (list, tuple)):
+            chunks.append(b"l" if isinstance(value, list) else b"t")
+            self._encode_items(value, chunks)
+        elif isinstance(value, dict):
+            chunks.append(b"m")
+            _encode_varint(len(value), chunks)
+            for key, item in value.items():
+                self._encode(key, chunks)
+                self._encode(item, chunks)
+        else:
+            raise TypeError(value)
+
+    def _encode_class(self, class_: type, chunks: List[bytes]):
+        index = self._class_indices.get(class_)
+        if index is not None:
+            _encode_varint(index, chunks)
+            return
+        name = _get_class_name(class_)
+        if _get_registry().get(name) is not class_:
+            raise TypeError(class_)
+        index = self._class_indices[class_] = len(self._class_indices)
+        _encode_varint(index, chunks)
+        encoded_name = name.encode()
+        _encode_varint(len(encoded_name), chunks)
+        chunks.append(encoded_name)
+
+    def _encode_items(self, items, chunks: List[bytes]):
+        _encode_varint(len(items), chunks)
+        for item in items:
+            self._encode(item, chunks)
+
+    def encode(self, value: Any) -> bytes:
+        chunks: List[bytes] = []
+        class_count = len(self._class_indices)
+        try:
+            self._encode(value, chunks)
+        except TypeError:
+            # forget classes the decoder will never see
+            for class_ in list(self._class_indices)[class_count:]:
+                del self._class_indices[class_]
+            raise
+        return b"".join(chunks)
+
+
+class Decoder:
+    """
+    Decodes what an ``Encoder`` encoded.
+
+    Classes are looked up by name in a fixed registry, never imported, and
+    each tag only accepts its own kind of class: enums, dataclasses or named
+    tuples.
+    """
+
+    def __init__(self):
+        self._classes: List[type] = []
+
+    def _decode(self, data: memoryview, index: int):
+        tag, index = data[index : index + 1].tobytes(), index + 1
+        if tag == b"N":
+            return None, index
+        elif tag == b"T":
+            return True, index
+        elif tag == b"F":
+            return False, index
+        elif tag == b"i":
+            value, index = _decode_varint(data, index)
+            return (value >> 1) ^ -(value & 1), index
+        elif tag == b"d":
+            return struct.unpack(">d", data[index : index + 8])[0], index + 8
+        elif tag in (b"s", b"b"):
+            size, index = _decode_varint(data, index)
+            value = data[index : index + size].tobytes()
+            return (value.decode() if tag == b"s" else value), index + size
+        elif tag == b"U":
+            return UUID(bytes=data[index : index + 16].tobytes()), index + 16
+        elif tag == b"E":
+            class_, index = self._decode_class(data, index)
+            if not issubclass(class_, enum.Enum):
+                raise ValueError(class_)
+            value, index = self._decode(data, index)
+            return class_(value), index
+        elif tag == b"D":
+            class_, index = self._decode_class(data, index)
+            if not dataclasses.is_dataclass(class_):
+                raise ValueError(class_)
+            values, index = self._decode_items(data, index)
+            fields = [field for field in dataclasses.fields(class_) if field.init]
+            return (
+                class_(**{field.name: value for field, value in zip(fields, values)}),
+                index,
+            )
+        elif tag == b"P":
+            class_, index = self._decode_class(data, index)
+            if not (issubclass(class_, tuple) and hasattr(class_, "_fields")):
+                raise ValueError(class_)
+            values, index = self._decode_items(data, index)
+            return class_(*values), index
+        elif tag in (b"l", b"t"):
+            values, index = self._decode_items(data, index)
+            return (values if tag == b"l" else tuple(values)), index
+        elif tag == b"m":
+            size, index = _decode_varint(data, index)
+            value = {}
+            for _ in range(size):
+                key, index = self._decode(data, index)
+                value[key], index = self._decode(data, index)
+            return value, index
+        raise ValueError(tag)
+
+    def _decode_class(self, data: memoryview, index: int) -> Tuple[type, int]:
+        class_index, index = _decode_varint(data, index)
+        if class_index < len(self._classes):
+            return self._classes[class_index], index
+        if class_index != len(self._classes):
+            raise ValueError(class_index)
+        size, index = _decode_varint(data, index)
+        name, index = data[index : index + size].tobytes().decode(), index + size
+        class_ = _get_registry().get(name)
+        if class_ is None:
+            raise ValueError(name)
+        self._classes.append(class_)
+        return class_, index
+
+    def _decode_items(self, data: memoryview, index: int):
+        size, index = _decode_varint(data, index)
+        values = []
+        for _ in range(size):
+            value, index = self._decode(data, index)
+            values.append(value)
+        return values, index
+
+    def decode(self, data: bytes) -> Any:
+        value, index = self._decode(memoryview(data), 0)
+        if index != len(data):
+            raise ValueError(data)
+        return value
+
+
+class Connection:
+    """
+    Exchanges length-prefixed, encoded messages over a stream.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.decoder = Decoder()
+        self.encoder = Encoder()
+        self.reader = reader
+        self.writer = writer
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+    async def receive(self) -> Optional[Any]:
+        """
+        Receive the next message, or None once the stream ends.
+        """
+        try:
+            (size,) = struct.unpack(">I", await self.reader.readexactly(4))
+            return self.decoder.decode(await self.reader.readexactly(size))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return None
+
+    def send(self, message: Any):
+        data = self.encoder.encode(message)
+        self.writer.write(struct.pack(">I", len(data)) + data)
+
+    @property
+    def buffer_size(self) -> int:
+        """
+        The number of bytes sent but not yet written to the stream.
+        """
+        return self.writer.transport.get_write_buffer_size()
+
+
+class BridgeServer:
+    """
+    Serves a PubSub and a command queue to other processes over a Unix socket.
+
+    Every event published is sent to every client. Commands from clients go
+    onto the command queue, and their results go back once they complete.
+    Clients which fall more than ``max_buffer_size`` bytes behind are
+    disconnected, rather than buffered without bound or sent partial state.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        pubsub: PubSub,
+        command_queue: asyncio.Queue,
+        *,
+        max_buffer_size: int = 2 ** 20,
+    ):
+        self.command_queue = command_queue
+        self.max_buffer_size = max_buffer_size
+        self.path = path
+        self.pubsub = pubsub
+        self._connections: Set[Connection] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def _handle_connection(self, reader, writer):
+        connection = Connection(reader, writer)
+        self._connections.add(connection)
+        tasks: Set[asyncio.Task] = set()
+        try:
+            while True:
+                message = await connection.receive()
+                if message is None:
+                    break
+                kind, command_id, command = message
+                if kind != "command" or not isinstance(command, Command):
+                    raise ValueError(message)
+                task = asyncio.get_running_loop().create_task(
+                    self._handle_command(connection, command_id, command)
+                )
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except Exception:
+            logger.exception("Bridge connection failed")
+        finally:
+            self._connections.discard(connection)
+            for task in tasks:
+                task.cancel()
+            await connection.close()
+
+    async def _handle_command(self, connection, command_id, command):
+        await self.command_queue.put(command)
+        try:
+            message = ("result", command_id, await command.future)
+        except Exception as exception:
+            message = ("error", command_id, repr(exception))
+        if connection not in self._connections:
+            return
+        try:
+            connection.send(message)
+        except TypeError:
+            connection.send(("error", command_id, f"Unencodable {message[2]!r}"))
+
+    def _publish(self, event: Event):
+        for connection in tuple(self._connections):
+            if connection.buffer_size > self.max_buffer_size:
+                logger.warning("Disconnecting a lagging bridge client")
+                self._connections.discard(connection)
+                # a lagging client may never read its buffer, so don't flush it
+                connection.writer.transport.abort()
+                continue
+            try:
+                connection.send(("event", event))
+            except TypeError:
+                # not every event carries values a bridge can encode
+                logger.debug(f"Skipping unencodable {event!r}")
+                continue
+
+    async def start(self):
+        self.pubsub.subscribe(self._publish, Event)
+        self._server = await asyncio.start_unix_server(
+            self._handle_connection, path=self.path, start_serving=False
+        )
+        # only this user may connect, and nobody can before the chmod
+        os.chmod(self.path, 0o600)
+        await self._server.start_serving()
+
+    async def stop(self):
+        self.pubsub.unsubscribe(self._publish, Event)
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for connection in tuple(self._connections):
+            await connection.close()
+
+
+class BridgeClient:
+    """
+    Bridges a local PubSub and command queue to a ``BridgeServer``.
+
+    Events from the server are published locally. Commands put on the local
+    command queue run on the server, and their futures resolve with the
+    server's results, or fail with a ``RuntimeError`` if they failed there.
+    Commands which can't be sent fail with a ``TypeError``, and commands
+    pending when the connection ends fail with a ``ConnectionError``.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        pubsub: Optional[PubSub] = None,
+        command_queue: Optional[asyncio.Queue] = None,
+    ):
+        self.command_queue = command_queue or asyncio.Queue()
+        self.path = path
+        self.pubsub = pubsub or PubSub()
+        self._command_ids = itertools.count()
+        self._commands: Dict[int, Command] = {}
+        self._connection: Optional[Connection] = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def _receive(self):
+        try:
+            while True:
+                message = await self._connection.receive()
+                if message is None:
+                    break
+                if message[0] == "event":
+                    self.pubsub.publish(message[1])
+                elif message[0] in ("error", "result"):
+                    command = self._commands.pop(message[1], None)
+                    if command is None or command.future.done():
+                        continue
+                    if message[0] == "error":
+                        command.future.set_exception(RuntimeError(message[2]))
+                    else:
+                        command.future.set_result(message[2])
+        except (IndexError, ValueError):
+            logger.exception("Bridge connection failed")
+        # nothing will answer the commands still pending
+        for command in self._commands.values():
+            if not command.future.done():
+                command.future.set_exception(
+                    ConnectionError("Bridge connection closed")
+                )
+        self._commands.clear()
+
+    async def _send(self):
+        while True:
+            command = await self.command_queue.get()
+            command_id = next(self._command_ids)
+            try:
+                self._connection.send(("command", command_id, command))
+            except TypeError as exception:
+                if not command.future.done():
+                    command.future.set_exception(exception)
+                continue
+            self._commands[command_id] = command
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+        for command in self._commands.values():
+            if not command.future.done():
+                command.future.cancel()
+        self._commands.clear()
+
+    async def connect(self):
+        reader, writer = await asyncio.open_unix_connection(self.path)
+        self._connection = Connection(reader, writer)
+        loop = asyncio.get_running_loop()
+        self._tasks = [
+            loop.create_task(self._receive()),
+            loop.create_task(self._send()),
+        ]
+
+
+def _decode_varint(data: memoryview, index: int):
+    value, shift = 0, 0
+    while True:
+        byte = data[index]
+        index += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, index
+        shift += 7
+
+
+def _encode_varint(value: int, chunks: List[bytes]):
+    encoded = bytearray()
+    while value > 0x7F:
+        encoded.append((value & 0x7F) | 0x80)
+        value >>= 7
+    encoded.append(value)
+    chunks.append(bytes(encoded))
+
+
+def _get_class_name(class_: type) -> str:
+    return f"{class_.__module__}:{class_.__qualname__}"
+
+
+@functools.lru_cache(maxsize=None)
+def _get_registry() -> Dict[str, type]:
+    """
+    Get the classes a bridge may send, by name: every event and command
+    dataclass in ``tloen``, and the values they carry.
+    """
+    # imported here, so every event and command class exists before the walk
+    from supriya.clocks import Moment
+
+    from .commands import (  # noqa: F401
+        applications,
+        clips,
+        contexts,
+        parameters,
+        scenes,
+        slots,
+        tracks,
+        transports,
+    )
+    from .domain import Note
+    from .domain.transports import EventMetrics, Histogram, Transport
+
+    classes: List[type] = [EventMetrics, Histogram, Moment, Note, Transport.EventType]
+    stack: List[type] = [*Command.__subclasses__(), *Event.__subclasses__()]
+    while stack:
+        class_ = stack.pop()
+        stack.extend(class_.__subclasses__())
+        if dataclasses.is_dataclass(class_) and class_.__module__.startswith("tloen."):
+            classes.append(class_)
+    return {_get_class_name(class_): class_ for class_ in classes}
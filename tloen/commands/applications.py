@@ -17,17 +17,23 @@ class AddScene(Command):
 
 @dataclasses.dataclass
 class BootApplication(Command):
+    is_batchable = False
+
     async def do(self, harness):
         await harness.domain_application.boot()
 
 
 @dataclasses.dataclass
 class ExitToTerminal(Command):
+    is_batchable = False
+
     async def do(self, harness):
         await harness.exit()
 
 
 @dataclasses.dataclass
 class QuitApplication(Command):
+    is_batchable = False
+
     async def do(self, harness):
         await harness.domain_application.quit()
@@ -14,11 +14,9 @@ class ToggleClipNote(Command):
 
     async def do(self, harness):
         clip: Clip = harness.domain_application.registry[self.clip_uuid]
-        moment = clip._interval_tree.get_moment_at(self.offset)
-        for note in moment.start_intervals:
-            if note.pitch == self.pitch:
-                await clip.remove_notes([note])
-                break
+        note = clip.get_note_starting_at(self.pitch, self.offset)
+        if note is not None:
+            await clip.remove_notes([note])
         else:
             await clip.add_notes(
                 [
@@ -12,3 +12,12 @@ class DeleteScene(Command):
     async def do(self, harness):
         scene: Scene = harness.domain_application.registry[self.scene_uuid]
         await scene.delete()
+
+
+@dataclasses.dataclass
+class FireScene(Command):
+    scene_uuid: UUID
+
+    async def do(self, harness):
+        scene: Scene = harness.domain_application.registry[self.scene_uuid]
+        await scene.fire()
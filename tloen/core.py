@@ -1,9 +1,14 @@
 import asyncio
+import logging
 import signal
 from collections.abc import Mapping
 
 from . import domain, gridui, httpui, pubsub, textui
+from .bridges import BridgeServer
 from .domain.applications import ApplicationLoaded, ApplicationStatusRefreshed
+from .domain.transports import TransportMeasured, TransportTicked
+
+logger = logging.getLogger("tloen.core")
 
 
 class Registry(Mapping):
@@ -34,13 +39,17 @@ class Registry(Mapping):
 
 
 class Harness:
-    def __init__(self, loop=None):
+    def __init__(self, loop=None, overflow=pubsub.PubSub.Overflow.COALESCE):
         if loop is None:
             loop = asyncio.get_running_loop()
         self.exit_future = loop.create_future()
-        self.pubsub = pubsub.PubSub()
+        # UIs drain their events on their own tasks, away from the clock
+        self.pubsub = pubsub.PubSub(
+            queue_size=1024, overflow=overflow, key=_get_coalescing_key
+        )
         self.command_queue = asyncio.Queue()
         self.undo_stack = []
+        self.bridge_server = None
         self.domain_application = domain.Application()
         self.registry = Registry(self.domain_application)
         self.gridui_application = gridui.Application(
@@ -90,13 +99,19 @@ class Harness:
         await subtrack.add_track()
         return domain_application
 
-    async def run(self, gridui=True, textui=True):
+    async def run(self, gridui=True, textui=True, bridge_path=None):
         def handler(*args):
             return True
 
         self.domain_application = await self.build_application()
         self.domain_application.set_pubsub(self.pubsub)
         self.registry.set_application(self.domain_application)
+        if bridge_path is not None:
+            # let UIs in other processes follow along
+            self.bridge_server = BridgeServer(
+                bridge_path, self.pubsub, self.command_queue
+            )
+            await self.bridge_server.start()
         self.pubsub.publish(ApplicationLoaded())
         loop = asyncio.get_running_loop()
         loop.add_signal_handler(signal.SIGINT, handler)
@@ -106,12 +121,59 @@ class Harness:
         loop.create_task(self.textui_application.run_async())
         loop.create_task(self.periodic_update())
         while not self.exit_future.done():
-            command = await self.command_queue.get()
-            success = await command.do(self)
+            commands = [await self.command_queue.get()]
+            while not self.command_queue.empty():
+                commands.append(self.command_queue.get_nowait())
+            await self.do_commands(commands)
+
+    async def do_commands(self, commands):
+        """
+        Do ``commands`` in order.
+
+        Consecutive batchable commands share one lock, and so one bundle per
+        provider. Their futures resolve once the bundles are sent, or all fail
+        if locking or sending does.
+        """
+        batch = []
+        for command in commands:
+            if command.is_batchable:
+                batch.append(command)
+                continue
+            await self._do_batch(batch)
+            batch = []
+            self._resolve_commands([await self._do_command(command)])
+        await self._do_batch(batch)
+
+    async def _do_batch(self, commands):
+        if not commands:
+            return
+        results = []
+        try:
+            async with domain.Allocatable.lock(list(self.domain_application.contexts)):
+                for command in commands:
+                    results.append(await self._do_command(command))
+        except Exception as exception:
+            # commands already done may never have reached the server, so
+            # the whole batch fails, and nothing in it can be undone
+            logger.exception("Failed to lock or send batched commands")
+            results = [(command, None, exception) for command in commands]
+        self._resolve_commands(results)
+
+    async def _do_command(self, command):
+        try:
+            return command, await command.do(self), None
+        except Exception as exception:
+            return command, None, exception
+
+    def _resolve_commands(self, results):
+        for command, success, exception in results:
             if success and hasattr(command, "undo"):
                 self.undo_stack.append(command)
             try:
-                command.future.set_result(success)
+                if exception is not None:
+                    command.future.set_exception(exception)
+                else:
+                    command.future.set_result(success)
             except asyncio.InvalidStateError:
                 pass
 
@@ -123,7 +185,17 @@ class Harness:
             await asyncio.sleep(self.update_period)
 
     async def exit(self):
+        if self.bridge_server is not None:
+            await self.bridge_server.stop()
         await self.domain_application.quit()
         self.gridui_application.exit()
         self.textui_application.exit()
         self.exit_future.set_result(True)
+
+
+def _get_coalescing_key(event):
+    # a lagging UI only needs the latest tick and measurement, but every
+    # state change
+    if isinstance(event, (TransportMeasured, TransportTicked)):
+        return type(event)
+    return None
@@ -7,7 +7,16 @@ from .bases import (
     Container,
 )
 from .chains import Chain, ChainContainer, RackDevice, Transfer
-from .clips import Clip, Envelope, Note, NoteMoment, Scene, Slot, Timeline
+from .clips import (
+    Clip,
+    ClipInstance,
+    Envelope,
+    Note,
+    NoteMoment,
+    Scene,
+    Slot,
+    Timeline,
+)
 from .contexts import Context
 from .controllers import Controller
 from .devices import DeviceIn, DeviceObject, DeviceOut
@@ -50,6 +59,7 @@ __all__ = [
     "ChainContainer",
     "Chord",
     "Clip",
+    "ClipInstance",
     "Container",
     "Context",
     "Controller",
@@ -3,8 +3,19 @@ import dataclasses
 import enum
 import pathlib
 from collections import deque
+from contextlib import asynccontextmanager
 from types import MappingProxyType
-from typing import Deque, Dict, Mapping, Optional, Tuple, Union
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 from uuid import UUID
 
 import yaml
@@ -17,12 +28,14 @@ import tloen.domain  # noqa
 
 from ..bases import Event
 from ..pubsub import PubSub
-from .bases import Container
+from .bases import Allocatable, Container
 from .clips import Scene
 from .contexts import Context
 from .controllers import Controller
 from .transports import Transport
 
+T = TypeVar("T")
+
 
 class Application(UniqueTreeTuple):
 
@@ -41,6 +54,14 @@ class Application(UniqueTreeTuple):
         self._pubsub = pubsub or PubSub()
         self._status = self.Status.OFFLINE
         self._registry: Dict[UUID, "tloen.domain.ApplicationObject"] = {}
+        self._registry_by_class: Dict[
+            type, Dict[UUID, "tloen.domain.ApplicationObject"]
+        ] = {}
+        self._registry_by_parent: Dict[
+            Optional[UUID], Dict[UUID, "tloen.domain.ApplicationObject"]
+        ] = {}
+        self._registry_parents: Dict[UUID, Optional[UUID]] = {}
+        self._batch: Optional[Dict[Allocatable, Dict[str, Any]]] = None
         # tree objects
         self._contexts = Container(label="Contexts")
         self._controllers = Container(label="Controllers")
@@ -63,6 +84,73 @@ class Application(UniqueTreeTuple):
 
     ### PRIVATE METHODS ###
 
+    def _commit_batch(self):
+        batch, self._batch = self._batch, None
+        nodes = sorted(
+            (node for node in batch if node.application is self),
+            key=lambda node: node.graph_order,
+        )
+        for node in nodes:
+            target_node, add_action = None, None
+            if node.provider is not None:
+                target_node, add_action = node._get_allocation_target()
+            node._reconcile(
+                target_node=target_node, add_action=add_action, **batch[node]
+            )
+
+    def _find_descendants(self, ancestor):
+        # walk the parent index, so only the subtree's objects are visited
+        if self._registry.get(getattr(ancestor, "uuid", None)) is ancestor:
+            stack = list(self._registry_by_parent.get(ancestor.uuid, {}).values())
+        else:
+            stack, nodes = [], list(ancestor)
+            while nodes:
+                node = nodes.pop()
+                if self._registry.get(getattr(node, "uuid", None)) is node:
+                    stack.append(node)
+                else:
+                    nodes.extend(node)
+        objects = []
+        while stack:
+            object_ = stack.pop()
+            objects.append(object_)
+            stack.extend(self._registry_by_parent.get(object_.uuid, {}).values())
+        return objects
+
+    def _index_parent(self, object_):
+        parent = object_._get_registry_parent()
+        parent_uuid = parent.uuid if parent is not None else None
+        self._registry_parents[object_.uuid] = parent_uuid
+        self._registry_by_parent.setdefault(parent_uuid, {})[object_.uuid] = object_
+
+    def _register(self, object_):
+        self._registry[object_.uuid] = object_
+        for class_ in type(object_).__mro__[:-1]:
+            self._registry_by_class.setdefault(class_, {})[object_.uuid] = object_
+        self._index_parent(object_)
+
+    def _reindex(self, object_):
+        if self._registry.get(object_.uuid) is not object_:
+            return
+        self._unindex_parent(object_)
+        self._index_parent(object_)
+
+    def _unindex_parent(self, object_):
+        parent_uuid = self._registry_parents.pop(object_.uuid)
+        siblings = self._registry_by_parent[parent_uuid]
+        siblings.pop(object_.uuid)
+        if not siblings:
+            self._registry_by_parent.pop(parent_uuid)
+
+    def _unregister(self, object_):
+        self._registry.pop(object_.uuid)
+        for class_ in type(object_).__mro__[:-1]:
+            objects = self._registry_by_class[class_]
+            objects.pop(object_.uuid)
+            if not objects:
+                self._registry_by_class.pop(class_)
+        self._unindex_parent(object_)
+
     def _set_items(self, new_items, old_items, start_index, stop_index):
         UniqueTreeTuple._set_items(self, new_items, old_items, start_index, stop_index)
         for item in new_items:
@@ -92,17 +180,33 @@ class Application(UniqueTreeTuple):
 
         scene = Scene(name=name)
         self._scenes._append(scene)
-        tracks: Deque[Track] = deque()
-        for context in self.contexts:
-            tracks.extend(context.tracks)
-        while tracks:
-            track = tracks.pop()
-            if track.tracks:
-                tracks.extend(track.tracks)
+        for track in self.find(Track):
             while len(track.slots) < len(self.scenes):
                 track.slots._append(Slot())
         return scene
 
+    @asynccontextmanager
+    async def batch(self):
+        """
+        Defer reconciliation of tree mutations until the batch exits.
+
+        Allocatable nodes set while the batch is open are reconciled once on
+        exit, in graph order, inside a single provider moment per context. Any
+        node under an allocatable parent is deferred, allocated or not.
+
+        Deferred nodes are only registered on exit, so ``find()`` and
+        ``registry`` do not see them, or their descendants, inside the batch.
+        """
+        if self._batch is not None:
+            yield self
+            return
+        self._batch = {}
+        async with Allocatable.lock(self.contexts):
+            try:
+                yield self
+            finally:
+                self._commit_batch()
+
     async def boot(self, provider=None, retries=3):
         if self.status == self.Status.REALTIME:
             return
@@ -126,18 +230,52 @@ class Application(UniqueTreeTuple):
         self._status = self.Status.REALTIME
         return self
 
+    def find(
+        self,
+        prototype: Optional[Type[T]] = None,
+        *,
+        ancestor: Optional["tloen.domain.ApplicationObject"] = None,
+        parent: Optional["tloen.domain.ApplicationObject"] = None,
+    ) -> Tuple[T, ...]:
+        """
+        Find registered objects, in graph order.
+
+        ``parent`` restricts the search to objects whose nearest registered
+        ancestor is ``parent``, ``ancestor`` to objects anywhere below it.
+        """
+        objects: Iterable[Any]
+        if parent is not None:
+            parent_uuid = getattr(parent, "uuid", None)
+            objects = (
+                self._registry_by_parent.get(parent_uuid, {}).values()
+                if parent_uuid is not None
+                else ()
+            )
+            if prototype is not None:
+                objects = [x for x in objects if isinstance(x, prototype)]
+        elif prototype is not None:
+            objects = self._registry_by_class.get(prototype, {}).values()
+        elif ancestor is not None:
+            objects = self._find_descendants(ancestor)
+        else:
+            objects = self._registry.values()
+        if ancestor is not None and (parent is not None or prototype is not None):
+            objects = [x for x in objects if ancestor in x.parentage[1:]]
+        return tuple(sorted(objects, key=lambda x: x.graph_order))
+
     async def flush(self):
         pass
 
     @classmethod
     async def new(cls, context_count=1, track_count=4, scene_count=8, **kwargs):
         application = cls(**kwargs)
-        for _ in range(context_count):
-            context = await application.add_context()
-            for _ in range(track_count):
-                await context.add_track()
-        for _ in range(scene_count):
-            await application.add_scene()
+        async with application.batch():
+            for _ in range(context_count):
+                context = await application.add_context()
+                for _ in range(track_count):
+                    await context.add_track()
+            for _ in range(scene_count):
+                await application.add_scene()
         return application
 
     async def perform(self, midi_messages, moment=None):
@@ -191,17 +329,13 @@ class Application(UniqueTreeTuple):
         indices = sorted(self.scenes.index(scene) for scene in scenes)
         for scene in scenes:
             self.scenes._remove(scene)
-        tracks: Deque[Track] = deque()
-        for context in self.contexts:
-            tracks.extend(context.tracks)
-        while tracks:
-            track = tracks.pop()
-            if track.tracks:
-                tracks.extend(track.tracks)
+        for track in self.find(Track):
             for index in reversed(indices):
                 track.slots._remove(track.slots[index])
 
     async def render(self) -> Session:
+        from .tracks import Track
+
         if self.status != self.Status.OFFLINE:
             raise ValueError
         self._status == self.Status.NONREALTIME
@@ -210,7 +344,11 @@ class Application(UniqueTreeTuple):
             for context in self.contexts:
                 context._set(provider=provider)
         # Magic happens here
-        with provider.at(provider.session.duration or 10):
+        stop_offset = max(
+            (track.timeline.stop_offset for track in self.find(Track)), default=0.0
+        )
+        stop_time = self.transport.tempo_map.offset_to_seconds(stop_offset)
+        with provider.at(stop_time or provider.session.duration or 10):
             for context in self.contexts:
                 context._set(provider=None)
         self._status = self.Status.OFFLINE
@@ -282,6 +420,7 @@ class Application(UniqueTreeTuple):
         assert 1 <= channel_count <= 8
         self._channel_count = int(channel_count)
         for context in self.contexts:
+            context._invalidate_caches()
             if context.provider:
                 async with context.provider.at():
                     context._reconcile()
@@ -337,30 +476,37 @@ class Application(UniqueTreeTuple):
 
 
 @dataclasses.dataclass
-class ApplicationBooting(Event):
+class ApplicationEvent(Event):
+    """
+    Base class of application lifecycle events.
+    """
+
+
+@dataclasses.dataclass
+class ApplicationBooting(ApplicationEvent):
     ...
 
 
 @dataclasses.dataclass
-class ApplicationBooted(Event):
+class ApplicationBooted(ApplicationEvent):
     port: int
 
 
 @dataclasses.dataclass
-class ApplicationLoaded(Event):
+class ApplicationLoaded(ApplicationEvent):
     ...
 
 
 @dataclasses.dataclass
-class ApplicationQuitting(Event):
+class ApplicationQuitting(ApplicationEvent):
     ...
 
 
 @dataclasses.dataclass
-class ApplicationQuit(Event):
+class ApplicationQuit(ApplicationEvent):
     ...
 
 
 @dataclasses.dataclass
-class ApplicationStatusRefreshed(Event):
+class ApplicationStatusRefreshed(ApplicationEvent):
     status: StatusResponse
@@ -1,4 +1,7 @@
+import contextvars
 import logging
+import math
+from array import array
 from collections import deque
 from contextlib import AsyncExitStack, asynccontextmanager
 from types import MappingProxyType
@@ -31,17 +34,38 @@ from supriya.typing import Missing
 from uqbar.containers import UniqueTreeTuple
 
 import tloen.domain  # noqa
-from tloen.midi import MidiMessage, NoteOffMessage, NoteOnMessage
+from tloen.midi import (
+    ControllerChangeMessage,
+    MidiMessage,
+    NoteOffMessage,
+    NoteOnMessage,
+)
 
 logger = logging.getLogger("tloen.domain")
 
+_is_locking: contextvars.ContextVar = contextvars.ContextVar(
+    "_is_locking", default=False
+)
+
 
 class ApplicationObject(UniqueTreeTuple):
 
+    ### CLASS VARIABLES ###
+
+    # State keys whose change invalidates the cached state of every descendant
+    _propagated_state_keys = frozenset(["channel_count", "index", "parent"])
+
+    # Per-node caches, reset by _invalidate_caches() whenever a subtree moves
+    _cached_ancestors: Optional[Dict[Any, Any]] = None
+    _cached_effective_channel_count: Optional[int] = None
+    _cached_next_performer: Optional[tuple] = None
+    _cached_parentage: Optional[tuple] = None
+
     ### INITIALIZER ###
 
     def __init__(self, *, name=None):
         self._application: Optional["tloen.domain.Application"] = None
+        self._index_hint = 0
         UniqueTreeTuple.__init__(self, name=name)
         self._cached_state = self._get_state()
 
@@ -72,7 +96,7 @@ class ApplicationObject(UniqueTreeTuple):
             return
         if self.uuid in new_application._registry:
             raise RuntimeError
-        new_application._registry[self.uuid] = self
+        new_application._register(self)
 
     def _cleanup(self):
         pass
@@ -81,7 +105,7 @@ class ApplicationObject(UniqueTreeTuple):
         self._debug_tree(self, "Deapplicating", suffix=repr(None))
         if not hasattr(self, "uuid"):
             return
-        old_application._registry.pop(self.uuid)
+        old_application._unregister(self)
 
     @classmethod
     def _debug_tree(cls, node, prefix, suffix=None):
@@ -108,11 +132,39 @@ class ApplicationObject(UniqueTreeTuple):
                 self._parameter_group._append(new_parameter)
                 self._parameters[new_parameter.name] = new_parameter
 
+    def _get_ancestor(self, prototype, include_self=False):
+        key = (prototype, include_self)
+        if self._cached_ancestors is None:
+            self._cached_ancestors = {}
+        elif key in self._cached_ancestors:
+            return self._cached_ancestors[key]
+        ancestor = None
+        for parent in self.parentage[0 if include_self else 1 :]:
+            if isinstance(parent, prototype):
+                ancestor = parent
+                break
+        self._cached_ancestors[key] = ancestor
+        return ancestor
+
+    def _get_index(self) -> Optional[int]:
+        parent = self.parent
+        if parent is None:
+            return None
+        children, index = parent._children, self._index_hint
+        if index >= len(children) or children[index] is not self:
+            index = self._index_hint = parent.index(self)
+        return index
+
+    def _get_registry_parent(self) -> Optional["ApplicationObject"]:
+        for parent in self.parentage[1:]:
+            if hasattr(parent, "uuid"):
+                return parent
+        return None
+
     def _get_state(self):
-        index = None
-        if self.parent:
-            index = self.parent.index(self)
-        return dict(application=self.application, parent=self.parent, index=index)
+        return dict(
+            application=self.application, parent=self.parent, index=self._get_index()
+        )
 
     def _get_state_difference(self, **kwargs):
         # self._debug_tree(self, "Reconciling")
@@ -125,6 +177,16 @@ class ApplicationObject(UniqueTreeTuple):
             difference[key] = old_state[key], new_state[key]
         return difference
 
+    def _invalidate_caches(self):
+        nodes = [self]
+        while nodes:
+            node = nodes.pop()
+            node._cached_ancestors = None
+            node._cached_effective_channel_count = None
+            node._cached_next_performer = None
+            node._cached_parentage = None
+            nodes.extend(node)
+
     def _reconcile(self, **kwargs):
         difference = self._get_state_difference()
         if "application" in difference:
@@ -186,6 +248,25 @@ class ApplicationObject(UniqueTreeTuple):
         for item in old_items:
             item._set(application=None)
 
+    def _set_parent(self, new_parent):
+        old_parent = self.parent
+        UniqueTreeTuple._set_parent(self, new_parent)
+        self._invalidate_caches()
+        # Routing depends on siblings, so re-route both old and new siblings
+        for parent in (old_parent, new_parent):
+            for sibling in parent or ():
+                sibling._cached_next_performer = None
+        application = self.application
+        if application is None or new_parent is None:
+            return
+        nodes = [self]
+        while nodes:
+            node = nodes.pop()
+            if hasattr(node, "uuid"):
+                application._reindex(node)
+            else:
+                nodes.extend(node)
+
     ### PUBLIC METHODS ###
 
     @classmethod
@@ -210,15 +291,30 @@ class ApplicationObject(UniqueTreeTuple):
     def context(self) -> Optional["tloen.domain.Context"]:
         from .contexts import Context
 
-        for parent in self.parentage:
-            if isinstance(parent, Context):
-                return parent
-        return None
+        return self._get_ancestor(Context, include_self=True)
+
+    @property
+    def graph_order(self):
+        graph_order = []
+        node = self
+        while node.parent is not None:
+            graph_order.append(node._get_index())
+            node = node.parent
+        return tuple(reversed(graph_order))
 
     @property
     def label(self):
         return self.name or type(self).__name__
 
+    @property
+    def parentage(self):
+        if self._cached_parentage is None:
+            parent = self.parent
+            self._cached_parentage = (self,) + (
+                parent.parentage if parent is not None else ()
+            )
+        return self._cached_parentage
+
     @property
     def provider(self):
         return None
@@ -297,6 +393,13 @@ class Allocatable(ApplicationObject):
         self._debug_tree(self, "Deactivating")
         self._is_active = False
 
+    def _get_allocation_target(self):
+        parent, index = self.parent, self._get_index()
+        for sibling in reversed(parent[:index]):
+            if isinstance(sibling, Allocatable) and sibling.node_proxy is not None:
+                return sibling.node_proxy, AddAction.ADD_AFTER
+        return parent.node_proxy, AddAction.ADD_TO_HEAD
+
     def _get_state(self):
         state = ApplicationObject._get_state(self)
         state.update(channel_count=self.effective_channel_count, provider=self.provider)
@@ -316,6 +419,7 @@ class Allocatable(ApplicationObject):
         target_node: Optional[NodeProxy] = None,
         add_action: Optional[int] = None,
         dispose_only: bool = False,
+        propagate: bool = False,
         **kwargs,
     ):
         difference = self._get_state_difference()
@@ -344,9 +448,15 @@ class Allocatable(ApplicationObject):
                 self._move(target_node, add_action)
             if "channel_count" in difference:
                 self._reallocate(difference)
-            for child in self:
-                child._reconcile()
-            self._reconcile_dependents()
+            if propagate or not self._propagated_state_keys.isdisjoint(difference):
+                target_node, add_action = self.node_proxy, AddAction.ADD_TO_HEAD
+                for child in self:
+                    child._reconcile(
+                        target_node=target_node, add_action=add_action, propagate=True
+                    )
+                    if isinstance(child, Allocatable) and child.node_proxy is not None:
+                        target_node, add_action = child.node_proxy, AddAction.ADD_AFTER
+                self._reconcile_dependents()
         if "application" in difference:
             old_application, new_application = difference.pop("application")
             if old_application:
@@ -376,6 +486,15 @@ class Allocatable(ApplicationObject):
             self._provider = provider
         if not isinstance(channel_count, Missing):
             self._channel_count = channel_count
+            self._invalidate_caches()
+        application = self.application
+        if (
+            application is not None
+            and application._batch is not None
+            and isinstance(self.parent, Allocatable)
+        ):
+            application._batch.setdefault(self, {}).update(kwargs)
+            return
         self._reconcile(target_node=target_node, add_action=add_action, **kwargs)
 
     def _collect_for_cleanup(self, new_items, old_items):
@@ -412,6 +531,15 @@ class Allocatable(ApplicationObject):
     @classmethod
     @asynccontextmanager
     async def lock(cls, objects, seconds=None):
+        transport, timestamp = None, None
+        if seconds is not None:
+            for object_ in objects:
+                transport = getattr(object_, "transport", None)
+                if transport is not None:
+                    timestamp = transport._compensate_latency(seconds)
+                    break
+        if timestamp is not None:
+            seconds = timestamp
         exit_stack = AsyncExitStack()
         async with exit_stack:
             providers = set()
@@ -420,7 +548,15 @@ class Allocatable(ApplicationObject):
                 if provider is not None and provider not in providers:
                     await exit_stack.enter_async_context(provider.at(seconds))
                     providers.add(provider)
-            yield
+            # nested locks join their outermost lock's bundles
+            is_outermost = not _is_locking.get()
+            token = _is_locking.set(True)
+            try:
+                yield
+            finally:
+                _is_locking.reset(token)
+            if timestamp is not None and providers and is_outermost:
+                transport._record_bundles(timestamp, len(providers))
 
     async def query(self):
         if self.provider.server is None:
@@ -473,11 +609,14 @@ class Allocatable(ApplicationObject):
 
     @property
     def effective_channel_count(self) -> int:
-        for object_ in self.parentage:
-            channel_count = getattr(object_, "channel_count", None)
-            if channel_count:
-                return channel_count
-        return 2
+        if self._cached_effective_channel_count is None:
+            channel_count = None
+            for object_ in self.parentage:
+                channel_count = getattr(object_, "channel_count", None)
+                if channel_count:
+                    break
+            self._cached_effective_channel_count = channel_count or 2
+        return self._cached_effective_channel_count
 
     @property
     def is_active(self) -> bool:
@@ -619,28 +758,148 @@ class Performable(ApplicationObject):
         def __len__(self):
             return len(self.entries)
 
+        def _append(self, moment, label, message):
+            self.entries.append(
+                Performable.CaptureEntry(moment=moment, label=label, message=message)
+            )
+
+    class RingCaptureEntry(NamedTuple):
+        offset: float
+        label: str
+        message_type: Optional[type]
+        pitch: float
+        velocity: float
+
+    class RingCapture:
+        """
+        Fixed-size capture, keeping only the most recent ``size`` entries.
+
+        Entries are stored column-wise in compact arrays. Missing values (e.g.
+        the offset of an unscheduled message) are stored as NaN. Message types
+        without a code of their own are stored as ``MidiMessage``.
+        """
+
+        labels = ("I", "O")
+        message_types = (
+            None,
+            NoteOnMessage,
+            NoteOffMessage,
+            ControllerChangeMessage,
+            MidiMessage,
+        )
+
+        def __init__(self, performable: "Performable", size: int):
+            if size < 1:
+                raise ValueError(size)
+            self.performable = performable
+            self.size = size
+            self.offsets = array("d", [math.nan]) * size
+            self.label_codes = array("b", [0]) * size
+            self.message_type_codes = array("b", [0]) * size
+            self.pitches = array("f", [math.nan]) * size
+            self.velocities = array("f", [math.nan]) * size
+            self.total = 0
+
+        def __enter__(self):
+            self.performable._captures.add(self)
+            self.total = 0
+            return self
+
+        def __exit__(self, exc_type, exc_value, traceback):
+            self.performable._captures.remove(self)
+
+        def __getitem__(self, i):
+            length = len(self)
+            if i < 0:
+                i += length
+            if not 0 <= i < length:
+                raise IndexError(i)
+            j = (self.total - length + i) % self.size
+            return Performable.RingCaptureEntry(
+                offset=self.offsets[j],
+                label=self.labels[self.label_codes[j]],
+                message_type=self.message_types[self.message_type_codes[j]],
+                pitch=self.pitches[j],
+                velocity=self.velocities[j],
+            )
+
+        def __iter__(self):
+            for i in range(len(self)):
+                yield self[i]
+
+        def __len__(self):
+            return min(self.total, self.size)
+
+        def _append(self, moment, label, message):
+            i = self.total % self.size
+            self.offsets[i] = moment.offset if moment is not None else math.nan
+            self.label_codes[i] = self.labels.index(label)
+            try:
+                self.message_type_codes[i] = self.message_types.index(type(message))
+            except ValueError:
+                self.message_type_codes[i] = len(self.message_types) - 1
+            pitch = getattr(message, "pitch", None)
+            velocity = getattr(message, "velocity", None)
+            self.pitches[i] = pitch if pitch is not None else math.nan
+            self.velocities[i] = velocity if velocity is not None else math.nan
+            self.total += 1
+
+        def to_numpy(self):
+            """
+            Export entries, oldest first, as a mapping of NumPy arrays.
+            """
+            import numpy
+
+            length = len(self)
+            start = (self.total - length) % self.size
+            indices = (numpy.arange(length) + start) % self.size
+            return {
+                "offset": numpy.frombuffer(self.offsets, dtype=numpy.float64)[indices],
+                "label": numpy.frombuffer(self.label_codes, dtype=numpy.int8)[indices],
+                "message_type": numpy.frombuffer(
+                    self.message_type_codes, dtype=numpy.int8
+                )[indices],
+                "pitch": numpy.frombuffer(self.pitches, dtype=numpy.float32)[indices],
+                "velocity": numpy.frombuffer(self.velocities, dtype=numpy.float32)[
+                    indices
+                ],
+            }
+
+        @property
+        def dropped(self) -> int:
+            return self.total - len(self)
+
     ### INITIALIZER ###
 
     def __init__(self):
         self._input_pitches: Dict[float, List[float]] = {}
         self._output_pitches: Set[float] = set()
-        self._captures: Set["Performable.Capture"] = set()
+        self._captures: Set[
+            Union["Performable.Capture", "Performable.RingCapture"]
+        ] = set()
 
     ### PRIVATE METHODS ###
 
-    def _next_performer(self) -> Optional[Callable]:
-        if self.parent is None:
+    def _compile_next_performer(self) -> Optional[Callable]:
+        parent = self.parent
+        if parent is None:
             return None
-        index = self.parent.index(self)
-        if index < len(self.parent) - 1:
-            return self.parent[index + 1]._perform_input
+        index = self._get_index()
+        if index is not None and index < len(parent) - 1:
+            return parent[index + 1]._perform_input
+        return self._compile_parent_performer()
+
+    def _compile_parent_performer(self) -> Optional[Callable]:
         for parent in self.parentage[1:]:
-            if parent is None:
-                return None
-            elif hasattr(parent, "_perform_output"):
+            if hasattr(parent, "_perform_output"):
                 return parent._perform_output
         return None
 
+    def _next_performer(self) -> Optional[Callable]:
+        if self._cached_next_performer is None:
+            self._cached_next_performer = (self._compile_next_performer(),)
+        return self._cached_next_performer[0]
+
     def _perform_input(self, moment, midi_messages):
         for message in midi_messages:
             self._update_captures(moment, message, "I")
@@ -654,7 +913,7 @@ class Performable(ApplicationObject):
         return self._perform_output, midi_messages
 
     def _perform_output(self, moment, midi_messages):
-        next_performer = self._next_performer()
+        out_messages = []
         for message in midi_messages:
             self._update_captures(moment, message, "O")
             if isinstance(message, NoteOnMessage):
@@ -667,7 +926,8 @@ class Performable(ApplicationObject):
                     continue
                 else:
                     self._output_pitches.remove(message.pitch)
-            yield next_performer, [message]
+            out_messages.append(message)
+        yield self._next_performer(), out_messages
 
     @classmethod
     def _perform_loop(cls, moment, performer, midi_messages):
@@ -684,13 +944,14 @@ class Performable(ApplicationObject):
     def _update_captures(self, moment, message, label):
         if not self._captures:
             return
-        entry = self.CaptureEntry(moment=moment, message=message, label=label)
         for capture in self._captures:
-            capture.entries.append(entry)
+            capture._append(moment, label, message)
 
     ### PUBLIC METHODS ###
 
-    def capture(self):
+    def capture(self, size: Optional[int] = None):
+        if size is not None:
+            return self.RingCapture(self, size)
         return self.Capture(self)
 
     async def flush(self, moment=None):
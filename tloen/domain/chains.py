@@ -72,6 +72,10 @@ class Chain(UserTrackObject):
     def _cleanup(self):
         Chain._update_activation(self)
 
+    def _compile_next_performer(self):
+        # Chains run in parallel, so their output goes to the rack's output
+        return self._compile_parent_performer()
+
     @classmethod
     async def _deserialize(cls, data, application) -> bool:
         parent_uuid = UUID(data["meta"]["parent"])
@@ -100,11 +104,12 @@ class Chain(UserTrackObject):
         )
         if self.devices:
             next_performer = self.devices[0]._perform_input
+        out_messages = []
         for message in midi_messages:
             out_message = self.transfer(message)
-            if out_message is None:
-                continue
-            yield next_performer, [out_message]
+            if out_message is not None:
+                out_messages.append(out_message)
+        yield next_performer, out_messages
 
     def _serialize(self):
         serialized, auxiliary_entities = super()._serialize()
@@ -221,10 +226,7 @@ class ChainContainer(AllocatableContainer):
 
     @property
     def mixer(self) -> Optional["RackDevice"]:
-        for parent in self.parentage:
-            if isinstance(parent, RackDevice):
-                return parent
-        return None
+        return self._get_ancestor(RackDevice, include_self=True)
 
 
 class RackDevice(DeviceObject, Mixer):
@@ -312,6 +314,8 @@ class RackDevice(DeviceObject, Mixer):
         performers = [next_performer]
         if self.chains:
             performers = [chain._perform_input for chain in self.chains]
+        # Fan out one message at a time, so the rack's output sees the chains'
+        # copies of each message together and deduplicates them in order
         for message in midi_messages:
             for performer in performers:
                 yield performer, [message]
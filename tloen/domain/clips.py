@@ -1,9 +1,14 @@
+import abc
+import asyncio
+import bisect
+import collections.abc
 import dataclasses
+import logging
 from collections import deque
-from typing import Optional, Tuple
+from typing import Deque, Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
 from uuid import UUID, uuid4
 
-from supriya.clocks import TimeUnit
+import numpy
 from supriya.intervals import IntervalTree
 
 from tloen.midi import NoteOffMessage, NoteOnMessage
@@ -11,6 +16,8 @@ from tloen.midi import NoteOffMessage, NoteOnMessage
 from ..bases import Event
 from .bases import ApplicationObject
 
+logger = logging.getLogger("tloen.domain")
+
 
 @dataclasses.dataclass(frozen=True, order=True)
 class Note:
@@ -32,7 +39,7 @@ class Note:
         )
 
     def transpose(self, transposition):
-        return dataclasses.replace(self, self.pitch + transposition)
+        return dataclasses.replace(self, pitch=self.pitch + transposition)
 
     def translate(self, start_translation=None, stop_translation=None):
         start_offset = self.start_offset + (start_translation or 0)
@@ -50,9 +57,17 @@ class NoteMoment:
     start_notes: Optional[Tuple[Note]] = None
     stop_notes: Optional[Tuple[Note]] = None
     overlap_notes: Optional[Tuple[Note]] = None
+    _note_on_messages: Optional[Tuple[NoteOnMessage]] = dataclasses.field(
+        default=None, compare=False, repr=False
+    )
+    _note_off_messages: Optional[Tuple[NoteOffMessage]] = dataclasses.field(
+        default=None, compare=False, repr=False
+    )
 
     @property
     def note_on_messages(self):
+        if self._note_on_messages is not None:
+            return list(self._note_on_messages)
         return [
             NoteOnMessage(pitch=note.pitch, velocity=note.velocity)
             for note in self.start_notes or ()
@@ -60,69 +75,274 @@ class NoteMoment:
 
     @property
     def note_off_messages(self):
+        if self._note_off_messages is not None:
+            return list(self._note_off_messages)
         return [
             NoteOffMessage(pitch=note.pitch, velocity=note.velocity)
             for note in self.stop_notes or ()
         ]
 
 
-class Envelope:
+@dataclasses.dataclass(frozen=True)
+class NoteTimeline:
     """
-    An automation envelope, in a Clip or Timeline.
+    A compiled, bisectable view of a clip's notes.
+
+    Holds the sorted boundary offsets at which notes start or stop, the notes
+    starting, stopping and sounding through each boundary, the notes sounding
+    in the segment after each boundary, and each boundary's MIDI messages.
     """
 
-    pass
+    offsets: Tuple[float, ...] = ()
+    start_notes: Sequence[Tuple[Note, ...]] = ()
+    stop_notes: Sequence[Tuple[Note, ...]] = ()
+    overlap_notes: Sequence[Tuple[Note, ...]] = ()
+    segment_notes: Sequence[Tuple[Note, ...]] = ()
+    note_on_messages: Sequence[Tuple[NoteOnMessage, ...]] = ()
+    note_off_messages: Sequence[Tuple[NoteOffMessage, ...]] = ()
 
+    ### PUBLIC METHODS ###
 
-class ClipObject(ApplicationObject):
+    @classmethod
+    def from_array(cls, array):
+        """
+        Compile a timeline from a sorted structured note array.
+
+        Boundaries are located with vectorized searches, and each boundary's
+        notes and messages are materialized only when it is accessed.
+        """
+        start_offsets, stop_offsets = array["start_offset"], array["stop_offset"]
+        # stable, so notes stopping together stay in note order
+        stop_order = numpy.argsort(stop_offsets, kind="stable")
+        sorted_stop_offsets = stop_offsets[stop_order]
+        offsets = numpy.union1d(start_offsets, stop_offsets)
+        start_indices = numpy.searchsorted(start_offsets, offsets)
+        start_stop_indices = numpy.searchsorted(start_offsets, offsets, side="right")
+        stop_indices = numpy.searchsorted(sorted_stop_offsets, offsets)
+        stop_stop_indices = numpy.searchsorted(
+            sorted_stop_offsets, offsets, side="right"
+        )
+        # notes starting a whole longest duration earlier have stopped already
+        max_duration = (stop_offsets - start_offsets).max() if len(array) else 0.0
+        window_indices = numpy.searchsorted(start_offsets, offsets - max_duration)
 
-    ### INITIALIZER ###
+        def get_active_notes(index, stop_index):
+            rows = array[window_indices[index] : stop_index]
+            return tuple(NoteArray(rows[rows["stop_offset"] > offsets[index]]))
 
-    def __init__(self, *, name=None, uuid=None):
-        ApplicationObject.__init__(self, name=name)
-        self._uuid = uuid or uuid4()
+        def get_start_notes(index):
+            return tuple(
+                NoteArray(array[start_indices[index] : start_stop_indices[index]])
+            )
+
+        def get_stop_notes(index):
+            return tuple(
+                NoteArray(
+                    array[stop_order[stop_indices[index] : stop_stop_indices[index]]]
+                )
+            )
+
+        start_notes = LazySequence(len(offsets), get_start_notes)
+        stop_notes = LazySequence(len(offsets), get_stop_notes)
+        return cls(
+            offsets=tuple(offsets.tolist()),
+            start_notes=start_notes,
+            stop_notes=stop_notes,
+            overlap_notes=LazySequence(
+                len(offsets), lambda i: get_active_notes(i, start_indices[i])
+            ),
+            segment_notes=LazySequence(
+                len(offsets), lambda i: get_active_notes(i, start_stop_indices[i])
+            ),
+            note_on_messages=LazySequence(
+                len(offsets),
+                lambda i: tuple(
+                    NoteOnMessage(pitch=note.pitch, velocity=note.velocity)
+                    for note in start_notes[i]
+                ),
+            ),
+            note_off_messages=LazySequence(
+                len(offsets),
+                lambda i: tuple(
+                    NoteOffMessage(pitch=note.pitch, velocity=note.velocity)
+                    for note in stop_notes[i]
+                ),
+            ),
+        )
+
+    @classmethod
+    def from_notes(cls, notes):
+        notes_by_start, notes_by_stop = {}, {}
+        for note in sorted(notes):
+            notes_by_start.setdefault(note.start_offset, []).append(note)
+            notes_by_stop.setdefault(note.stop_offset, []).append(note)
+        offsets = sorted(set(notes_by_start).union(notes_by_stop))
+        start_notes, stop_notes, overlap_notes, segment_notes = [], [], [], []
+        active_notes = {}
+        for offset in offsets:
+            starting = tuple(notes_by_start.get(offset, ()))
+            stopping = tuple(
+                sorted(
+                    notes_by_stop.get(offset, ()),
+                    key=lambda note: (note.start_offset, note.stop_offset),
+                )
+            )
+            for note in stopping:
+                active_notes.pop(note)
+            overlapping = tuple(sorted(active_notes))
+            for note in starting:
+                active_notes[note] = True
+            start_notes.append(starting)
+            stop_notes.append(stopping)
+            overlap_notes.append(overlapping)
+            segment_notes.append(tuple(sorted(active_notes)))
+        return cls(
+            offsets=tuple(offsets),
+            start_notes=tuple(start_notes),
+            stop_notes=tuple(stop_notes),
+            overlap_notes=tuple(overlap_notes),
+            segment_notes=tuple(segment_notes),
+            note_on_messages=tuple(
+                tuple(
+                    NoteOnMessage(pitch=note.pitch, velocity=note.velocity)
+                    for note in notes
+                )
+                for notes in start_notes
+            ),
+            note_off_messages=tuple(
+                tuple(
+                    NoteOffMessage(pitch=note.pitch, velocity=note.velocity)
+                    for note in notes
+                )
+                for notes in stop_notes
+            ),
+        )
+
+    def get_index_at(self, offset) -> Tuple[int, bool]:
+        """
+        Get the index of the last boundary at or before ``offset``, and whether
+        ``offset`` falls exactly on that boundary.
+        """
+        index = bisect.bisect_right(self.offsets, offset) - 1
+        return index, index >= 0 and self.offsets[index] == offset
+
+    def get_notes_at(self, offset) -> Tuple[List[Note], List[Note], List[Note]]:
+        index, is_boundary = self.get_index_at(offset)
+        if is_boundary:
+            return (
+                list(self.start_notes[index]),
+                list(self.stop_notes[index]),
+                list(self.overlap_notes[index]),
+            )
+        elif index >= 0:
+            return [], [], list(self.segment_notes[index])
+        return [], [], []
+
+    def get_offset_after(self, offset) -> Optional[float]:
+        index = bisect.bisect_right(self.offsets, offset)
+        if index < len(self.offsets):
+            return self.offsets[index]
+        return None
+
+
+class NoteStorage(abc.ABC):
+    """
+    Stores a clip's notes, in sorted order.
+
+    Notes of the same pitch never overlap: adding a note truncates or replaces
+    any existing note of the same pitch it collides with.
+    """
 
     ### INITIALIZER ###
 
-    def at(self, offset, start_delta=0.0, force_stop=False):
-        pass
+    def __init__(self):
+        self._columns = None
 
-    ### PUBLIC PROPERTIES ###
+    ### SPECIAL METHODS ###
 
-    @property
-    def uuid(self):
-        return self._uuid
+    @abc.abstractmethod
+    def __iter__(self):
+        pass
 
+    @abc.abstractmethod
+    def __len__(self):
+        pass
 
-class Clip(ClipObject):
+    ### PUBLIC METHODS ###
+
+    @abc.abstractmethod
+    def add(self, notes) -> Tuple[List[Note], List[Note]]:
+        """
+        Add ``notes``, returning the notes actually added and removed.
+        """
+
+    @abc.abstractmethod
+    def get_columns(self) -> Tuple[Sequence[Note], Dict[str, numpy.ndarray]]:
+        """
+        Get the sorted notes and a mapping of their fields to NumPy arrays.
+        """
+
+    @abc.abstractmethod
+    def get_note_starting_at(self, pitch, offset) -> Optional[Note]:
+        """
+        Get the note of ``pitch`` starting at ``offset``, if any.
+        """
+
+    @abc.abstractmethod
+    def get_timeline(self) -> NoteTimeline:
+        """
+        Get a compiled timeline of the notes.
+        """
+
+    @abc.abstractmethod
+    def remove(self, notes):
+        """
+        Remove ``notes``, each of which must be stored.
+        """
+
+
+class IntervalNoteStorage(NoteStorage):
+    """
+    Stores notes in an interval tree, with a per-pitch index sorted by offset.
+    """
 
     ### INITIALIZER ###
 
-    def __init__(
-        self, *, duration=4 / 4, is_looping=True, name=None, notes=None, uuid=None
-    ):
-        ClipObject.__init__(self, name=name, uuid=uuid)
-        self._duration = float(duration)
-        self._is_looping = is_looping
-        self._is_playing = False
-        self._start_delta = 0.0
+    def __init__(self):
+        NoteStorage.__init__(self)
         self._interval_tree = IntervalTree()
-        self._add_notes(notes or [])
+        self._notes_by_pitch: Dict[float, List[Note]] = {}
+        self._start_offsets_by_pitch: Dict[float, List[float]] = {}
 
     ### SPECIAL METHODS ###
 
-    def __str__(self):
-        obj_name = type(self).__name__
-        return "\n".join(
-            [
-                f"<{obj_name} {self.uuid}>",
-                *(f"    {line}" for child in self for line in str(child).splitlines()),
-            ]
-        )
+    def __iter__(self):
+        return iter(sorted(self._interval_tree))
+
+    def __len__(self):
+        return len(self._interval_tree)
 
     ### PRIVATE METHODS ###
 
-    def _add_notes(self, notes):
+    def _get_notes_near(self, pitch, start_offset, stop_offset) -> List[Note]:
+        """
+        Get the sorted notes of ``pitch`` which may intersect ``start_offset``
+        through ``stop_offset``.
+
+        Notes of the same pitch never overlap, so the index is sorted by both
+        start and stop offset, and only the note immediately preceding
+        ``start_offset`` can reach into the range from before it.
+        """
+        start_offsets = self._start_offsets_by_pitch.get(pitch)
+        if not start_offsets:
+            return []
+        start_index = max(bisect.bisect_left(start_offsets, start_offset) - 1, 0)
+        stop_index = bisect.bisect_left(start_offsets, stop_offset)
+        return self._notes_by_pitch[pitch][start_index:stop_index]
+
+    ### PUBLIC METHODS ###
+
+    def add(self, notes) -> Tuple[List[Note], List[Note]]:
         def validate_new_notes(new_notes):
             validated_new_notes = [new_notes.popleft()]
             while new_notes:
@@ -179,25 +399,463 @@ class Clip(ClipObject):
                     )
             return invalidated_old_notes, truncated_old_notes
 
-        self._debug_tree(self, "Editing")
         to_add = []
         to_remove = []
-        new_notes_by_pitch = {}
+        new_notes_by_pitch: Dict[float, Deque[Note]] = {}
         for note in sorted(notes):
             new_notes_by_pitch.setdefault(note.pitch, deque()).append(note)
-        old_notes_by_pitch = {}
-        for note in self._interval_tree:
-            old_notes_by_pitch.setdefault(note.pitch, []).append(note)
         for pitch, new_notes in new_notes_by_pitch.items():
             validated_new_notes = validate_new_notes(new_notes)
             invalidated_old_notes, truncated_old_notes = invalidate_old_notes(
-                validated_new_notes, old_notes_by_pitch.get(pitch, [])
+                validated_new_notes,
+                self._get_notes_near(
+                    pitch,
+                    validated_new_notes[0].start_offset,
+                    validated_new_notes[-1].stop_offset,
+                ),
             )
             to_add.extend(validated_new_notes)
             to_add.extend(truncated_old_notes)
             to_remove.extend(invalidated_old_notes)
-        self._remove_notes(to_remove)
+        self.remove(to_remove)
         self._interval_tree.update(to_add)
+        self._columns = None
+        for note in to_add:
+            index = bisect.bisect_left(
+                self._start_offsets_by_pitch.setdefault(note.pitch, []),
+                note.start_offset,
+            )
+            self._notes_by_pitch.setdefault(note.pitch, []).insert(index, note)
+            self._start_offsets_by_pitch[note.pitch].insert(index, note.start_offset)
+        return to_add, to_remove
+
+    def get_columns(self) -> Tuple[Sequence[Note], Dict[str, numpy.ndarray]]:
+        if self._columns is None:
+            notes = tuple(self)
+            self._columns = (
+                notes,
+                {
+                    field: numpy.array(
+                        [getattr(note, field) for note in notes], dtype=numpy.float64
+                    )
+                    for field in ArrayNoteStorage.fields
+                },
+            )
+        return self._columns
+
+    def get_note_starting_at(self, pitch, offset) -> Optional[Note]:
+        start_offsets = self._start_offsets_by_pitch.get(pitch, [])
+        index = bisect.bisect_left(start_offsets, offset)
+        if index < len(start_offsets) and start_offsets[index] == offset:
+            return self._notes_by_pitch[pitch][index]
+        return None
+
+    def get_timeline(self) -> NoteTimeline:
+        return NoteTimeline.from_notes(self)
+
+    def remove(self, notes):
+        for note in notes:
+            self._interval_tree.remove(note)
+            self._columns = None
+            start_offsets = self._start_offsets_by_pitch[note.pitch]
+            index = bisect.bisect_left(start_offsets, note.start_offset)
+            del self._notes_by_pitch[note.pitch][index]
+            del start_offsets[index]
+            if not start_offsets:
+                del self._notes_by_pitch[note.pitch]
+                del self._start_offsets_by_pitch[note.pitch]
+
+
+class NoteArray(collections.abc.Sequence):
+    """
+    A read-only sequence of notes over a structured note array, materializing
+    each note only when it is accessed.
+    """
+
+    ### INITIALIZER ###
+
+    def __init__(self, array):
+        self._array = array
+
+    ### SPECIAL METHODS ###
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [Note(*row) for row in self._array[index].tolist()]
+        return Note(*self._array[index].tolist())
+
+    def __iter__(self):
+        for row in self._array.tolist():
+            yield Note(*row)
+
+    def __len__(self):
+        return len(self._array)
+
+
+class LazySequence(collections.abc.Sequence):
+    """
+    A read-only sequence computing each item only when it is first accessed.
+    """
+
+    ### INITIALIZER ###
+
+    def __init__(self, length, get_item):
+        self._length = length
+        self._get_item = get_item
+        self._items = {}
+
+    ### SPECIAL METHODS ###
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError(index)
+        if index not in self._items:
+            self._items[index] = self._get_item(index)
+        return self._items[index]
+
+    def __len__(self):
+        return self._length
+
+
+class ArrayNoteStorage(NoteStorage):
+    """
+    Stores notes as a structured NumPy array, sorted like notes themselves.
+
+    Overlaps are resolved with vectorized operations, equivalent to those of
+    ``IntervalNoteStorage``, and notes are materialized only on demand.
+    """
+
+    ### CLASS VARIABLES ###
+
+    fields: Tuple[str, ...] = ("start_offset", "stop_offset", "pitch", "velocity")
+
+    dtype = numpy.dtype([(field, numpy.float64) for field in fields])
+
+    ### INITIALIZER ###
+
+    def __init__(self):
+        NoteStorage.__init__(self)
+        self._array = numpy.empty(0, dtype=self.dtype)
+        # an upper bound, as removing notes never shrinks it
+        self._max_duration = 0.0
+
+    ### SPECIAL METHODS ###
+
+    def __iter__(self):
+        return iter(NoteArray(self._array))
+
+    def __len__(self):
+        return len(self._array)
+
+    ### PRIVATE METHODS ###
+
+    def _get_indices_near(self, pitch, start_offset, stop_offset):
+        """
+        Get the sorted indices of notes of ``pitch`` which may intersect
+        ``start_offset`` through ``stop_offset``.
+
+        Only notes starting less than the longest duration before
+        ``start_offset`` can reach into the range from before it.
+        """
+        start_offsets = self._array["start_offset"]
+        start_index = numpy.searchsorted(
+            start_offsets, start_offset - self._max_duration
+        )
+        stop_index = numpy.searchsorted(start_offsets, stop_offset)
+        indices = numpy.arange(start_index, stop_index)
+        return indices[self._array["pitch"][start_index:stop_index] == pitch]
+
+    def _invalidate_old_notes(self, new_notes, old_notes):
+        # the first new note stopping after each old note starts
+        indices = numpy.searchsorted(
+            new_notes["stop_offset"], old_notes["start_offset"], side="right"
+        )
+        in_range = indices < len(new_notes)
+        new_start_offsets = new_notes["start_offset"][
+            numpy.minimum(indices, len(new_notes) - 1)
+        ]
+        # new note covers the old note's start: old note is removed
+        covered = in_range & (new_start_offsets <= old_notes["start_offset"])
+        # new note starts inside the old note: old note is truncated
+        truncated = in_range & ~covered & (new_start_offsets < old_notes["stop_offset"])
+        truncated_old_notes = old_notes[truncated]
+        truncated_old_notes["stop_offset"] = new_start_offsets[truncated]
+        return covered | truncated, truncated_old_notes
+
+    def _sort(self, array):
+        return array[
+            numpy.lexsort(
+                (
+                    array["velocity"],
+                    array["pitch"],
+                    array["stop_offset"],
+                    array["start_offset"],
+                )
+            )
+        ]
+
+    def _to_array(self, notes):
+        return numpy.array(
+            [
+                (note.start_offset, note.stop_offset, note.pitch, note.velocity)
+                for note in notes
+            ],
+            dtype=self.dtype,
+        )
+
+    def _validate_new_notes(self, new_notes):
+        start_offsets = new_notes["start_offset"]
+        is_group_start = numpy.ones(len(new_notes), dtype=bool)
+        is_group_start[1:] = start_offsets[1:] != start_offsets[:-1]
+        group_indices = numpy.flatnonzero(is_group_start)
+        validated_new_notes = new_notes[is_group_start]
+        # simultaneous new note starts: longer note and louder velocity win
+        for field in ("stop_offset", "velocity"):
+            validated_new_notes[field] = numpy.maximum.reduceat(
+                new_notes[field], group_indices
+            )
+        # new note overlaps: later notes masks earlier note
+        validated_new_notes["stop_offset"][:-1] = numpy.minimum(
+            validated_new_notes["stop_offset"][:-1],
+            validated_new_notes["start_offset"][1:],
+        )
+        return validated_new_notes
+
+    ### PUBLIC METHODS ###
+
+    def add(self, notes) -> Tuple[List[Note], List[Note]]:
+        new_notes = self._sort(self._to_array(notes))
+        if not len(new_notes):
+            return [], []
+        to_add, to_remove = [], []
+        for pitch in numpy.unique(new_notes["pitch"]):
+            validated_new_notes = self._validate_new_notes(
+                new_notes[new_notes["pitch"] == pitch]
+            )
+            old_indices = self._get_indices_near(
+                pitch,
+                validated_new_notes["start_offset"][0],
+                validated_new_notes["stop_offset"][-1],
+            )
+            invalidated, truncated_old_notes = self._invalidate_old_notes(
+                validated_new_notes, self._array[old_indices]
+            )
+            to_add.extend([validated_new_notes, truncated_old_notes])
+            to_remove.append(old_indices[invalidated])
+        removed_indices = numpy.sort(numpy.concatenate(to_remove))
+        removed_notes = list(NoteArray(self._array[removed_indices]))
+        added_notes = self._sort(numpy.concatenate(to_add))
+        # the kept notes stay sorted, so the added notes are inserted in place
+        array = numpy.delete(self._array, removed_indices)
+        self._array = numpy.insert(
+            array, numpy.searchsorted(array, added_notes), added_notes
+        )
+        self._max_duration = max(
+            self._max_duration,
+            float((added_notes["stop_offset"] - added_notes["start_offset"]).max()),
+        )
+        self._columns = None
+        return list(NoteArray(added_notes)), removed_notes
+
+    def get_columns(self) -> Tuple[Sequence[Note], Dict[str, numpy.ndarray]]:
+        if self._columns is None:
+            self._columns = (
+                NoteArray(self._array),
+                {field: self._array[field] for field in self.fields},
+            )
+        return self._columns
+
+    def get_note_starting_at(self, pitch, offset) -> Optional[Note]:
+        start_offsets = self._array["start_offset"]
+        index = numpy.searchsorted(start_offsets, offset)
+        stop_index = numpy.searchsorted(start_offsets, offset, side="right")
+        for i in numpy.flatnonzero(self._array["pitch"][index:stop_index] == pitch):
+            return Note(*self._array[index + i].tolist())
+        return None
+
+    def get_timeline(self) -> NoteTimeline:
+        return NoteTimeline.from_array(self._array)
+
+    def remove(self, notes):
+        notes = self._to_array(notes)
+        if not len(notes):
+            return
+        start_offsets = self._array["start_offset"]
+        keep = numpy.ones(len(self._array), dtype=bool)
+        for note in notes:
+            index = numpy.searchsorted(start_offsets, note["start_offset"])
+            while (
+                index < len(start_offsets)
+                and start_offsets[index] == note["start_offset"]
+            ):
+                if keep[index] and self._array[index] == note:
+                    keep[index] = False
+                    break
+                index += 1
+            else:
+                raise ValueError(Note(*note.tolist()))
+        self._array = self._array[keep]
+        self._columns = None
+
+
+class EnvelopeSegment(NamedTuple):
+    parameter_uuid: UUID
+    start_offset: float
+    stop_offset: Optional[float]
+    start_value: float
+    stop_value: float
+
+
+@dataclasses.dataclass(frozen=True)
+class Envelope:
+    """
+    An automation envelope, in a Clip or Timeline.
+
+    Breakpoints are ``(offset, value)`` pairs, interpolated linearly between
+    and held before the first and after the last.
+    """
+
+    parameter_uuid: UUID
+    breakpoints: Tuple[Tuple[float, float], ...] = ()
+    _offsets: Tuple[float, ...] = dataclasses.field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        breakpoints = tuple(
+            sorted((float(offset), float(value)) for offset, value in self.breakpoints)
+        )
+        if not breakpoints:
+            raise ValueError(self.breakpoints)
+        object.__setattr__(self, "breakpoints", breakpoints)
+        object.__setattr__(
+            self, "_offsets", tuple(breakpoint[0] for breakpoint in breakpoints)
+        )
+
+    def _serialize(self):
+        return dict(
+            parameter_uuid=str(self.parameter_uuid),
+            breakpoints=[list(breakpoint) for breakpoint in self.breakpoints],
+        )
+
+    ### PUBLIC METHODS ###
+
+    def get_segment_at(
+        self, offset
+    ) -> Tuple[Optional[float], Optional[float], float, float]:
+        """
+        Get the start offset, stop offset, start value and stop value of the
+        segment sounding at ``offset``.
+
+        Holds before the first breakpoint start at None, and holds after the
+        last breakpoint stop at None.
+        """
+        offsets = self._offsets
+        index = bisect.bisect_right(offsets, offset) - 1
+        if index < 0:
+            value = self.breakpoints[0][1]
+            return None, offsets[0], value, value
+        elif index == len(offsets) - 1:
+            value = self.breakpoints[-1][1]
+            return offsets[-1], None, value, value
+        (start_offset, start_value), (stop_offset, stop_value) = self.breakpoints[
+            index : index + 2
+        ]
+        return start_offset, stop_offset, start_value, stop_value
+
+    def value_at(self, offset) -> float:
+        start_offset, stop_offset, start_value, stop_value = self.get_segment_at(offset)
+        if start_offset is None or stop_offset is None:
+            return start_value
+        ratio = (offset - start_offset) / (stop_offset - start_offset)
+        return start_value + (stop_value - start_value) * ratio
+
+
+class ClipObject(ApplicationObject):
+
+    ### INITIALIZER ###
+
+    def __init__(self, *, name=None, uuid=None):
+        ApplicationObject.__init__(self, name=name)
+        self._uuid = uuid or uuid4()
+
+    ### INITIALIZER ###
+
+    def at(self, offset, start_delta=0.0, force_stop=False):
+        pass
+
+    ### PUBLIC PROPERTIES ###
+
+    @property
+    def uuid(self):
+        return self._uuid
+
+
+class Clip(ClipObject):
+
+    ### INITIALIZER ###
+
+    def __init__(
+        self,
+        *,
+        columnar=False,
+        duration=4 / 4,
+        envelopes=None,
+        is_looping=True,
+        name=None,
+        notes=None,
+        uuid=None,
+    ):
+        ClipObject.__init__(self, name=name, uuid=uuid)
+        self._duration = float(duration)
+        self._envelopes: Dict[UUID, Envelope] = {
+            envelope.parameter_uuid: envelope for envelope in envelopes or ()
+        }
+        self._is_looping = is_looping
+        self._is_playing = False
+        self._start_delta = 0.0
+        self._storage: NoteStorage = (
+            ArrayNoteStorage() if columnar else IntervalNoteStorage()
+        )
+        self._timeline: Optional[NoteTimeline] = None
+        self._added_notes: Set[Note] = set()
+        self._removed_notes: Set[Note] = set()
+        self._notify_task: Optional[asyncio.Task] = None
+        self._add_notes(notes or [])
+        self._added_notes.clear()
+
+    ### SPECIAL METHODS ###
+
+    def __str__(self):
+        obj_name = type(self).__name__
+        return "\n".join(
+            [
+                f"<{obj_name} {self.uuid}>",
+                *(f"    {line}" for child in self for line in str(child).splitlines()),
+            ]
+        )
+
+    ### PRIVATE METHODS ###
+
+    def _add_notes(self, notes):
+        self._debug_tree(self, "Editing")
+        added_notes, removed_notes = self._storage.add(notes)
+        self._track_removed_notes(removed_notes)
+        self._track_added_notes(added_notes)
+        self._timeline = None
+
+    def _deapplicate(self, old_application):
+        ClipObject._deapplicate(self, old_application)
+        # a removed clip's pending edits have no one left to notify
+        if self._notify_task is not None:
+            self._notify_task.cancel()
+            self._notify_task = None
+        self._added_notes.clear()
+        self._removed_notes.clear()
 
     @classmethod
     async def _deserialize(cls, data, application) -> bool:
@@ -206,7 +864,15 @@ class Clip(ClipObject):
         if parent is None:
             return True
         clip = cls(
+            columnar=bool(data["spec"].get("columnar", False)),
             duration=data["spec"].get("duration", 4 / 4),
+            envelopes=[
+                Envelope(
+                    parameter_uuid=UUID(envelope_spec["parameter_uuid"]),
+                    breakpoints=envelope_spec["breakpoints"],
+                )
+                for envelope_spec in data["spec"].get("envelopes", [])
+            ],
             is_looping=bool(data["spec"].get("is_looping", True)),
             name=data["meta"].get("name"),
             notes=[Note(**note_spec) for note_spec in data["spec"].get("notes", [])],
@@ -216,32 +882,104 @@ class Clip(ClipObject):
         return False
 
     async def _notify(self):
+        if self.application is None:
+            self._added_notes.clear()
+            self._removed_notes.clear()
+            return
+        window = self.transport.clip_edit_window
+        if not window:
+            await self._notify_now()
+        elif self._notify_task is None:
+            self._notify_task = asyncio.get_running_loop().create_task(
+                self._notify_later(window)
+            )
+
+    async def _notify_later(self, window):
+        await asyncio.sleep(window)
+        self._notify_task = None
+        try:
+            await self._notify_now()
+        except Exception:
+            logger.exception(f"Failed to notify edits to {self!r}")
+
+    async def _notify_now(self, reschedule=True):
         self._debug_tree(self, "Notifying")
+        added_notes = tuple(sorted(self._added_notes))
+        removed_notes = tuple(sorted(self._removed_notes))
+        self._added_notes.clear()
+        self._removed_notes.clear()
         if self.application is None:
             return
-        if self.is_playing:
-            track = self.parent.parent.parent
-            await self.transport.reschedule(
-                track._clip_perform_event_id,
-                schedule_at=self.transport._clock.get_current_time(),
-                time_unit=TimeUnit.SECONDS,
+        if reschedule and (
+            self.is_playing
+            or (isinstance(self.parent, Timeline) and self.parent.is_playing)
+        ):
+            await self.transport._schedule_clip(self.track)
+        self.application.pubsub.publish(
+            ClipModified(
+                self.uuid, added_notes=added_notes, removed_notes=removed_notes
             )
-        self.application.pubsub.publish(ClipModified(self.uuid))
+        )
+
+    async def _edit_notes(self, old_notes, new_notes):
+        self._remove_notes(old_notes)
+        self._add_notes(new_notes)
+        await self._notify()
+
+    async def _flush_notify(self):
+        """
+        Publish edits still waiting out the edit window, without rescheduling.
+        """
+        if self._notify_task is None:
+            return
+        self._notify_task.cancel()
+        self._notify_task = None
+        await self._notify_now(reschedule=False)
+
+    def _get_note_columns(self) -> Tuple[Sequence[Note], Dict[str, numpy.ndarray]]:
+        return self._storage.get_columns()
+
+    def _get_timeline(self) -> NoteTimeline:
+        if self._timeline is None:
+            self._timeline = self._storage.get_timeline()
+        return self._timeline
 
     def _remove_notes(self, notes):
         self._debug_tree(self, "Editing")
-        for note in notes:
-            self._interval_tree.remove(note)
+        notes = list(notes)
+        self._storage.remove(notes)
+        self._track_removed_notes(notes)
+        self._timeline = None
 
     def _serialize(self):
         serialized, auxiliary_entities = super()._serialize()
         if self.parent is not None:
             serialized["meta"]["parent"] = str(self.parent.uuid)
+        if self.is_columnar:
+            serialized["spec"]["columnar"] = True
+        if self._envelopes:
+            serialized["spec"]["envelopes"] = [
+                envelope._serialize() for envelope in self._envelopes.values()
+            ]
         serialized["spec"]["notes"] = []
         for note in self.notes:
             serialized["spec"]["notes"].append(note._serialize())
         return serialized, auxiliary_entities
 
+    def _track_added_notes(self, notes):
+        for note in notes:
+            if note in self._removed_notes:
+                self._removed_notes.remove(note)
+            else:
+                self._added_notes.add(note)
+
+    def _track_removed_notes(self, notes):
+        for note in notes:
+            if note in self._added_notes:
+                self._added_notes.remove(note)
+            else:
+                self._removed_notes.add(note)
+
     ### PUBLIC METHODS ###
 
     async def add_notes(self, notes):
@@ -249,20 +987,27 @@ class Clip(ClipObject):
         await self._notify()
 
     def at(self, offset, start_delta=0.0, force_stop=False):
-        start_notes, stop_notes, overlap_notes = [], [], []
+        timeline = self._get_timeline()
         local_offset = loop_local_offset = offset - start_delta
         count = 0
         if self.is_looping and local_offset >= 0.0:
             count, loop_local_offset = divmod(local_offset, self.clip_stop)
-        moment = self._interval_tree.get_moment_at(loop_local_offset)
-        start_notes = moment.start_intervals
-        stop_notes = moment.stop_intervals
-        overlap_notes = moment.overlap_intervals
+        index, is_boundary = timeline.get_index_at(loop_local_offset)
+        start_notes, stop_notes, overlap_notes = timeline.get_notes_at(
+            loop_local_offset
+        )
+        note_on_messages = note_off_messages = None
+        if is_boundary:
+            note_on_messages = timeline.note_on_messages[index]
+            note_off_messages = timeline.note_off_messages[index]
         if count and not loop_local_offset:  # at a non-zero loop boundary
-            moment_two = self._interval_tree.get_moment_at(self.duration)
-            stop_notes.extend(moment_two.overlap_intervals)
-            stop_notes.extend(moment_two.stop_intervals)
-        next_offset = self._interval_tree.get_offset_after(loop_local_offset)
+            _, duration_stop_notes, duration_overlap_notes = timeline.get_notes_at(
+                self.duration
+            )
+            stop_notes.extend(duration_overlap_notes)
+            stop_notes.extend(duration_stop_notes)
+            note_off_messages = None
+        next_offset = timeline.get_offset_after(loop_local_offset)
         if next_offset is None and self.is_looping:
             next_offset = self.duration
         if next_offset is not None:
@@ -274,6 +1019,7 @@ class Clip(ClipObject):
             stop_notes.extend(overlap_notes)
             overlap_notes[:] = []
             next_offset = None
+            note_on_messages = note_off_messages = None
         return NoteMoment(
             offset=offset,
             local_offset=loop_local_offset,
@@ -281,12 +1027,71 @@ class Clip(ClipObject):
             start_notes=start_notes or None,
             stop_notes=stop_notes or None,
             overlap_notes=overlap_notes or None,
+            _note_on_messages=note_on_messages,
+            _note_off_messages=note_off_messages,
         )
 
+    def get_envelope_segments(
+        self, offset, start_delta=0.0
+    ) -> Tuple[Tuple[EnvelopeSegment, ...], Optional[float]]:
+        """
+        Get the envelope segments sounding at ``offset``, in absolute offsets,
+        and the offset at which the next segment starts.
+        """
+        local_offset = loop_local_offset = offset - start_delta
+        count = 0
+        if self.is_looping and local_offset >= 0.0:
+            count, loop_local_offset = divmod(local_offset, self.clip_stop)
+        pass_offset = start_delta + (count * self.duration)
+        segments, next_offset = [], None
+        for envelope in self._envelopes.values():
+            (
+                start_offset,
+                stop_offset,
+                start_value,
+                stop_value,
+            ) = envelope.get_segment_at(loop_local_offset)
+            if start_offset is None:
+                start_offset = min(self.clip_start, loop_local_offset)
+            if self.is_looping and (stop_offset is None or stop_offset > self.duration):
+                stop_value = envelope.value_at(self.duration)
+                stop_offset = self.duration
+            if stop_offset is not None:
+                stop_offset += pass_offset
+                if next_offset is None or stop_offset < next_offset:
+                    next_offset = stop_offset
+            segments.append(
+                EnvelopeSegment(
+                    parameter_uuid=envelope.parameter_uuid,
+                    start_offset=start_offset + pass_offset,
+                    stop_offset=stop_offset,
+                    start_value=start_value,
+                    stop_value=stop_value,
+                )
+            )
+        return tuple(segments), next_offset
+
+    async def remove_envelope(self, parameter_uuid):
+        self._envelopes.pop(parameter_uuid)
+        await self._notify()
+
     async def remove_notes(self, notes):
         self._remove_notes(notes)
         await self._notify()
 
+    async def set_envelope(self, parameter_uuid, breakpoints):
+        envelope = Envelope(parameter_uuid=parameter_uuid, breakpoints=breakpoints)
+        self._envelopes[parameter_uuid] = envelope
+        await self._notify()
+        return envelope
+
+    def get_note_starting_at(self, pitch, offset) -> Optional[Note]:
+        """
+        Get the note of ``pitch`` starting at ``offset``, if any, without
+        building the clip's timeline.
+        """
+        return self._storage.get_note_starting_at(float(pitch), float(offset))
+
     ### PUBLIC PROPERTIES ###
 
     @property
@@ -301,6 +1106,14 @@ class Clip(ClipObject):
     def duration(self):
         return self._duration
 
+    @property
+    def envelopes(self) -> Tuple[Envelope, ...]:
+        return tuple(self._envelopes.values())
+
+    @property
+    def is_columnar(self):
+        return isinstance(self._storage, ArrayNoteStorage)
+
     @property
     def is_looping(self):
         return self._is_looping
@@ -311,7 +1124,13 @@ class Clip(ClipObject):
 
     @property
     def notes(self):
-        return sorted(self._interval_tree)
+        return list(self._storage)
+
+    @property
+    def track(self):
+        from .tracks import Track
+
+        return self._get_ancestor(Track)
 
     @property
     def clip_delta(self):
@@ -369,8 +1188,8 @@ class Slot(ApplicationObject):
 
     ### PUBLIC METHODS ###
 
-    async def add_clip(self, *, notes=None, is_looping=True):
-        clip = Clip(notes=notes, is_looping=is_looping)
+    async def add_clip(self, *, columnar=False, notes=None, is_looping=True):
+        clip = Clip(columnar=columnar, notes=notes, is_looping=is_looping)
         await self._set_clip(clip)
         return clip
 
@@ -405,10 +1224,7 @@ class Slot(ApplicationObject):
     def track(self):
         from .tracks import Track
 
-        for parent in self.parentage[1:]:
-            if isinstance(parent, Track):
-                return parent
-        return None
+        return self._get_ancestor(Track)
 
     @property
     def uuid(self):
@@ -451,7 +1267,18 @@ class Scene(ApplicationObject):
         pass
 
     async def fire(self):
-        pass
+        """
+        Launch every track into this scene's slot, in one quantized launch.
+        """
+        from .tracks import Track
+
+        if not self.application:
+            return
+        index = self.parent.index(self)
+        await self.transport._cue_clip_launch(
+            {track: index for track in self.application.find(Track)}
+        )
+        self.application.pubsub.publish(SceneFired(self.uuid))
 
     ### PUBLIC PROPERTIES ###
 
@@ -460,8 +1287,275 @@ class Scene(ApplicationObject):
         return self._uuid
 
 
-class Timeline:
-    pass
+@dataclasses.dataclass(frozen=True, order=True)
+class ClipInstance:
+    """
+    A placement of a timeline clip, from ``start_offset`` to ``stop_offset``,
+    starting ``clip_offset`` into the clip.
+    """
+
+    start_offset: float
+    stop_offset: float
+    clip_uuid: UUID
+    clip_offset: float = 0.0
+
+    def __post_init__(self):
+        if self.start_offset >= self.stop_offset or self.clip_offset < 0:
+            raise ValueError(self)
+
+    def _serialize(self):
+        return dict(
+            start_offset=self.start_offset,
+            stop_offset=self.stop_offset,
+            clip_uuid=str(self.clip_uuid),
+            clip_offset=self.clip_offset,
+        )
+
+    @property
+    def start_delta(self):
+        return self.start_offset - self.clip_offset
+
+
+class Timeline(ApplicationObject):
+    """
+    A track's arrangement: a pool of clips, and instances of them placed at
+    offsets.
+
+    Instances never overlap, so they are indexed by start offset alone, and
+    lookups at an offset or over a window are bisections.
+    """
+
+    ### INITIALIZER ###
+
+    def __init__(self, *, instances=None, name=None, uuid=None):
+        ApplicationObject.__init__(self, name=name)
+        self._uuid = uuid or uuid4()
+        self._clips_by_uuid: Dict[UUID, Clip] = {}
+        self._instances: List[ClipInstance] = []
+        self._start_offsets: List[float] = []
+        for instance in instances or ():
+            self._place(instance)
+
+    ### SPECIAL METHODS ###
+
+    def __str__(self):
+        obj_name = type(self).__name__
+        return "\n".join(
+            [
+                f"<{obj_name} {self.uuid}>",
+                *(f"    {line}" for child in self for line in str(child).splitlines()),
+            ]
+        )
+
+    ### PRIVATE METHODS ###
+
+    @classmethod
+    async def _deserialize(cls, data, application) -> bool:
+        parent_uuid = UUID(data["meta"]["parent"])
+        parent = application.registry.get(parent_uuid)
+        if parent is None:
+            return True
+        timeline = cls(
+            instances=[
+                ClipInstance(
+                    start_offset=instance_spec["start_offset"],
+                    stop_offset=instance_spec["stop_offset"],
+                    clip_uuid=UUID(instance_spec["clip_uuid"]),
+                    clip_offset=instance_spec.get("clip_offset", 0.0),
+                )
+                for instance_spec in data["spec"].get("instances", [])
+            ],
+            name=data["meta"].get("name"),
+            uuid=UUID(data["meta"]["uuid"]),
+        )
+        parent._set_timeline(timeline)
+        return False
+
+    async def _notify(self):
+        if self.application is None:
+            return
+        if self.is_playing:
+            await self.transport._schedule_clip(self.track)
+        self.application.pubsub.publish(TimelineModified(self.uuid))
+
+    def _place(self, instance):
+        for old_instance in self.get_instances(
+            instance.start_offset, instance.stop_offset
+        ):
+            self._unplace(old_instance)
+            # new instance starts inside the old instance: old head is kept
+            if old_instance.start_offset < instance.start_offset:
+                self._place(
+                    dataclasses.replace(old_instance, stop_offset=instance.start_offset)
+                )
+            # new instance stops inside the old instance: old tail is kept
+            if instance.stop_offset < old_instance.stop_offset:
+                self._place(
+                    dataclasses.replace(
+                        old_instance,
+                        start_offset=instance.stop_offset,
+                        clip_offset=old_instance.clip_offset
+                        + instance.stop_offset
+                        - old_instance.start_offset,
+                    )
+                )
+        index = bisect.bisect_left(self._start_offsets, instance.start_offset)
+        self._instances.insert(index, instance)
+        self._start_offsets.insert(index, instance.start_offset)
+
+    def _serialize(self):
+        serialized, auxiliary_entities = super()._serialize()
+        if self.parent is not None:
+            serialized["meta"]["parent"] = str(self.parent.uuid)
+        serialized["spec"]["clips"] = []
+        for clip in self:
+            serialized["spec"]["clips"].append(str(clip.uuid))
+            clip_entities = clip._serialize()
+            auxiliary_entities.append(clip_entities[0])
+            auxiliary_entities.extend(clip_entities[1])
+        serialized["spec"]["instances"] = [
+            instance._serialize() for instance in self._instances
+        ]
+        return serialized, auxiliary_entities
+
+    def _set_items(self, new_items, old_items, start_index, stop_index):
+        ApplicationObject._set_items(
+            self, new_items, old_items, start_index, stop_index
+        )
+        for clip in old_items:
+            self._clips_by_uuid.pop(clip.uuid, None)
+        for clip in new_items:
+            self._clips_by_uuid[clip.uuid] = clip
+
+    def _unplace(self, instance):
+        index = bisect.bisect_left(self._start_offsets, instance.start_offset)
+        if index == len(self._instances) or self._instances[index] != instance:
+            raise ValueError(instance)
+        del self._instances[index]
+        del self._start_offsets[index]
+
+    ### PUBLIC METHODS ###
+
+    async def add_clip(
+        self, *, columnar=False, duration=4 / 4, notes=None, is_looping=True
+    ):
+        clip = Clip(
+            columnar=columnar, duration=duration, notes=notes, is_looping=is_looping
+        )
+        async with self.lock([self]):
+            self._append(clip)
+        return clip
+
+    def get_clip(self, clip_uuid) -> Optional[Clip]:
+        return self._clips_by_uuid.get(clip_uuid)
+
+    def get_instance_at(self, offset) -> Optional[ClipInstance]:
+        index = bisect.bisect_right(self._start_offsets, offset) - 1
+        if index >= 0 and offset < self._instances[index].stop_offset:
+            return self._instances[index]
+        return None
+
+    def get_instances(self, start_offset, stop_offset) -> List[ClipInstance]:
+        """
+        Get the instances overlapping ``start_offset`` through ``stop_offset``.
+        """
+        start_index = bisect.bisect_right(self._start_offsets, start_offset) - 1
+        if start_index < 0 or self._instances[start_index].stop_offset <= start_offset:
+            start_index += 1
+        stop_index = bisect.bisect_left(self._start_offsets, stop_offset)
+        return self._instances[start_index:stop_index]
+
+    def get_offset_after(self, offset) -> Optional[float]:
+        """
+        Get the first offset after ``offset`` at which an instance starts or
+        stops.
+        """
+        index = bisect.bisect_right(self._start_offsets, offset)
+        if index and offset < self._instances[index - 1].stop_offset:
+            return self._instances[index - 1].stop_offset
+        elif index < len(self._instances):
+            return self._start_offsets[index]
+        return None
+
+    async def place_clip(
+        self, clip, start_offset, stop_offset=None, clip_offset=0.0
+    ) -> ClipInstance:
+        """
+        Place ``clip`` from ``start_offset`` to ``stop_offset``, or for the
+        clip's duration.
+
+        Existing instances overlapped by the new instance are truncated,
+        split or removed.
+        """
+        async with self.lock([self]):
+            if clip.parent is not self:
+                raise ValueError(clip)
+            if stop_offset is None:
+                stop_offset = start_offset + clip.duration
+            instance = ClipInstance(
+                start_offset=float(start_offset),
+                stop_offset=float(stop_offset),
+                clip_uuid=clip.uuid,
+                clip_offset=float(clip_offset),
+            )
+            self._place(instance)
+        await self._notify()
+        return instance
+
+    async def remove_clips(self, *clips: Clip):
+        async with self.lock([self, *clips]):
+            if not all(clip in self for clip in clips):
+                raise ValueError
+            clip_uuids = set(clip.uuid for clip in clips)
+            for instance in tuple(self._instances):
+                if instance.clip_uuid in clip_uuids:
+                    self._unplace(instance)
+            for clip in clips:
+                self._remove(clip)
+        await self._notify()
+
+    async def remove_instances(self, *instances: ClipInstance):
+        async with self.lock([self]):
+            for instance in instances:
+                self._unplace(instance)
+        await self._notify()
+
+    ### PUBLIC PROPERTIES ###
+
+    @property
+    def clips(self) -> Tuple[Clip, ...]:
+        return tuple(self)
+
+    @property
+    def instances(self) -> Tuple[ClipInstance, ...]:
+        return tuple(self._instances)
+
+    @property
+    def is_playing(self):
+        track = self.track
+        return bool(
+            self._instances
+            and track is not None
+            and track._active_slot_index is None
+            and track.transport is not None
+            and track.transport._arrangement_delta is not None
+        )
+
+    @property
+    def stop_offset(self) -> float:
+        if not self._instances:
+            return 0.0
+        return self._instances[-1].stop_offset
+
+    @property
+    def track(self):
+        from .tracks import Track
+
+        return self._get_ancestor(Track)
+
+    @property
+    def uuid(self):
+        return self._uuid
 
 
 @dataclasses.dataclass
@@ -472,8 +1566,20 @@ class ClipLaunched(Event):
 @dataclasses.dataclass
 class ClipModified(Event):
     clip_uuid: UUID
+    added_notes: Tuple[Note, ...] = ()
+    removed_notes: Tuple[Note, ...] = ()
+
+
+@dataclasses.dataclass
+class SceneFired(Event):
+    scene_uuid: UUID
 
 
 @dataclasses.dataclass
 class SlotFired(Event):
     slot_uuid: UUID
+
+
+@dataclasses.dataclass
+class TimelineModified(Event):
+    timeline_uuid: UUID
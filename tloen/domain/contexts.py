@@ -120,7 +120,11 @@ class Context(Allocatable, Mixer):
         async with self.lock(
             [self], seconds=moment.seconds if moment is not None else None
         ):
-            for track in self.recurse(prototype=Track):
+            if self.application is not None:
+                tracks = self.application.find(Track, ancestor=self)
+            else:
+                tracks = tuple(self.recurse(prototype=Track))
+            for track in tracks:
                 await track.perform(midi_messages, moment=moment)
 
     async def query(self):
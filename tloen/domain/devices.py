@@ -280,10 +280,7 @@ class DeviceObject(Allocatable, Performable):
     def track_object(self):
         from .tracks import TrackObject
 
-        for parent in self.parentage[1:]:
-            if isinstance(parent, TrackObject):
-                return parent
-        return None
+        return self._get_ancestor(TrackObject)
 
     @property
     def uuid(self) -> UUID:
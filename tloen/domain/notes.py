@@ -1,4 +1,31 @@
+import numbers
+import operator
+
+import numpy
+
+from .clips import Note
+
+
 class NoteSelector:
+    """
+    Selects notes in a clip.
+
+    Filters evaluate as boolean masks over a column snapshot of the clip's
+    notes, and selectors over the same clip combine with ``&``, ``|``, ``^``
+    and ``~``.
+
+    Edits (``delete()``, ``replace()``, ``transpose()``, ``translate()`` and
+    ``translate_offsets()``) are coroutines, and notify the clip once.
+    """
+
+    _operators = {
+        "==": operator.eq,
+        "!=": operator.ne,
+        "<": operator.lt,
+        ">": operator.gt,
+        "<=": operator.le,
+        ">=": operator.ge,
+    }
 
     _valid_operators = frozenset(("==", "!=", "<", ">", "<=", ">="))
 
@@ -7,138 +34,172 @@ class NoteSelector:
         self._filters = tuple(filters or ())
 
     def __iter__(self):
-        source = iter(self._clip)
-        for filter_ in self._filters:
-            filter_name, filter_args = filter_[0], filter_[1:]
-            filter_func = getattr(self, "_" + filter_name)
-            source = filter_func(source, *filter_args)
-        yield from source
+        notes, columns = self._clip._get_note_columns()
+        for index in numpy.flatnonzero(self._get_mask(columns)):
+            yield notes[index]
+
+    def __len__(self):
+        _, columns = self._clip._get_note_columns()
+        return int(numpy.count_nonzero(self._get_mask(columns)))
 
     def __and__(self, selector):
-        pass
+        if not isinstance(selector, NoteSelector):
+            return NotImplemented
+        return self._with_filter("and_selector", self._validate_selector(selector))
 
     def __or__(self, selector):
-        pass
+        if not isinstance(selector, NoteSelector):
+            return NotImplemented
+        return self._with_filter("or_selector", self._validate_selector(selector))
 
     def __invert__(self):
-        pass
+        return self._with_filter("invert")
+
+    def __xor__(self, selector):
+        if not isinstance(selector, NoteSelector):
+            return NotImplemented
+        return self._with_filter("xor_selector", self._validate_selector(selector))
+
+    def _compare(self, values, targets, operator):
+        targets = numpy.atleast_1d(numpy.asarray(targets, dtype=numpy.float64))
+        comparisons = self._operators[operator](values[:, None], targets[None, :])
+        if operator == "!=":
+            return comparisons.all(axis=1)
+        return comparisons.any(axis=1)
+
+    async def _edit(self, start_delta=None, stop_delta=None, pitch_delta=None):
+        notes, columns = self._clip._get_note_columns()
+        indices = numpy.flatnonzero(self._get_mask(columns))
+        start_offsets = columns["start_offset"][indices] + (start_delta or 0)
+        stop_offsets = columns["stop_offset"][indices] + (stop_delta or 0)
+        pitches = columns["pitch"][indices] + (pitch_delta or 0)
+        velocities = columns["velocity"][indices]
+        await self._clip._edit_notes(
+            [notes[index] for index in indices],
+            [
+                Note(*values)
+                for values in zip(
+                    start_offsets.tolist(),
+                    stop_offsets.tolist(),
+                    pitches.tolist(),
+                    velocities.tolist(),
+                )
+            ],
+        )
 
-    def __xor__(self):
-        pass
+    def _get_mask(self, columns):
+        mask = numpy.ones(len(columns["start_offset"]), dtype=bool)
+        for filter_ in self._filters:
+            filter_name, filter_args = filter_[0], filter_[1:]
+            filter_func = getattr(self, "_" + filter_name)
+            mask = filter_func(columns, mask, *filter_args)
+        return mask
+
+    def _with_filter(self, *filter_):
+        return type(self)(self._clip, self._filters + (filter_,))
 
-    def _and_selector(self, source, selector):
-        pass
+    def _and_selector(self, columns, mask, selector):
+        return mask & selector._get_mask(columns)
 
-    def _or_selector(self, source, selector):
-        pass
+    def _or_selector(self, columns, mask, selector):
+        return mask | selector._get_mask(columns)
 
-    def _xor_selector(self, source, selector):
-        pass
+    def _xor_selector(self, columns, mask, selector):
+        return mask ^ selector._get_mask(columns)
 
-    def _invert(self, source):
-        pass
+    def _invert(self, columns, mask):
+        return ~mask
 
-    def _between_offsets(self, source, start_offset, stop_offset):
+    def _between_offsets(self, columns, mask, start_offset, stop_offset):
+        start_offsets, stop_offsets = columns["start_offset"], columns["stop_offset"]
         if start_offset is None and stop_offset is not None:
-            for note in source:
-                if note.stop_offset <= stop_offset:
-                    yield note
+            return mask & (stop_offsets <= stop_offset)
         elif start_offset is not None and stop_offset is None:
-            for note in source:
-                if start_offset <= note.start_offset:
-                    yield note
+            return mask & (start_offset <= start_offsets)
         elif start_offset < stop_offset:
-            for note in source:
-                if (
-                    start_offset <= note.start_offset
-                    and note.stop_offset <= stop_offset
-                ):
-                    yield note
+            return (
+                mask & (start_offset <= start_offsets) & (stop_offsets <= stop_offset)
+            )
         elif stop_offset < start_offset:
-            for note in source:
-                if note.stop_offset <= stop_offset or start_offset <= note.start_offset:
-                    yield note
-        else:
-            yield from source
+            return mask & (
+                (stop_offsets <= stop_offset) | (start_offset <= start_offsets)
+            )
+        return mask
 
-    def _between_pitches(self, source, start_pitch, stop_pitch):
+    def _between_pitches(self, columns, mask, start_pitch, stop_pitch):
+        pitches = columns["pitch"]
         if start_pitch is None and stop_pitch is not None:
-            for note in source:
-                if note.pitch <= stop_pitch:
-                    yield note
+            return mask & (pitches <= stop_pitch)
         elif start_pitch is not None and stop_pitch is None:
-            for note in source:
-                if start_pitch <= note.pitch:
-                    yield note
+            return mask & (start_pitch <= pitches)
         elif start_pitch < stop_pitch:
-            for note in source:
-                if start_pitch <= note.pitch <= stop_pitch:
-                    yield note
+            return mask & (start_pitch <= pitches) & (pitches <= stop_pitch)
         elif stop_pitch < start_pitch:
-            for note in source:
-                if note.pitch <= stop_pitch or start_pitch <= note.pitch:
-                    yield note
-        else:
-            yield from source
+            return mask & ((pitches <= stop_pitch) | (start_pitch <= pitches))
+        return mask
 
-    def _with_durations(self, source, durations, operator):
-        pass
+    def _with_durations(self, columns, mask, durations, operator):
+        return mask & self._compare(
+            columns["stop_offset"] - columns["start_offset"], durations, operator
+        )
 
-    def _with_pitches(self, source, pitches, operator):
-        pass
+    def _with_pitches(self, columns, mask, pitches, operator):
+        return mask & self._compare(columns["pitch"], pitches, operator)
 
-    def _with_pitch_classes(self, source, pitch_classes, operator):
-        pass
+    def _with_pitch_classes(self, columns, mask, pitch_classes, operator):
+        return mask & self._compare(
+            numpy.mod(columns["pitch"], 12), numpy.mod(pitch_classes, 12), operator
+        )
+
+    def _validate_operands(self, values, operator):
+        if operator not in self._valid_operators:
+            raise ValueError(operator)
+        if isinstance(values, numbers.Real):
+            return (float(values),)
+        return tuple(float(value) for value in values)
+
+    def _validate_selector(self, selector):
+        if selector._clip is not self._clip:
+            raise ValueError(selector)
+        return selector
 
     def between_offsets(self, start_offset=None, stop_offset=None):
         if start_offset is not None:
             start_offset = float(start_offset)
         if stop_offset is not None:
             stop_offset = float(stop_offset)
-        filter_ = ("between_offsets", start_offset, stop_offset)
-        filters = self._filters + (filter_,)
-        return type(self)(self._clip, filters)
+        return self._with_filter("between_offsets", start_offset, stop_offset)
 
     def between_pitches(self, start_pitch=None, stop_pitch=None):
         if start_pitch is not None:
             start_pitch = float(start_pitch)
         if stop_pitch is not None:
             stop_pitch = float(stop_pitch)
-        filter_ = ("between_pitches", start_pitch, stop_pitch)
-        filters = self._filters + (filter_,)
-        return type(self)(self._clip, filters)
+        return self._with_filter("between_pitches", start_pitch, stop_pitch)
 
     def with_durations(self, durations, operator="=="):
-        pass
+        durations = self._validate_operands(durations, operator)
+        return self._with_filter("with_durations", durations, operator)
 
     def with_pitches(self, pitches, operator="=="):
-        pass
+        pitches = self._validate_operands(pitches, operator)
+        return self._with_filter("with_pitches", pitches, operator)
 
     def with_pitch_classes(self, pitch_classes, operator="=="):
-        pass
+        pitch_classes = self._validate_operands(pitch_classes, operator)
+        return self._with_filter("with_pitch_classes", pitch_classes, operator)
 
-    def delete(self):
-        self._clip.remove_notes(self)
+    async def delete(self):
+        await self._clip._edit_notes(list(self), [])
 
-    def replace(self, notes):
-        self._clip.remove_notes(self)
-        self._clip.add_notes(notes)
+    async def replace(self, notes):
+        await self._clip._edit_notes(list(self), notes)
 
-    def transpose(self, transposition):
-        notes = list(self)
-        self._clip.remove_notes(self)
-        self._clip.add_notes([note.transpose(transposition) for note in notes])
+    async def transpose(self, transposition):
+        await self._edit(pitch_delta=transposition)
 
-    def translate(self, translation):
-        notes = list(self)
-        self._clip.remove_notes(self)
-        self._clip.add_notes(
-            [note.translate(translation, translation) for note in notes]
-        )
+    async def translate(self, translation):
+        await self._edit(start_delta=translation, stop_delta=translation)
 
-    def translate_offsets(self, start_translation=None, stop_translation=None):
-        notes = list(self)
-        self._clip.remove_notes(self)
-        self._clip.add_notes(
-            [note.translate(start_translation, stop_translation) for note in notes]
-        )
+    async def translate_offsets(self, start_translation=None, stop_translation=None):
+        await self._edit(start_delta=start_translation, stop_delta=stop_translation)
@@ -4,7 +4,7 @@ from uuid import UUID, uuid4
 
 from supriya.clocks import Moment
 from supriya.enums import AddAction, DoneAction
-from supriya.synthdefs import SynthDefBuilder
+from supriya.synthdefs import SynthDef, SynthDefBuilder
 from supriya.ugens import Line, Out
 from supriya.utils import locate
 
@@ -296,6 +296,10 @@ class BufferParameter(Allocatable, ParameterObject):
 
 class BusParameter(Allocatable, ParameterObject):
 
+    ### CLASS VARIABLES ###
+
+    _ramp_synthdef: Optional[SynthDef] = None
+
     ### INITIALIZER ###
 
     def __init__(
@@ -383,6 +387,11 @@ class BusParameter(Allocatable, ParameterObject):
         await parameter.set_(data["spec"]["value"])
         return False
 
+    def _free_ramp(self):
+        ramp_proxy = self._node_proxies.pop("ramp", None)
+        if ramp_proxy is not None:
+            ramp_proxy.free()
+
     def _preallocate(self, provider, client):
         self._debug_tree(self, "Pre-Allocating", suffix=f"{hex(id(provider))}")
         self._client = client
@@ -399,10 +408,55 @@ class BusParameter(Allocatable, ParameterObject):
 
     ### PUBLIC METHODS ###
 
-    async def set_(self, value, *, moment: Moment = None):
+    async def ramp(
+        self,
+        start_value,
+        stop_value,
+        total_time: float,
+        *,
+        initial_time: float = 0.0,
+        moment: Optional[Moment] = None,
+    ):
+        """
+        Ramp from ``start_value`` to ``stop_value`` over ``total_time``
+        seconds, starting ``initial_time`` seconds in, on the server.
+
+        Ramps with nothing left to play set the stop value directly.
+        """
+        if initial_time >= total_time:
+            await self.set_(stop_value, moment=moment)
+            return
+        async with self.lock(
+            [self], seconds=moment.seconds if moment is not None else None
+        ):
+            self._free_ramp()
+            self._value = self.spec(stop_value)
+            provider = self.provider
+            if (
+                provider is not None
+                and self.bus_proxy is not None
+                and self.node_proxy is not None
+            ):
+                if BusParameter._ramp_synthdef is None:
+                    BusParameter._ramp_synthdef = self._build_ramp_synthdef()
+                self._node_proxies["ramp"] = provider.add_synth(
+                    add_action=AddAction.ADD_TO_HEAD,
+                    synthdef=BusParameter._ramp_synthdef,
+                    target_node=self.node_proxy,
+                    out=self.bus_proxy,
+                    start_value=self.spec(start_value),
+                    stop_value=self._value,
+                    total_time=total_time,
+                    initial_time=initial_time,
+                )
+            if self.application is not None:
+                self.application.pubsub.publish(ParameterModified(self.uuid))
+
+    async def set_(self, value, *, moment: Optional[Moment] = None):
         async with self.lock(
             [self], seconds=moment.seconds if moment is not None else None
         ):
+            self._free_ramp()
             self._value = self.spec(value)
             if self.bus_proxy is not None:
                 self.bus_proxy.set_(self._value)
@@ -109,7 +109,7 @@ class Patch(SendObject):
         return dict(
             application=self.application,
             feedback=self.feedback,
-            index=self.parent.index(self) if self.parent else None,
+            index=self._get_index(),
             parent=self.parent,
             source=self.effective_source,
             source_anchor=self.source_anchor,
@@ -128,6 +128,7 @@ class Patch(SendObject):
         target_node: Optional[NodeProxy] = None,
         add_action: Optional[int] = None,
         dispose_only: bool = False,
+        propagate: bool = False,
         **kwargs,
     ):
         difference = self._get_state_difference()
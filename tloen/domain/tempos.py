@@ -0,0 +1,180 @@
+import bisect
+import dataclasses
+import math
+from typing import Dict, List, Optional, Tuple
+
+from supriya.clocks import Moment
+
+
+@dataclasses.dataclass(frozen=True)
+class TempoSegment:
+    """
+    A span of constant tempo and meter, from ``offset`` to the next segment.
+
+    Measures count from ``meter_offset``, the segment's most recent meter
+    change, which is numbered ``meter_measure``.
+    """
+
+    offset: float
+    seconds: float
+    beats_per_minute: float
+    time_signature: Tuple[int, int]
+    meter_offset: float = 0.0
+    meter_measure: int = 1
+
+    def offset_to_seconds(self, offset: float) -> float:
+        return self.seconds + (offset - self.offset) * self.seconds_per_whole_note
+
+    def seconds_to_offset(self, seconds: float) -> float:
+        return self.offset + (seconds - self.seconds) / self.seconds_per_whole_note
+
+    @property
+    def measure_duration(self) -> float:
+        return self.time_signature[0] / self.time_signature[1]
+
+    @property
+    def seconds_per_whole_note(self) -> float:
+        return 60 / self.beats_per_minute * self.time_signature[1]
+
+
+class TempoMap:
+    """
+    Piecewise tempo and meter, by offset in whole notes from the start of the
+    arrangement.
+
+    Segments and their cumulative start times are recomputed on every change,
+    so converting between offsets and seconds is a bisect.
+    """
+
+    def __init__(self, beats_per_minute: float = 120.0, time_signature=(4, 4)):
+        self._changes: Dict[
+            float, Tuple[Optional[float], Optional[Tuple[int, int]]]
+        ] = {}
+        self._offsets: List[float] = []
+        self._seconds: List[float] = []
+        self._segments: List[TempoSegment] = []
+        self.set_change(
+            0.0, beats_per_minute=beats_per_minute, time_signature=time_signature
+        )
+
+    def __len__(self):
+        return len(self._segments)
+
+    def _rebuild(self):
+        segments: List[TempoSegment] = []
+        for offset in sorted(self._changes):
+            beats_per_minute, time_signature = self._changes[offset]
+            if not segments:
+                segments.append(
+                    TempoSegment(offset, 0.0, beats_per_minute, time_signature)
+                )
+                continue
+            previous = segments[-1]
+            meter_offset, meter_measure = previous.meter_offset, previous.meter_measure
+            if time_signature is not None and time_signature != previous.time_signature:
+                # a partial measure before the change still counts as a measure
+                meter_measure += math.ceil(
+                    (offset - meter_offset) / previous.measure_duration
+                )
+                meter_offset = offset
+            segments.append(
+                TempoSegment(
+                    offset=offset,
+                    seconds=previous.offset_to_seconds(offset),
+                    beats_per_minute=beats_per_minute or previous.beats_per_minute,
+                    time_signature=time_signature or previous.time_signature,
+                    meter_offset=meter_offset,
+                    meter_measure=meter_measure,
+                )
+            )
+        self._segments = segments
+        self._offsets = [segment.offset for segment in segments]
+        self._seconds = [segment.seconds for segment in segments]
+
+    def _serialize(self):
+        serialized = []
+        for offset, (beats_per_minute, time_signature) in sorted(self._changes.items()):
+            if not offset:
+                continue
+            change = {"offset": offset}
+            if beats_per_minute is not None:
+                change["tempo"] = beats_per_minute
+            if time_signature is not None:
+                change["time_signature"] = list(time_signature)
+            serialized.append(change)
+        return serialized
+
+    def get_segment(self, offset: float) -> TempoSegment:
+        """
+        Get the segment in effect at ``offset``.
+
+        The first segment extends back before the start of the arrangement.
+        """
+        return self._segments[max(bisect.bisect_right(self._offsets, offset) - 1, 0)]
+
+    def get_segments_after(self, offset: float) -> List[TempoSegment]:
+        return self._segments[bisect.bisect_right(self._offsets, offset) :]
+
+    def offset_to_moment(self, offset: float) -> Moment:
+        segment = self.get_segment(offset)
+        measure, measure_offset = divmod(
+            offset - segment.meter_offset, segment.measure_duration
+        )
+        return Moment(
+            beats_per_minute=segment.beats_per_minute,
+            measure=int(measure) + segment.meter_measure,
+            measure_offset=measure_offset,
+            offset=offset,
+            seconds=segment.offset_to_seconds(offset),
+            time_signature=segment.time_signature,
+        )
+
+    def offset_to_seconds(self, offset: float) -> float:
+        return self.get_segment(offset).offset_to_seconds(offset)
+
+    def remove_change(self, offset: float):
+        if not offset or offset not in self._changes:
+            raise ValueError(offset)
+        del self._changes[offset]
+        self._rebuild()
+
+    def seconds_to_offset(self, seconds: float) -> float:
+        index = max(bisect.bisect_right(self._seconds, seconds) - 1, 0)
+        return self._segments[index].seconds_to_offset(seconds)
+
+    def set_change(
+        self,
+        offset: float,
+        *,
+        beats_per_minute: Optional[float] = None,
+        time_signature: Optional[Tuple[int, int]] = None,
+    ):
+        """
+        Change tempo, meter or both at ``offset``.
+
+        Whatever a change leaves out carries over from the segment before it.
+        """
+        if offset < 0:
+            raise ValueError(offset)
+        if beats_per_minute is not None:
+            if beats_per_minute <= 0:
+                raise ValueError(beats_per_minute)
+            beats_per_minute = float(beats_per_minute)
+        if time_signature is not None:
+            numerator, denominator = (int(x) for x in time_signature)
+            if numerator <= 0 or denominator <= 0:
+                raise ValueError(time_signature)
+            time_signature = (numerator, denominator)
+        offset = float(offset)
+        old_beats_per_minute, old_time_signature = self._changes.get(
+            offset, (None, None)
+        )
+        self._changes[offset] = (
+            beats_per_minute or old_beats_per_minute,
+            time_signature or old_time_signature,
+        )
+        self._rebuild()
+
+    @property
+    def segments(self) -> Tuple[TempoSegment, ...]:
+        return tuple(self._segments)
@@ -1,7 +1,7 @@
 import abc
 import logging
 from types import MappingProxyType
-from typing import Dict, Mapping, Optional, Set, Type, Union
+from typing import Dict, Mapping, Optional, Set, Tuple, Type, Union
 from uuid import UUID, uuid4
 
 from supriya.enums import AddAction, CalculationRate
@@ -17,7 +17,7 @@ from .bases import (
     Mixer,
     Performable,
 )
-from .clips import ClipLaunched, Scene, Slot
+from .clips import Clip, ClipLaunched, EnvelopeSegment, Scene, Slot, Timeline
 from .devices import DeviceObject
 from .parameters import BusParameter, Float, ParameterGroup, ParameterObject
 from .sends import Receive, Send, Target
@@ -202,6 +202,10 @@ class TrackObject(Allocatable, Performable):
             procedure=lambda osc_message: self._update_levels("postfader", osc_message),
         )
 
+    def _compile_next_performer(self):
+        # Tracks are performed individually, so their output goes nowhere
+        return None
+
     def _deactivate(self):
         Allocatable._deactivate(self)
         if not self.provider:
@@ -209,7 +213,7 @@ class TrackObject(Allocatable, Performable):
         self.node_proxies["output"]["active"] = 0
 
     def _perform_input(self, moment, midi_messages):
-        next_perform, midi_messages = Performable._perform_input(
+        next_performer, midi_messages = Performable._perform_input(
             self, moment, midi_messages,
         )
         if self.devices:
@@ -368,10 +372,7 @@ class TrackObject(Allocatable, Performable):
 
     @property
     def mixer(self) -> Optional[Mixer]:
-        for parent in self.parentage:
-            if isinstance(parent, Mixer):
-                return parent
-        return None
+        return self._get_ancestor(Mixer, include_self=True)
 
     @property
     def parameters(self) -> Mapping[str, ParameterObject]:
@@ -554,11 +555,12 @@ class Track(UserTrackObject):
         )
         self._active_slot_index: Optional[int] = None
         self._clip_launch_event_id: Optional[int] = None
-        self._clip_perform_event_id: Optional[int] = None
+        self._envelope_segments: Dict[UUID, EnvelopeSegment] = {}
         self._pending_slot_index: Optional[int] = None
         self._slots = Container(label="Slots")
+        self._timeline = Timeline()
         self._tracks = TrackContainer("input", AddAction.ADD_AFTER, label="SubTracks")
-        self._mutate(slice(1, 1), [self._slots, self._tracks])
+        self._mutate(slice(1, 1), [self._slots, self._timeline, self._tracks])
 
     ### PRIVATE METHODS ###
 
@@ -572,79 +574,51 @@ class Track(UserTrackObject):
     def _cleanup(self):
         Track._update_activation(self)
 
-    async def _clip_launch_callback(self, clock_context):
-        self._debug_tree(
-            self,
-            "Launch/CB",
-            suffix="{} {}".format(
-                self._pending_slot_index, clock_context.desired_moment.offset
-            ),
-        )
-        self._clip_launch_event_id = None
-        # if a clip is active, perform note offs
-        if self._active_slot_index is not None:
-            midi_messages = [
-                NoteOffMessage(pitch=pitch) for pitch in self._input_pitches
-            ]
-            if midi_messages:
-                await self.perform(midi_messages, moment=clock_context.desired_moment)
-            self.slots[self._active_slot_index].clip._is_playing = False
-            self.slots[self._active_slot_index].clip._start_delta = 0.0
-        # if pending clip is null-ish, null out variables
-        if (
-            self._pending_slot_index is None
-            or (
-                self._pending_slot_index is not None
-                and not (0 <= self._pending_slot_index < len(self.slots))
-            )
-            or self.slots[self._pending_slot_index].clip is None
-        ):
-            self._active_slot_index = None
-            self._pending_slot_index = None
-            self._debug_tree(self, "Launch/CB", suffix="Bailing")
-            return
-        # set variables to new clip
-        self._active_slot_index = self._pending_slot_index
-        self.slots[self._active_slot_index].clip._is_playing = True
-        self.slots[
-            self._active_slot_index
-        ].clip._start_delta = clock_context.desired_moment.offset
-        # schedule perform callback
-        if self._clip_perform_event_id is not None:
-            await self.transport.cancel(self._clip_perform_event_id)
-        self._clip_perform_event_id = await self.transport.schedule(
-            self._clip_perform_callback,
-            schedule_at=clock_context.desired_moment.offset,
-            event_type=self.transport.EventType.CLIP_PERFORM,
-        )
-        self.application.pubsub.publish(
-            ClipLaunched(clip_uuid=self.slots[self._active_slot_index].clip.uuid),
-        )
-
-    async def _clip_perform_callback(self, clock_context):
-        self._debug_tree(self, "Perform/CB", suffix=str(self._active_slot_index))
-        if self._active_slot_index is None:
-            return None
-        clip = self.slots[self._active_slot_index].clip
-        note_moment = clip.at(
-            clock_context.desired_moment.offset, start_delta=clip._start_delta
-        )
-        input_pitches = sorted(self._input_pitches)
-        midi_messages = []
-        for midi_message in note_moment.note_off_messages:
-            midi_messages.append(midi_message)
-            if midi_message.pitch in input_pitches:
-                input_pitches.remove(midi_message.pitch)
-        overlap_pitches = set(_.pitch for _ in note_moment.overlap_notes or [])
-        for input_pitch in input_pitches:
-            if input_pitch not in overlap_pitches:
+    def _compute_clip_performances(self, offset, stop_offset=None):
+        """
+        Compute the active clip's MIDI messages and changed envelope segments
+        at each note or envelope boundary from ``offset`` up to
+        ``stop_offset``, or at ``offset`` alone.
+
+        Returns the offset, messages and segments of each boundary with
+        anything to perform, and the offset of the first boundary not computed.
+        """
+        input_pitches = set(self._input_pitches)
+        performances = []
+        while True:
+            clip, start_delta, next_offset = self._get_clip_at(offset)
+            envelope_segments, midi_messages, overlap_pitches = [], [], set()
+            if clip is not None:
+                note_moment = clip.at(offset, start_delta=start_delta)
+                if clip._envelopes:
+                    segments, envelope_offset = clip.get_envelope_segments(
+                        offset, start_delta=start_delta
+                    )
+                    for segment in segments:
+                        if (
+                            self._envelope_segments.get(segment.parameter_uuid)
+                            != segment
+                        ):
+                            self._envelope_segments[segment.parameter_uuid] = segment
+                            envelope_segments.append(segment)
+                    next_offset = _min_offset(next_offset, envelope_offset)
+                for midi_message in note_moment.note_off_messages:
+                    midi_messages.append(midi_message)
+                    input_pitches.discard(midi_message.pitch)
+                overlap_pitches.update(_.pitch for _ in note_moment.overlap_notes or [])
+                next_offset = _min_offset(next_offset, note_moment.next_offset)
+            for input_pitch in sorted(input_pitches - overlap_pitches):
                 midi_messages.append(NoteOffMessage(pitch=input_pitch))
-        midi_messages.extend(note_moment.note_on_messages)
-        if midi_messages:
-            await self.perform(midi_messages, clock_context.desired_moment)
-        if note_moment.next_offset is None:
-            return None
-        return note_moment.next_offset - clock_context.desired_moment.offset
+            input_pitches &= overlap_pitches
+            if clip is not None:
+                for midi_message in note_moment.note_on_messages:
+                    midi_messages.append(midi_message)
+                    input_pitches.add(midi_message.pitch)
+            if midi_messages or envelope_segments:
+                performances.append((offset, midi_messages, envelope_segments))
+            offset = next_offset
+            if offset is None or stop_offset is None or offset >= stop_offset:
+                return performances, offset
 
     @classmethod
     async def _deserialize(cls, data, application) -> bool:
@@ -671,17 +645,61 @@ class Track(UserTrackObject):
         if not self.application:
             return
         self._debug_tree(self, "Firing", suffix=str(slot_index))
-        self._pending_slot_index = slot_index
-        transport = self.transport
-        await transport.cancel(self._clip_launch_event_id)
-        self._clip_launch_event_id = await transport.cue(
-            self._clip_launch_callback,
-            # TODO: Get default quantization from transport itself
-            quantization=quantization or "1M",
-            event_type=transport.EventType.CLIP_LAUNCH,
+        await self.transport._cue_clip_launch({self: slot_index}, quantization)
+
+    def _get_clip_at(self, offset) -> Tuple[Optional[Clip], float, Optional[float]]:
+        """
+        Get the clip sounding at ``offset``, its start delta, and the offset at
+        which the timeline next changes, if playing the timeline.
+
+        The active slot's clip overrides the timeline.
+        """
+        if self._active_slot_index is not None:
+            clip = self.slots[self._active_slot_index].clip
+            return clip, clip._start_delta, None
+        if not self._timeline.is_playing:
+            return None, 0.0, None
+        arrangement_delta = self.transport._arrangement_delta
+        arrangement_offset = offset - arrangement_delta
+        next_offset = self._timeline.get_offset_after(arrangement_offset)
+        if next_offset is not None:
+            next_offset += arrangement_delta
+        instance = self._timeline.get_instance_at(arrangement_offset)
+        if instance is None:
+            return None, 0.0, next_offset
+        return (
+            self._timeline.get_clip(instance.clip_uuid),
+            instance.start_delta + arrangement_delta,
+            next_offset,
         )
-        if not transport.is_running:
-            await transport.start()
+
+    def _launch_clip(self, offset) -> Optional[ClipLaunched]:
+        """
+        Switch to the pending slot's clip at ``offset``, if any.
+        """
+        self._debug_tree(
+            self, "Launch/CB", suffix="{} {}".format(self._pending_slot_index, offset)
+        )
+        self._envelope_segments.clear()
+        if self._active_slot_index is not None:
+            self.slots[self._active_slot_index].clip._is_playing = False
+            self.slots[self._active_slot_index].clip._start_delta = 0.0
+        # if pending clip is null-ish, null out variables
+        if (
+            self._pending_slot_index is None
+            or not (0 <= self._pending_slot_index < len(self.slots))
+            or self.slots[self._pending_slot_index].clip is None
+        ):
+            self._active_slot_index = None
+            self._pending_slot_index = None
+            self._debug_tree(self, "Launch/CB", suffix="Bailing")
+            return None
+        # set variables to new clip
+        self._active_slot_index = self._pending_slot_index
+        clip = self.slots[self._active_slot_index].clip
+        clip._is_playing = True
+        clip._start_delta = offset
+        return ClipLaunched(clip_uuid=clip.uuid)
 
     @classmethod
     def _recurse_activation(
@@ -723,6 +741,10 @@ class Track(UserTrackObject):
             slot_entities = slot._serialize()
             auxiliary_entities.append(slot_entities[0])
             auxiliary_entities.extend(slot_entities[1])
+        if len(self.timeline) or self.timeline.instances:
+            timeline_entities = self.timeline._serialize()
+            auxiliary_entities.append(timeline_entities[0])
+            auxiliary_entities.extend(timeline_entities[1])
         for track in self.tracks:
             serialized["spec"]["tracks"].append(str(track.uuid))
             track_entities = track._serialize()
@@ -746,6 +768,11 @@ class Track(UserTrackObject):
                 if isinstance(node, (UserTrackObject, Context)):
                     node._soloed_tracks.add(self)
 
+    def _set_timeline(self, timeline):
+        index = self.index(self._timeline)
+        self._mutate(slice(index, index + 1), [timeline])
+        self._timeline = timeline
+
     @classmethod
     def _update_activation(cls, object_):
         from .contexts import Context
@@ -867,11 +894,20 @@ class Track(UserTrackObject):
     def slots(self):
         return self._slots
 
+    @property
+    def timeline(self) -> Timeline:
+        return self._timeline
+
     @property
     def tracks(self) -> "TrackContainer":
         return self._tracks
 
 
+def _min_offset(*offsets: Optional[float]) -> Optional[float]:
+    known_offsets = [offset for offset in offsets if offset is not None]
+    return min(known_offsets) if known_offsets else None
+
+
 class TrackContainer(AllocatableContainer):
     def _collect_for_cleanup(self, new_items, old_items):
         items = set()
@@ -884,7 +920,4 @@ class TrackContainer(AllocatableContainer):
 
     @property
     def mixer(self) -> Optional["tloen.domain.Context"]:
-        for parent in self.parentage:
-            if isinstance(parent, tloen.domain.Context):
-                return parent
-        return None
+        return self._get_ancestor(tloen.domain.Context, include_self=True)
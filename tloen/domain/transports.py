@@ -1,13 +1,22 @@
 import asyncio
+import bisect
+import copy
 import dataclasses
 import enum
-from typing import Dict, Optional, Set, Tuple
+import heapq
+import inspect
+import itertools
+import time
+from typing import Dict, List, Optional, Set, Tuple
 
 from supriya.clocks import AsyncTempoClock, Moment
 
+from tloen.midi import NoteOffMessage, NoteOnMessage
+
 from ..bases import Event
-from .bases import ApplicationObject
-from .parameters import ParameterGroup, ParameterObject
+from .bases import Allocatable, ApplicationObject
+from .parameters import BusParameter, ParameterGroup, ParameterObject
+from .tempos import TempoMap
 
 
 class Transport(ApplicationObject):
@@ -30,10 +39,33 @@ class Transport(ApplicationObject):
         ApplicationObject.__init__(self)
         self._parameter_group = ParameterGroup()
         self._parameters: Dict[str, ParameterObject] = {}
+        self._arrangement_delta: Optional[float] = None
+        self._bundle_statistics = BundleStatistics()
+        self._arrangement_offset = 0.0
         self._clock = AsyncTempoClock()
+        self._clip_counter = itertools.count()
+        self._clip_edit_window = 0.0
+        self._clip_entries: Dict[ApplicationObject, Tuple] = {}
+        self._clip_event_id: Optional[int] = None
+        self._clip_event_offset: Optional[float] = None
+        self._clip_horizons: Dict[ApplicationObject, float] = {}
+        self._clip_launches: Dict[int, Dict[ApplicationObject, None]] = {}
+        self._clip_lookahead: Optional[float] = None
+        self._clip_pitch_offsets: Dict[ApplicationObject, Dict[float, float]] = {}
+        self._clip_queue: List[Tuple] = []
+        self._is_performing_clips = False
+        self._latency = 0.0
+        self._metrics: Dict[Transport.EventType, EventMetrics] = {}
+        self._metrics_interval = 1.0
+        self._metrics_task: Optional[asyncio.Task] = None
         self._dependencies: Set[ApplicationObject] = set()
         self._mutate(slice(None), [self._parameter_group])
+        self._tempo_event_ids: List[int] = []
+        self._tempo_map = TempoMap()
         self._tick_event_id = None
+        self._tick_moment: Optional[Moment] = None
+        self._tick_rate = 30.0
+        self._tick_task: Optional[asyncio.Task] = None
 
     ### PRIVATE METHODS ###
 
@@ -42,28 +74,455 @@ class Transport(ApplicationObject):
             [midi_message], moment=clock_context.current_moment
         )
 
+    def _compensate_latency(self, seconds: float) -> Optional[float]:
+        """
+        Get the bundle timestamp for ``seconds``, or None outside realtime.
+
+        The clock's timeline runs ahead of the server's by the latency, so
+        callbacks fire early and their bundles land at the exact time.
+        """
+        if (
+            self.application is None
+            or self.application.status != self.application.Status.REALTIME
+        ):
+            return None
+        return seconds + self._latency
+
+    async def _clip_launch_callback(self, clock_context, tracks):
+        """
+        Launch every track in ``tracks`` into its pending slot.
+
+        Note offs for tracks stopping, and the first clip events of tracks
+        launching, are performed together, in one bundle per provider.
+        """
+        desired_moment = clock_context.desired_moment
+        if not tracks:
+            return
+        self._clip_launches.pop(next(iter(tracks))._clip_launch_event_id, None)
+        events, midi_messages_by_track, playing_tracks = [], {}, []
+        for track in tuple(tracks):
+            track._clip_launch_event_id = None
+            if track.application is not self.application:
+                continue
+            await self._cut_clip(track, desired_moment.offset)
+            was_playing = (
+                track._active_slot_index is not None or track.timeline.is_playing
+            )
+            event = track._launch_clip(desired_moment.offset)
+            if event is not None:
+                events.append(event)
+            # fall back to the timeline, if any
+            if track._active_slot_index is not None or track.timeline.is_playing:
+                playing_tracks.append(track)
+                continue
+            self._unschedule_clip(track)
+            if was_playing:
+                midi_messages_by_track[track] = [
+                    NoteOffMessage(pitch=pitch) for pitch in track._input_pitches
+                ]
+        self._is_performing_clips = True
+        try:
+            await self._perform_clips(
+                playing_tracks, desired_moment, midi_messages_by_track
+            )
+        finally:
+            self._is_performing_clips = False
+        await self._schedule_clip_event()
+        for event in events:
+            self.application.pubsub.publish(event)
+
+    async def _clip_perform_callback(self, clock_context):
+        desired_moment = clock_context.desired_moment
+        self._is_performing_clips = True
+        try:
+            while self._clip_queue and self._clip_queue[0][0] <= desired_moment.offset:
+                await self._perform_clips(
+                    self._pop_due_clips(desired_moment.offset), desired_moment
+                )
+        finally:
+            self._is_performing_clips = False
+        if not self._clip_queue:
+            self._clip_event_id = self._clip_event_offset = None
+            return None
+        self._clip_event_offset = self._clip_queue[0][0]
+        return self._clip_event_offset - desired_moment.offset
+
+    async def _cue_clip_launch(self, slot_indices, quantization=None):
+        """
+        Cue one launch of each track in ``slot_indices`` into its slot index.
+        """
+        tracks = dict.fromkeys(slot_indices)
+        for track, slot_index in slot_indices.items():
+            track._pending_slot_index = slot_index
+            await self._uncue_clip_launch(track)
+        event_id = await self.cue(
+            self._clip_launch_callback,
+            # TODO: Get default quantization from transport itself
+            quantization=quantization or "1M",
+            event_type=self.EventType.CLIP_LAUNCH,
+            args=[tracks],
+        )
+        self._clip_launches[event_id] = tracks
+        for track in tracks:
+            track._clip_launch_event_id = event_id
+        if not self.is_running:
+            await self.start()
+
+    async def _cut_clip(self, track, offset):
+        """
+        Cut ``track``'s clip events performed ahead back to ``offset``.
+
+        Bundles already sent can't be recalled, so pitches they turn on after
+        ``offset``, and leave on, are turned off again as soon as they start.
+        """
+        horizon = self._clip_horizons.pop(track, None)
+        pitch_offsets = self._clip_pitch_offsets.pop(track, {})
+        if horizon is None or horizon <= offset:
+            return
+        pitches_by_offset: Dict[float, List[float]] = {}
+        for pitch, pitch_offset in sorted(pitch_offsets.items()):
+            if pitch_offset > offset and pitch in track._input_pitches:
+                pitches_by_offset.setdefault(pitch_offset, []).append(pitch)
+        for pitch_offset, pitches in sorted(pitches_by_offset.items()):
+            moment = self._offset_to_moment(pitch_offset)
+            async with Allocatable.lock([track], seconds=moment.seconds):
+                await track.perform(
+                    [NoteOffMessage(pitch=pitch) for pitch in pitches], moment
+                )
+
     @classmethod
     async def _deserialize(cls, data, transport_object):
         await transport_object.set_tempo(data["spec"]["tempo"])
         await transport_object.set_time_signature(*data["spec"]["time_signature"])
+        for change in data["spec"].get("tempo_changes", []):
+            await transport_object.set_tempo_change(
+                change["offset"],
+                beats_per_minute=change.get("tempo"),
+                time_signature=change.get("time_signature"),
+            )
+
+    def _get_current_offset(self) -> float:
+        return self._clock._seconds_to_offset(self._clock.get_current_time())
+
+    def _instrument(self, procedure, event_type):
+        """
+        Wrap ``procedure`` to record its lateness and execution time.
+        """
+        event_type = self.EventType(
+            event_type if event_type is not None else self.EventType.SCHEDULE
+        )
+
+        async def instrumented_procedure(clock_context, *args, **kwargs):
+            lateness = (
+                clock_context.current_moment.seconds
+                - clock_context.desired_moment.seconds
+            )
+            start_time = time.perf_counter()
+            try:
+                result = procedure(clock_context, *args, **kwargs)
+                if inspect.isawaitable(result):
+                    result = await result
+                return result
+            finally:
+                # failing procedures are measured too
+                metrics = self._metrics.get(event_type)
+                if metrics is None:
+                    metrics = self._metrics[event_type] = EventMetrics()
+                metrics.lateness.add(lateness)
+                metrics.duration.add(time.perf_counter() - start_time)
+
+        return instrumented_procedure
+
+    def _offset_to_moment(self, offset: float) -> Moment:
+        """
+        Get the clock's moment at ``offset``, timed by the tempo map.
+
+        The clock only knows its current tempo, so moments past the next tempo
+        change take their time and meter from the tempo map instead.
+        """
+        moment = self._clock._offset_to_moment(offset)
+        if self._arrangement_delta is None or len(self._tempo_map) == 1:
+            return moment
+        delta = self._arrangement_delta
+        anchor = self._tempo_map.get_segment(self._get_current_offset() - delta)
+        segment = self._tempo_map.get_segment(offset - delta)
+        if segment is anchor:
+            return moment
+        mapped_moment = self._tempo_map.offset_to_moment(offset - delta)
+        seconds = (
+            self._clock._offset_to_seconds(anchor.offset + delta)
+            + mapped_moment.seconds
+            - anchor.seconds
+        )
+        return moment._replace(
+            beats_per_minute=mapped_moment.beats_per_minute,
+            measure=mapped_moment.measure,
+            measure_offset=mapped_moment.measure_offset,
+            seconds=seconds,
+            time_signature=mapped_moment.time_signature,
+        )
+
+    async def _perform_envelope_segment(self, segment, moment):
+        parameter = self.application.registry.get(segment.parameter_uuid)
+        if not isinstance(parameter, BusParameter):
+            return
+        start_seconds = self._offset_to_moment(segment.start_offset).seconds
+        total_time = 0.0
+        if segment.stop_offset is not None:
+            total_time = (
+                self._offset_to_moment(segment.stop_offset).seconds - start_seconds
+            )
+        await parameter.ramp(
+            segment.start_value,
+            segment.stop_value,
+            total_time,
+            initial_time=max(moment.seconds - start_seconds, 0.0),
+            moment=moment,
+        )
+
+    async def _perform_clips(self, tracks, desired_moment, midi_messages_by_track=None):
+        """
+        Perform ``tracks``' clips from ``desired_moment`` up to the clip
+        lookahead, in one bundle per provider per offset.
+
+        ``midi_messages_by_track`` are performed first, at ``desired_moment``.
+        With a lookahead, each track's horizon, and the offsets of the pitches
+        turned on up to it, are kept for ``_cut_clip``.
+        """
+        stop_offset = None
+        if self._clip_lookahead is not None:
+            stop_offset = desired_moment.offset + self._clip_lookahead
+        performances_by_offset: Dict[float, List[Tuple]] = {
+            desired_moment.offset: [
+                (track, midi_messages, ())
+                for track, midi_messages in (midi_messages_by_track or {}).items()
+            ]
+        }
+        for track in tracks:
+            track._debug_tree(track, "Perform/CB", suffix=str(track._active_slot_index))
+            performances, next_offset = track._compute_clip_performances(
+                desired_moment.offset, stop_offset
+            )
+            if stop_offset is not None:
+                self._clip_horizons[track] = stop_offset
+                pitch_offsets = self._clip_pitch_offsets.setdefault(track, {})
+            for offset, midi_messages, envelope_segments in performances:
+                performances_by_offset.setdefault(offset, []).append(
+                    (track, midi_messages, envelope_segments)
+                )
+                if stop_offset is None:
+                    continue
+                for midi_message in midi_messages:
+                    if isinstance(midi_message, NoteOnMessage):
+                        pitch_offsets[midi_message.pitch] = offset
+            if next_offset is not None:
+                self._push_clip(track, next_offset)
+            else:
+                self._unschedule_clip(track)
+        for offset, performances in sorted(performances_by_offset.items()):
+            if not performances:
+                continue
+            moment = desired_moment
+            if offset != desired_moment.offset:
+                moment = self._offset_to_moment(offset)
+            # one bundle per provider for every track due at this offset
+            async with Allocatable.lock(
+                [track for track, _, _ in performances], seconds=moment.seconds
+            ):
+                for track, midi_messages, envelope_segments in performances:
+                    if midi_messages:
+                        await track.perform(midi_messages, moment)
+                    for segment in envelope_segments:
+                        await self._perform_envelope_segment(segment, moment)
+
+    def _pop_due_clips(self, offset):
+        tracks = []
+        while self._clip_queue and self._clip_queue[0][0] <= offset:
+            entry = heapq.heappop(self._clip_queue)
+            track = entry[2]
+            if self._clip_entries.get(track) is not entry:
+                continue  # superseded or unscheduled
+            del self._clip_entries[track]
+            if track.application is not self.application or (
+                track._active_slot_index is None and not track.timeline.is_playing
+            ):
+                continue
+            tracks.append(track)
+        self._prune_clip_queue()
+        return tracks
+
+    def _prune_clip_queue(self):
+        while (
+            self._clip_queue
+            and self._clip_entries.get(self._clip_queue[0][2])
+            is not self._clip_queue[0]
+        ):
+            heapq.heappop(self._clip_queue)
+
+    async def _publish_metrics(self):
+        while True:
+            await asyncio.sleep(self._metrics_interval)
+            if self.application is not None:
+                self.application.pubsub.publish(TransportMeasured(self.metrics))
+
+    async def _publish_ticks(self):
+        """
+        Publish the latest tick, at most once per frame, until none remain.
+        """
+        try:
+            while self._tick_moment is not None:
+                moment, self._tick_moment = self._tick_moment, None
+                position = None
+                if self._arrangement_delta is not None:
+                    position = self._tempo_map.offset_to_moment(
+                        moment.offset - self._arrangement_delta
+                    )
+                if self.application is not None:
+                    self.application.pubsub.publish(TransportTicked(moment, position))
+                await asyncio.sleep(1 / self._tick_rate)
+        finally:
+            if self._tick_task is asyncio.current_task():
+                self._tick_task = None
+
+    def _record_bundles(self, timestamp: float, count: int):
+        lateness = self._clock.get_current_time() - timestamp
+        statistics = self._bundle_statistics
+        statistics.count += count
+        if lateness > 0:
+            statistics.late_count += count
+            statistics.max_lateness = max(statistics.max_lateness, lateness)
+
+    def _push_clip(self, track, offset):
+        entry = (offset, next(self._clip_counter), track)
+        self._clip_entries[track] = entry
+        heapq.heappush(self._clip_queue, entry)
+
+    async def _schedule_clip(self, track, offset: Optional[float] = None):
+        """
+        Schedule ``track``'s active clip to perform at ``offset``, or now.
+
+        Without an offset, a track already performed ahead resumes from its
+        horizon, so nothing is performed twice.
+        """
+        if offset is None:
+            offset = self._get_current_offset()
+            offset = max(offset, self._clip_horizons.get(track, offset))
+        self._push_clip(track, offset)
+        if self._is_performing_clips:
+            return  # the running callback reschedules from the queue
+        await self._schedule_clip_event()
+
+    async def _schedule_clip_event(self):
+        """
+        Schedule the clip perform event at the earliest queued clip offset.
+        """
+        if not self._clip_queue:
+            return
+        offset = self._clip_queue[0][0]
+        if self._clip_event_id is not None:
+            if offset >= self._clip_event_offset:
+                return
+            if (
+                await self.reschedule(self._clip_event_id, schedule_at=offset)
+                is not None
+            ):
+                self._clip_event_offset = offset
+                return
+        self._clip_event_id = await self.schedule(
+            self._clip_perform_callback,
+            schedule_at=offset,
+            event_type=self.EventType.CLIP_PERFORM,
+        )
+        self._clip_event_offset = offset
+
+    async def _schedule_tempo_changes(self):
+        """
+        Set the clock to the tempo map at the playhead, and schedule the
+        changes after it.
+        """
+        for event_id in self._tempo_event_ids:
+            await self.cancel(event_id)
+        self._tempo_event_ids.clear()
+        offset = self.arrangement_offset
+        segment = self._tempo_map.get_segment(offset)
+        if (
+            self._clock.beats_per_minute != segment.beats_per_minute
+            or tuple(self._clock.time_signature) != segment.time_signature
+        ):
+            self._clock.change(
+                beats_per_minute=segment.beats_per_minute,
+                time_signature=segment.time_signature,
+            )
+        if self._arrangement_delta is None:
+            return
+        for segment in self._tempo_map.get_segments_after(offset):
+            self._tempo_event_ids.append(
+                self._clock.schedule_change(
+                    beats_per_minute=segment.beats_per_minute,
+                    schedule_at=segment.offset + self._arrangement_delta,
+                    time_signature=segment.time_signature,
+                )
+            )
+
+    async def _schedule_timelines(self):
+        from .clips import Timeline
+
+        for timeline in self.application.find(Timeline):
+            if timeline.is_playing:
+                offset = self._get_current_offset()
+                timeline.track._envelope_segments.clear()
+                await self._cut_clip(timeline.track, offset)
+                await self._schedule_clip(timeline.track, offset)
 
     def _serialize(self):
-        return {
-            "kind": type(self).__name__,
-            "spec": {
-                "tempo": self._clock.beats_per_minute,
-                "time_signature": list(self._clock.time_signature),
-            },
+        segment = self._tempo_map.segments[0]
+        spec = {
+            "tempo": segment.beats_per_minute,
+            "time_signature": list(segment.time_signature),
         }
+        if len(self._tempo_map) > 1:
+            spec["tempo_changes"] = self._tempo_map._serialize()
+        return {"kind": type(self).__name__, "spec": spec}
 
     def _tick_callback(self, clock_context):
-        self.application.pubsub.publish(TransportTicked(clock_context.desired_moment))
+        # publish from the event loop, never from the clock callback itself
+        self._tick_moment = clock_context.desired_moment
+        if self._tick_task is None:
+            self._tick_task = asyncio.get_running_loop().create_task(
+                self._publish_ticks()
+            )
         return 1 / clock_context.desired_moment.time_signature[1] / 4
 
+    async def _uncue_clip_launch(self, track):
+        event_id = track._clip_launch_event_id
+        track._clip_launch_event_id = None
+        tracks = self._clip_launches.get(event_id)
+        if tracks is None:
+            return
+        tracks.pop(track, None)
+        if not tracks:
+            del self._clip_launches[event_id]
+            await self.cancel(event_id)
+
+    def _unschedule_clip(self, track):
+        self._clip_entries.pop(track, None)
+        self._prune_clip_queue()
+
     ### PUBLIC METHODS ###
 
-    async def cue(self, *args, **kwargs) -> int:
-        return self._clock.cue(*args, **kwargs)
+    async def advance(self, seconds: float):
+        """
+        Advance a virtual transport's clock by ``seconds``, performing every
+        event due by then.
+        """
+        if not self.is_virtual:
+            raise ValueError("Transport is not virtual")
+        await self._clock.advance(seconds)
+
+    async def cue(self, procedure, *args, **kwargs) -> int:
+        return self._clock.cue(
+            self._instrument(procedure, kwargs.get("event_type")), *args, **kwargs
+        )
 
     async def cancel(self, *args, **kwargs) -> Optional[Tuple]:
         return self._clock.cancel(*args, **kwargs)
@@ -81,35 +540,208 @@ class Transport(ApplicationObject):
         if not self.is_running:
             await self.start()
 
+    def reset_bundle_statistics(self):
+        self._bundle_statistics = BundleStatistics()
+
+    def reset_metrics(self):
+        self._metrics.clear()
+
+    async def remove_tempo_change(self, offset: float):
+        self._tempo_map.remove_change(offset)
+        await self._schedule_tempo_changes()
+
     async def reschedule(self, *args, **kwargs) -> Optional[int]:
         return self._clock.reschedule(*args, **kwargs)
 
-    async def schedule(self, *args, **kwargs) -> int:
-        return self._clock.schedule(*args, **kwargs)
+    async def schedule(self, procedure, *args, **kwargs) -> int:
+        return self._clock.schedule(
+            self._instrument(procedure, kwargs.get("event_type")), *args, **kwargs
+        )
+
+    async def seek(self, offset: float):
+        """
+        Move the arrangement playhead to ``offset``, in whole notes.
+
+        Playing timelines resume from the new offset at once.
+        """
+        if offset < 0:
+            raise ValueError(offset)
+        self._arrangement_offset = float(offset)
+        if self._arrangement_delta is None:
+            await self._schedule_tempo_changes()
+            return
+        self._arrangement_delta = self._get_current_offset() - self._arrangement_offset
+        await self._schedule_tempo_changes()
+        await self._schedule_timelines()
+
+    async def set_clip_edit_window(self, window: float):
+        """
+        Set the window, in seconds, over which clip edits coalesce into one
+        reschedule and one ``ClipModified`` event.
+
+        With no window, every edit notifies immediately.
+        """
+        if window < 0:
+            raise ValueError(window)
+        self._clip_edit_window = float(window)
+
+    async def set_clip_lookahead(self, lookahead: Optional[float]):
+        """
+        Set the window, in whole notes, over which playing clips schedule
+        their events ahead of time.
+
+        With no lookahead, clips wake once per note boundary.
+        """
+        if lookahead is not None and lookahead <= 0:
+            raise ValueError(lookahead)
+        self._clip_lookahead = lookahead
+
+    async def set_metrics_interval(self, interval: float):
+        """
+        Set the interval, in seconds, at which a running transport publishes
+        ``TransportMeasured``.
+        """
+        if interval <= 0:
+            raise ValueError(interval)
+        self._metrics_interval = float(interval)
+
+    async def set_tick_rate(self, frames_per_second: float):
+        """
+        Set the most ``TransportTicked`` events published per second.
+
+        Ticks arriving faster coalesce, and only the latest is published.
+        """
+        if frames_per_second <= 0:
+            raise ValueError(frames_per_second)
+        self._tick_rate = float(frames_per_second)
+
+    async def set_latency(self, latency: float):
+        """
+        Set the latency, in seconds, by which scheduled bundles are sent
+        ahead of their timestamps.
+        """
+        if latency < 0:
+            raise ValueError(latency)
+        self._latency = float(latency)
 
     async def set_tempo(self, beats_per_minute: float):
-        self._clock.change(beats_per_minute=beats_per_minute)
+        self._tempo_map.set_change(0.0, beats_per_minute=beats_per_minute)
+        await self._schedule_tempo_changes()
+
+    async def set_tempo_change(
+        self,
+        offset: float,
+        *,
+        beats_per_minute: Optional[float] = None,
+        time_signature: Optional[Tuple[int, int]] = None,
+    ):
+        """
+        Automate tempo, meter or both at arrangement ``offset``.
+        """
+        self._tempo_map.set_change(
+            offset, beats_per_minute=beats_per_minute, time_signature=time_signature
+        )
+        await self._schedule_tempo_changes()
 
     async def set_time_signature(self, numerator, denominator):
-        self._clock.change(time_signature=[numerator, denominator])
+        self._tempo_map.set_change(0.0, time_signature=(numerator, denominator))
+        await self._schedule_tempo_changes()
+
+    async def set_virtual(self, virtual: bool):
+        """
+        Switch a stopped transport between the realtime clock and a virtual
+        clock, keeping tempo and time signature.
+
+        A virtual clock stands still until advanced, then runs its events as
+        fast as their callbacks complete.
+        """
+        if self.is_running:
+            raise ValueError("Transport is running")
+        if virtual == self.is_virtual:
+            return
+        clock = VirtualTempoClock() if virtual else AsyncTempoClock()
+        clock.change(
+            beats_per_minute=self._clock.beats_per_minute,
+            time_signature=self._clock.time_signature,
+        )
+        self._clock = clock
 
     async def start(self):
         async with self.lock([self]):
             self._tick_event_id = await self.cue(self._tick_callback)
             await asyncio.gather(*[_._start() for _ in self._dependencies])
+            await self._schedule_tempo_changes()
             await self._clock.start()
+            self._arrangement_delta = (
+                self._get_current_offset() - self._arrangement_offset
+            )
+            await self._schedule_tempo_changes()
+            await self._schedule_timelines()
+        if self._metrics_task is None:
+            self._metrics_task = asyncio.get_running_loop().create_task(
+                self._publish_metrics()
+            )
         self.application.pubsub.publish(TransportStarted())
 
     async def stop(self):
+        from .clips import Clip
+
+        if self._arrangement_delta is not None:
+            self._arrangement_offset = self.arrangement_offset
+            self._arrangement_delta = None
+        # turn off pitches performed ahead while the clock still maps offsets
+        if self._clip_horizons:
+            offset = self._get_current_offset()
+            for track in list(self._clip_horizons):
+                await self._cut_clip(track, offset)
         await self._clock.stop()
+        # a restarted clock counts offsets afresh
+        if self._clip_event_id is not None:
+            await self.cancel(self._clip_event_id)
+        self._clip_entries.clear()
+        self._clip_event_id = self._clip_event_offset = None
+        self._clip_horizons.clear()
+        self._clip_pitch_offsets.clear()
+        self._clip_queue.clear()
+        await self._schedule_tempo_changes()
         async with self.lock([self]):
             await asyncio.gather(*[_._stop() for _ in self._dependencies])
             await self.application.flush()
             await self.cancel(self._tick_event_id)
+        self._tick_moment = None
+        if self._tick_task is not None:
+            self._tick_task.cancel()
+            self._tick_task = None
+        if self._metrics_task is not None:
+            self._metrics_task.cancel()
+            self._metrics_task = None
+        for clip in self.application.find(Clip):
+            await clip._flush_notify()
         self.application.pubsub.publish(TransportStopped())
 
     ### PUBLIC PROPERTIES ###
 
+    @property
+    def arrangement_offset(self) -> float:
+        """
+        The arrangement playhead's offset, in whole notes.
+        """
+        if self._arrangement_delta is None:
+            return self._arrangement_offset
+        return self._get_current_offset() - self._arrangement_delta
+
+    @property
+    def bundle_statistics(self) -> "BundleStatistics":
+        return dataclasses.replace(self._bundle_statistics)
+
+    @property
+    def clip_edit_window(self) -> float:
+        return self._clip_edit_window
+
+    @property
+    def clip_lookahead(self) -> Optional[float]:
+        return self._clip_lookahead
+
     @property
     def clock(self):
         return self._clock
@@ -118,21 +750,217 @@ class Transport(ApplicationObject):
     def is_running(self):
         return self._clock.is_running
 
+    @property
+    def is_virtual(self) -> bool:
+        return isinstance(self._clock, VirtualTempoClock)
+
+    @property
+    def latency(self) -> float:
+        return self._latency
+
+    @property
+    def metrics(self) -> Dict["Transport.EventType", "EventMetrics"]:
+        """
+        Lateness and execution time histograms of clock callbacks, by event
+        type.
+        """
+        return copy.deepcopy(self._metrics)
+
+    @property
+    def metrics_interval(self) -> float:
+        return self._metrics_interval
+
     @property
     def parameters(self):
         return self._parameters
 
+    @property
+    def tempo_map(self) -> TempoMap:
+        return self._tempo_map
+
+    @property
+    def tick_rate(self) -> float:
+        return self._tick_rate
+
+
+@dataclasses.dataclass
+class BundleStatistics:
+    """
+    Counts of timestamped bundles sent, and of those already late when sent.
+    """
+
+    count: int = 0
+    late_count: int = 0
+    max_lateness: float = 0.0
+
+    @property
+    def late_ratio(self) -> float:
+        return self.late_count / self.count if self.count else 0.0
+
+
+@dataclasses.dataclass
+class Histogram:
+    """
+    Counts values into fixed buckets.
+
+    Bucket ``i`` counts values up to ``bounds[i]``, and the last bucket counts
+    values above every bound.
+    """
+
+    bounds: Tuple[float, ...] = (
+        0.0005,
+        0.001,
+        0.002,
+        0.005,
+        0.01,
+        0.02,
+        0.05,
+        0.1,
+    )
+    counts: List[int] = dataclasses.field(default_factory=list)
+    count: int = 0
+    maximum: Optional[float] = None
+    total: float = 0.0
+
+    def __post_init__(self):
+        if not self.counts:
+            self.counts = [0] * (len(self.bounds) + 1)
+
+    def add(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+
+@dataclasses.dataclass
+class EventMetrics:
+    lateness: Histogram = dataclasses.field(default_factory=Histogram)
+    duration: Histogram = dataclasses.field(default_factory=Histogram)
+
+
+class VirtualTempoClock(AsyncTempoClock):
+    """
+    A tempo clock running in virtual time.
+
+    Time stands still until advanced, then jumps from each event straight to
+    the next, so callbacks see the same moments they would in realtime.
+
+    Overrides ``AsyncTempoClock``'s private ``_wait_for_event()`` and reads its
+    ``_event``, ``_event_queue`` and ``_is_running``, so depends on supriya's
+    clock internals staying put.
+    """
+
+    ### INITIALIZER ###
+
+    def __init__(self):
+        AsyncTempoClock.__init__(self)
+        self._active_callbacks = 0
+        self._idle = asyncio.Event()
+        self._is_parked = False
+        self._limit_time = 0.0
+        self._virtual_time = 0.0
+
+    ### PRIVATE METHODS ###
+
+    def _track(self, procedure):
+        """
+        Wrap ``procedure`` to signal idleness once it completes.
+        """
+
+        async def tracked_procedure(clock_context, *args, **kwargs):
+            self._active_callbacks += 1
+            try:
+                result = procedure(clock_context, *args, **kwargs)
+                if inspect.isawaitable(result):
+                    result = await result
+                return result
+            finally:
+                self._active_callbacks -= 1
+                self._idle.set()
+
+        return tracked_procedure
+
+    async def _wait_for_event(self, sleep_time):
+        # let other tasks run, then handle new commands before moving on
+        await asyncio.sleep(0)
+        if self._event.is_set():
+            return
+        if self._virtual_time + sleep_time <= self._limit_time:
+            self._virtual_time += sleep_time
+            return
+        self._virtual_time = max(self._virtual_time, self._limit_time)
+        self._is_parked = True
+        self._idle.set()
+        await self._event.wait()
+
+    ### PUBLIC METHODS ###
+
+    async def advance(self, seconds: float):
+        """
+        Advance virtual time by ``seconds``, returning once every event due by
+        then has been performed.
+        """
+        if seconds < 0:
+            raise ValueError(seconds)
+        self._limit_time = max(self._limit_time, self._virtual_time) + seconds
+        self._is_parked = False
+        self._event.set()
+        while self._is_running and not self._is_parked:
+            if not self._active_callbacks and not self._event_queue.qsize():
+                break
+            self._idle.clear()
+            await self._idle.wait()
+        self._virtual_time = max(self._virtual_time, self._limit_time)
+
+    def cancel(self, *args, **kwargs):
+        result = AsyncTempoClock.cancel(self, *args, **kwargs)
+        self._idle.set()
+        return result
+
+    def cue(self, procedure, *args, **kwargs) -> int:
+        return AsyncTempoClock.cue(self, self._track(procedure), *args, **kwargs)
+
+    def get_current_time(self) -> float:
+        return self._virtual_time
+
+    def schedule(self, procedure, *args, **kwargs) -> int:
+        return AsyncTempoClock.schedule(self, self._track(procedure), *args, **kwargs)
+
+    async def stop(self):
+        result = await AsyncTempoClock.stop(self)
+        self._idle.set()
+        return result
+
+
+@dataclasses.dataclass
+class TransportEvent(Event):
+    """
+    Base class of transport events.
+    """
+
+
+@dataclasses.dataclass
+class TransportMeasured(TransportEvent):
+    metrics: Dict[Transport.EventType, EventMetrics]
+
 
 @dataclasses.dataclass
-class TransportStarted(Event):
+class TransportStarted(TransportEvent):
     pass
 
 
 @dataclasses.dataclass
-class TransportStopped(Event):
+class TransportStopped(TransportEvent):
     pass
 
 
 @dataclasses.dataclass
-class TransportTicked(Event):  # TODO: ClipView needs to know start delta
+class TransportTicked(TransportEvent):  # TODO: ClipView needs to know start delta
     moment: Moment
+    position: Optional[Moment] = None
@@ -1,6 +1,6 @@
 import asyncio
 from functools import singledispatchmethod
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 from monome import GridApp, GridBuffer
 
@@ -21,6 +21,8 @@ class ClipView(GridApp):
         self.pubsub = pubsub or PubSub()
         self.registry = registry if registry is not None else {}
         self.clip: Optional[Clip] = None
+        # how many of the clip's notes start in each lit cell
+        self.cell_note_counts: Dict[Tuple[int, int], int] = {}
         self.buffers: Dict[str, GridBuffer] = {
             "grid": GridBuffer(self.grid.width or 16, self.grid.height or 8),
             "notes": GridBuffer(self.grid.width or 16, self.grid.height or 8),
@@ -37,6 +39,31 @@ class ClipView(GridApp):
 
     ### PRIVATE METHODS ###
 
+    def _add_notes(self, notes):
+        for note in notes:
+            cell = self._get_cell(note)
+            if cell is None:
+                continue
+            self.cell_note_counts[cell] = self.cell_note_counts.get(cell, 0) + 1
+            self.buffers["notes"].led_set(*cell, 1)
+
+    def _get_cell(self, note) -> Optional[Tuple[int, int]]:
+        x, y = int(note.start_offset * 16), 7 - int(note.pitch - 60)
+        if 0 <= x < 16 and 0 <= y < 8:
+            return x, y
+        return None
+
+    def _remove_notes(self, notes):
+        for note in notes:
+            cell = self._get_cell(note)
+            if cell is None or cell not in self.cell_note_counts:
+                continue
+            self.cell_note_counts[cell] -= 1
+            # another note may still start in the cell
+            if not self.cell_note_counts[cell]:
+                del self.cell_note_counts[cell]
+                self.buffers["notes"].led_set(*cell, 0)
+
     def _render(self):
         if self.grid.transport is None:
             return
@@ -50,11 +77,8 @@ class ClipView(GridApp):
 
     def _update_notes(self):
         self.buffers["notes"].led_all(0)
-        for note in self.clip.notes:
-            y = 7 - (note.pitch - 60)
-            x = int(note.start_offset * 16)
-            if 0 <= x < 16 and 0 <= y < 8:
-                self.buffers["notes"].led_set(x, y, 1)
+        self.cell_note_counts.clear()
+        self._add_notes(self.clip.notes)
 
     ### PUBLIC METHODS ###
 
@@ -71,7 +95,11 @@ class ClipView(GridApp):
     def _handle_clip_modified(self, event: ClipModified):
         if self.clip is None or event.clip_uuid != self.clip.uuid:
             return
-        self._update_notes()
+        if event.added_notes or event.removed_notes:
+            self._remove_notes(event.removed_notes)
+            self._add_notes(event.added_notes)
+        else:
+            self._update_notes()
         self._render()
 
     @handle_event.register
@@ -117,3 +145,5 @@ class ClipView(GridApp):
         }
         for x in [0, 4, 8, 12]:
             self.buffers["grid"].led_level_col(x, 0, [1] * self.grid.height)
+        if self.clip is not None:
+            self._update_notes()
@@ -1,25 +1,250 @@
-from typing import Callable, Dict, List, Type
+import asyncio
+import collections
+import dataclasses
+import enum
+import logging
+from typing import Callable, Deque, Dict, Hashable, List, Optional, Set, Tuple, Type
 
 from .bases import Event
 
+logger = logging.getLogger("tloen.pubsub")
+
+
+@dataclasses.dataclass
+class SubscriberLag:
+    """
+    Counts of a queued subscriber's events.
+
+    ``blocked`` counts publishes which had to deliver the backlog themselves.
+    """
+
+    pending: int = 0
+    max_pending: int = 0
+    delivered: int = 0
+    dropped: int = 0
+    coalesced: int = 0
+    blocked: int = 0
+
+
+class Subscriber:
+    """
+    Delivers events to a procedure from a bounded queue, on its own task.
+    """
+
+    def __init__(
+        self,
+        procedure: Callable,
+        queue_size: int,
+        overflow: "PubSub.Overflow",
+        key: Optional[Callable[[Event], Hashable]] = None,
+    ):
+        if queue_size < 1:
+            raise ValueError(queue_size)
+        self.event_classes: Set[Type[Event]] = set()
+        self.key = key or type
+        self.overflow = overflow
+        self.procedure = procedure
+        self.queue_size = queue_size
+        self._lag = SubscriberLag()
+        self._queue: Deque[Event] = collections.deque()
+        self._task: Optional[asyncio.Task] = None
+
+    def __call__(self, event: Event):
+        if len(self._queue) >= self.queue_size:
+            self._overflow(event)
+        else:
+            self._queue.append(event)
+        self._lag.max_pending = max(self._lag.max_pending, len(self._queue))
+        if self._task is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # no loop to drain on
+            self._deliver_pending()
+        else:
+            self._task = loop.create_task(self._drain())
+
+    def _deliver(self, event: Event):
+        try:
+            self.procedure(event)
+        except Exception:
+            logger.exception(f"Subscriber {self.procedure!r} failed on {event!r}")
+        self._lag.delivered += 1
+
+    def _deliver_pending(self):
+        while self._queue:
+            self._deliver(self._queue.popleft())
+
+    async def _drain(self):
+        try:
+            while self._queue:
+                self._deliver(self._queue.popleft())
+                await asyncio.sleep(0)
+        finally:
+            self._task = None
+
+    def _overflow(self, event: Event):
+        if self.overflow == PubSub.Overflow.BLOCK:
+            # the publisher waits for the subscriber to catch up
+            self._lag.blocked += 1
+            self._deliver_pending()
+        elif self.overflow == PubSub.Overflow.COALESCE:
+            key = self.key(event)
+            for i, pending_event in enumerate(self._queue):
+                if key is not None and self.key(pending_event) == key:
+                    # keep the queue in publication order
+                    del self._queue[i]
+                    self._queue.append(event)
+                    self._lag.coalesced += 1
+                    return
+            # events without a key are never dropped
+            for i, pending_event in enumerate(self._queue):
+                if self.key(pending_event) is not None:
+                    del self._queue[i]
+                    self._queue.append(event)
+                    self._lag.dropped += 1
+                    return
+            self._lag.blocked += 1
+            self._deliver_pending()
+        if len(self._queue) >= self.queue_size:
+            self._queue.popleft()
+            self._lag.dropped += 1
+        self._queue.append(event)
+
+    def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._queue.clear()
+
+    @property
+    def lag(self) -> SubscriberLag:
+        return dataclasses.replace(self._lag, pending=len(self._queue))
+
 
 class PubSub:
-    def __init__(self):
-        self.subscriptions: Dict[Type[Event], List[Callable[Event]]] = {}
+    """
+    Publishes events to the procedures subscribed to their classes, or to
+    any of their base classes.
+
+    Each event class resolves its procedures once, into a dispatch table
+    which subscribing and unsubscribing clear.
+
+    Procedures subscribed with a queue size are called later, from their own
+    queue, so a slow subscriber never stalls the publisher. When a queue is
+    full, its overflow policy drops the oldest event, coalesces the event
+    into a pending one with the same key (falling back to dropping the
+    oldest keyed event), or blocks, delivering the backlog on the
+    publisher's stack. Coalescing never drops events whose key is None, and
+    blocks when only those are pending.
+    """
+
+    class Overflow(enum.IntEnum):
+        BLOCK = 0
+        COALESCE = 1
+        DROP_OLDEST = 2
+
+    def __init__(
+        self,
+        *,
+        queue_size: Optional[int] = None,
+        overflow: Overflow = Overflow.DROP_OLDEST,
+        key: Optional[Callable[[Event], Hashable]] = None,
+    ):
+        self.key = key
+        self.overflow = self.Overflow(overflow)
+        self.queue_size = queue_size
+        self.subscribers: Dict[Callable, Subscriber] = {}
+        self.subscriptions: Dict[Type[Event], List[Callable]] = {}
+        self._dispatch_table: Dict[Type[Event], Tuple[Callable, ...]] = {}
+
+    def _resolve(self, event_class: Type[Event]) -> Tuple[Callable, ...]:
+        # most derived first, and each procedure only once
+        callables: Dict[Callable, None] = {}
+        for class_ in event_class.__mro__:
+            callables.update(dict.fromkeys(self.subscriptions.get(class_, ())))
+        self._dispatch_table[event_class] = tuple(callables)
+        return self._dispatch_table[event_class]
+
+    async def flush(self):
+        """
+        Wait until every queued subscriber has caught up.
+        """
+        while any(
+            subscriber._queue or subscriber._task is not None
+            for subscriber in self.subscribers.values()
+        ):
+            await asyncio.sleep(0)
 
     def publish(self, event: Event):
-        callables = self.subscriptions.get(type(event), [])
+        callables = self._dispatch_table.get(type(event))
+        if callables is None:
+            callables = self._resolve(type(event))
         # raise RuntimeError("THE FUCK", event, callables)
         for procedure in callables:
             procedure(event)
 
-    def subscribe(self, procedure: Callable, *event_classes: Type[Event]):
+    def subscribe(
+        self,
+        procedure: Callable,
+        *event_classes: Type[Event],
+        queue_size: Optional[int] = None,
+        overflow: Optional[Overflow] = None,
+        key: Optional[Callable[[Event], Hashable]] = None,
+    ):
+        """
+        Subscribe ``procedure`` to ``event_classes``.
+
+        Queue size, overflow policy and coalescing key default to the
+        PubSub's. With no queue size, the procedure runs on the publisher's
+        stack. A queued procedure keeps the queue it was first subscribed
+        with, and subscribing it again with other queue options raises.
+        """
+        subscriber = self.subscribers.get(procedure)
+        if subscriber is not None and (
+            (queue_size is not None and queue_size != subscriber.queue_size)
+            or (overflow is not None and overflow != subscriber.overflow)
+            or (key is not None and key != subscriber.key)
+        ):
+            raise ValueError(procedure)
+        self._dispatch_table.clear()
+        queue_size = queue_size or self.queue_size
+        if subscriber is None and event_classes and queue_size:
+            subscriber = self.subscribers[procedure] = Subscriber(
+                procedure,
+                queue_size=queue_size,
+                overflow=self.Overflow(
+                    overflow if overflow is not None else self.overflow
+                ),
+                key=key or self.key,
+            )
         for event_class in event_classes:
-            self.subscriptions.setdefault(event_class, []).append(procedure)
+            if subscriber is not None:
+                subscriber.event_classes.add(event_class)
+            self.subscriptions.setdefault(event_class, []).append(
+                subscriber or procedure
+            )
 
     def unsubscribe(self, procedure: Callable, *event_classes: Type[Event]):
+        self._dispatch_table.clear()
+        subscriber = self.subscribers.get(procedure)
         for event_class in event_classes:
             callables = self.subscriptions.get(event_class, [])
-            callables.remove(procedure)
+            callables.remove(subscriber or procedure)
             if not callables:
                 self.subscriptions.pop(event_class, None)
+            if subscriber is not None:
+                subscriber.event_classes.discard(event_class)
+        if subscriber is not None and not subscriber.event_classes:
+            self.subscribers.pop(procedure).close()
+
+    @property
+    def lags(self) -> Dict[Callable, SubscriberLag]:
+        """
+        Lag counters of queued subscribers, by procedure.
+        """
+        return {
+            procedure: subscriber.lag
+            for procedure, subscriber in self.subscribers.items()
+        }
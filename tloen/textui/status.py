@@ -6,6 +6,7 @@ from ..bases import Event
 from ..domain.applications import (
     ApplicationBooted,
     ApplicationBooting,
+    ApplicationEvent,
     ApplicationQuit,
     ApplicationQuitting,
     ApplicationStatusRefreshed,
@@ -16,14 +17,7 @@ from ..pubsub import PubSub
 class StatusWidget(urwid.WidgetWrap):
     def __init__(self, pubsub=None):
         self.pubsub = pubsub or PubSub()
-        self.pubsub.subscribe(
-            self.handle_event,
-            ApplicationBooted,
-            ApplicationBooting,
-            ApplicationQuit,
-            ApplicationQuitting,
-            ApplicationStatusRefreshed,
-        )
+        self.pubsub.subscribe(self.handle_event, ApplicationEvent)
         self.text_defaults = {
             "cpu": "cpu:   0.00% /   0.00%",
             "groups": "g: ....",
@@ -3,6 +3,7 @@ from functools import singledispatchmethod
 import urwid
 
 from ..domain.transports import (
+    TransportEvent,
     TransportStarted,
     TransportStopped,
     TransportTicked,
@@ -13,9 +14,7 @@ from ..pubsub import PubSub
 class TransportWidget(urwid.WidgetWrap):
     def __init__(self, pubsub=None):
         self.pubsub = pubsub or PubSub()
-        self.pubsub.subscribe(
-            self.handle_event, TransportStarted, TransportStopped, TransportTicked,
-        )
+        self.pubsub.subscribe(self.handle_event, TransportEvent)
         self.text = {
             "status": "stopped",
             "tempo": "120.0 bpm",
@@ -58,13 +57,13 @@ class TransportWidget(urwid.WidgetWrap):
 
     @handle_event.register
     def _on_transport_ticked(self, event: TransportTicked):
-        self.text["tempo"] = "{:5.1f} bpm".format(event.moment.beats_per_minute)
-        self.text["time_signature"] = "{:2d} / {:2d}".format(
-            *event.moment.time_signature
-        )
-        denominator = event.moment.time_signature[1]
-        measure = event.moment.measure
-        measure_offset = event.moment.measure_offset
+        # show the arrangement position, as timed by the tempo map
+        moment = event.position or event.moment
+        self.text["tempo"] = "{:5.1f} bpm".format(moment.beats_per_minute)
+        self.text["time_signature"] = "{:2d} / {:2d}".format(*moment.time_signature)
+        denominator = moment.time_signature[1]
+        measure = moment.measure
+        measure_offset = moment.measure_offset
         beat, beat_offset = divmod(measure_offset, 1 / denominator)
         tick = beat_offset / (1 / denominator) * 4
         self.text["tick"] = "{} / {} / {}".format(measure, int(beat + 1), int(tick + 1))
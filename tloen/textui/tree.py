@@ -9,6 +9,7 @@ from urwid.util import is_mouse_press
 
 from ..bases import Event
 from ..domain.applications import ApplicationLoaded
+from ..domain.tracks import Track
 from ..pubsub import PubSub
 
 
@@ -220,25 +221,30 @@ class ContextTree(Tree):
         self._w = self._build_widget()
 
     def _build_widget_data(self):
-        widget_data = {}
-        for entity_data in self.registry.application.serialize()["entities"]:
-            kind = entity_data["kind"]
-            meta = entity_data.get("meta", {})
-            spec = entity_data.get("spec", {})
-            if kind == "Application":
-                widget_data[None] = dict(children=spec.get("contexts", []), kind=kind,)
-                continue
-            if kind == "Context":
-                widget_data[meta.get("uuid")] = dict(
-                    children=spec.get("tracks", []), kind=kind, uuid=meta.get("uuid"),
-                )
-            elif kind == "Track":
-                widget_data[meta.get("uuid")] = dict(
-                    children=spec.get("tracks", []),
-                    kind=kind,
-                    parent=meta.get("parent"),
-                    uuid=meta.get("uuid"),
-                )
+        application = self.registry.application
+        widget_data = {
+            None: dict(
+                children=[str(context.uuid) for context in application.contexts],
+                kind="Application",
+            )
+        }
+        for context in application.contexts:
+            widget_data[str(context.uuid)] = dict(
+                children=[
+                    str(track.uuid) for track in application.find(Track, parent=context)
+                ],
+                kind="Context",
+                uuid=str(context.uuid),
+            )
+        for track in application.find(Track):
+            widget_data[str(track.uuid)] = dict(
+                children=[
+                    str(child.uuid) for child in application.find(Track, parent=track)
+                ],
+                kind="Track",
+                parent=str(track._get_registry_parent().uuid),
+                uuid=str(track.uuid),
+            )
         return widget_data
 
 